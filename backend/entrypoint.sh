@@ -11,6 +11,7 @@ then
     echo "PostgreSQL started"
 fi
 
+python pigeonhole/manage.py check --deploy --fail-level ERROR || exit 1
 python pigeonhole/manage.py migrate --no-input
 python pigeonhole/manage.py initsuperuser --username="$SUPERUSER" --email="$SUPERUSER_EMAIL" --password="$SUPERUSER_PASSWORD"
 python pigeonhole/manage.py collectstatic --no-input --clear
@@ -1,21 +1,46 @@
+import re
+import time
+import logging
+import threading
 from typing import Optional
 
+import jwt
+import requests
+from jwt.algorithms import RSAAlgorithm
+
+from django.core.cache import cache
 from django.utils.crypto import get_random_string
 from django.db import transaction
 
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from pigeonhole.settings import MIN_PASSWORD_LENGTH
+from pigeonhole.settings import (
+    MIN_PASSWORD_LENGTH,
+    GOOGLE_CLIENT_IDS,
+    GOOGLE_ID_TOKEN_ISSUERS,
+    GOOGLE_JWKS_URL,
+    GOOGLE_JWKS_DEFAULT_CACHE_TIMEOUT,
+    GOOGLE_JWKS_MIN_REFRESH_INTERVAL,
+    ACCOUNT_TYPE_CLAIM,
+    USER_VERSION_CLAIM,
+)
 from pigeonhole.common.constants import REFRESH, ACCESS, TOKENS, USER
+from pigeonhole.common.http import http_get
 
 from users.models import User
 from users.logic import requester_to_json
 from .models import PasswordAuthentication, PasswordAuthenticationData
 
+logger = logging.getLogger("main")
+
 
 def get_tokens(user: User) -> dict:
     refreshToken = RefreshToken.for_user(user)
 
+    ## copied into the access token, see check_account_access
+    refreshToken[ACCOUNT_TYPE_CLAIM] = user.account_type
+    refreshToken[USER_VERSION_CLAIM] = user.version
+
     return {
         REFRESH: str(refreshToken),
         ACCESS: str(refreshToken.access_token),
@@ -45,3 +70,116 @@ def reset_password(user: User) -> Optional[str]:
     )
 
     return random_password if password_authentication is not None else None
+
+
+## Google ID token verification
+## the key set is kept in-process and in the shared cache as {"keys": {kid: jwk}, "fetched_at": ..., "expires_at": ...}
+
+GOOGLE_JWKS_CACHE_KEY = "google_jwks"
+MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+google_jwks: dict = {}
+google_jwks_lock = threading.Lock()
+
+
+def parse_cache_control_max_age(cache_control: str) -> Optional[int]:
+    match = MAX_AGE_PATTERN.search(cache_control)
+    return int(match.group(1)) if match is not None else None
+
+
+def fetch_google_jwks() -> dict:
+    response = http_get(url=GOOGLE_JWKS_URL)
+    response.raise_for_status()
+
+    max_age = parse_cache_control_max_age(response.headers.get("Cache-Control", ""))
+    now = time.time()
+
+    return {
+        "keys": {jwk["kid"]: jwk for jwk in response.json()["keys"]},
+        "fetched_at": now,
+        "expires_at": now
+        + (max_age if max_age is not None else GOOGLE_JWKS_DEFAULT_CACHE_TIMEOUT),
+    }
+
+
+def get_google_jwks(force_refresh: bool = False) -> dict:
+    global google_jwks
+
+    if not force_refresh and google_jwks.get("expires_at", 0) > time.time():
+        return google_jwks
+
+    with google_jwks_lock:
+        now = time.time()
+
+        ## another thread or worker process may have refreshed the key set in the meantime
+        for jwks in (google_jwks, cache.get(GOOGLE_JWKS_CACHE_KEY) or {}):
+            if jwks.get("expires_at", 0) <= now:
+                continue
+
+            if (
+                not force_refresh
+                or jwks["fetched_at"] + GOOGLE_JWKS_MIN_REFRESH_INTERVAL > now
+            ):
+                google_jwks = jwks
+                return google_jwks
+
+        try:
+            jwks = fetch_google_jwks()
+        except (requests.RequestException, KeyError, ValueError) as e:
+            logger.warning(e)
+
+            ## stale keys are still usable if Google cannot be reached
+            if google_jwks:
+                return google_jwks
+
+            raise ValueError("Unable to fetch google public keys.")
+
+        cache.set(
+            GOOGLE_JWKS_CACHE_KEY,
+            jwks,
+            timeout=max(round(jwks["expires_at"] - jwks["fetched_at"]), 1),
+        )
+        google_jwks = jwks
+
+        return google_jwks
+
+
+def get_google_public_key(kid: str):
+    jwks = get_google_jwks()
+
+    ## Google rotates its keys, an unknown key id may be signed by a newly published key
+    if kid not in jwks["keys"]:
+        jwks = get_google_jwks(force_refresh=True)
+
+    if kid not in jwks["keys"]:
+        raise ValueError("Unknown google key id.")
+
+    return RSAAlgorithm.from_jwk(jwks["keys"][kid])
+
+
+def verify_google_id_token(token_id: str) -> dict:
+    ## every google sign in is rejected without a client id to check the token audience against
+    if not GOOGLE_CLIENT_IDS:
+        logger.error("GOOGLE_CLIENT_IDS is not set.")
+        raise ValueError("No google client ids configured.")
+
+    try:
+        kid = jwt.get_unverified_header(token_id).get("kid")
+
+        if not kid:
+            raise ValueError("Missing google key id.")
+
+        claims = jwt.decode(
+            token_id,
+            key=get_google_public_key(kid),
+            algorithms=["RS256"],
+            audience=GOOGLE_CLIENT_IDS,
+            options={"require": ["exp", "iat", "iss", "aud", "sub"]},
+        )
+    except jwt.PyJWTError as e:
+        raise ValueError(f"Invalid google token: {e}")
+
+    if claims["iss"] not in GOOGLE_ID_TOKEN_ISSUERS:
+        raise ValueError("Invalid google token issuer.")
+
+    return claims
@@ -3,6 +3,7 @@ from abc import ABC, abstractmethod
 from typing import Optional
 
 from django.db import models, transaction
+from django.db.models.signals import post_save, post_delete
 from django.contrib.auth.hashers import check_password, make_password
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
@@ -11,7 +12,7 @@ from pigeonhole.common.exceptions import BadRequest
 from pigeonhole.common.models import TimestampedModel
 
 from content_delivery_service.models import Image
-from users.models import User
+from users.models import User, bump_user_cache_version
 
 logger = logging.getLogger("main")
 
@@ -99,6 +100,22 @@ class PasswordAuthentication(AuthenticationMethod):
         return super().create(user, auth_data)
 
 
+def authentication_method_cache_invalidation(
+    sender, instance: AuthenticationMethod, **kwargs
+):
+    ## cached users include their authentication methods, see users.logic.get_cached_user
+    bump_user_cache_version(instance.user_id)
+
+
+for auth_method_class in (*ALTERNATIVE_AUTH_METHODS, PasswordAuthentication):
+    for signal, signal_name in ((post_save, "post_save"), (post_delete, "post_delete")):
+        signal.connect(
+            authentication_method_cache_invalidation,
+            sender=auth_method_class,
+            dispatch_uid=f"authentication.{auth_method_class.__name__.lower()}.authentication_method_cache_invalidation.{signal_name}",
+        )
+
+
 ## Non DB models
 class AuthenticationData(ABC):
     @abstractmethod
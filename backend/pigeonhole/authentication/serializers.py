@@ -14,19 +14,24 @@ from pigeonhole.common.constants import (
     NAME,
     EMAIL,
     REFRESH,
-    TOKEN_ID,
-    ACCESS_TOKEN,
     PASSWORD,
     USER,
     TOKENS,
     IS_ACTIVATED,
 )
 from pigeonhole.common.exceptions import InternalServerError, BadRequest
+from pigeonhole.common.http import http_get, submit
+from pigeonhole.settings import USER_VERSION_CLAIM
 from users.models import User
-from users.logic import requester_to_json, get_users
+from users.logic import requester_to_json, get_users, get_cached_user
 
 ## from email_service.logic import send_password_reset_email
-from .logic import get_authenticated_data, reset_password
+from .logic import (
+    get_authenticated_data,
+    get_tokens,
+    reset_password,
+    verify_google_id_token,
+)
 
 from .models import (
     AuthenticationData,
@@ -42,15 +47,13 @@ class GoogleAuthenticationSerializer(serializers.Serializer):
     token_id = serializers.CharField(required=True)
 
     def validate(self, data):
-        token_id = data[TOKEN_ID]
-
-        params = {"id_token": token_id}
+        token_id = data["token_id"]
 
-        response = requests.get(
-            url="https://oauth2.googleapis.com/tokeninfo",
-            params=params,
-        )
-        response_data = response.json()
+        try:
+            response_data = verify_google_id_token(token_id)
+        except ValueError as e:
+            logger.warning(e)
+            raise BadRequest(detail="Invalid google token.")
 
         name = response_data.get("name", "")
         email = response_data.get("email", "")
@@ -71,6 +74,7 @@ class GoogleAuthenticationSerializer(serializers.Serializer):
 
 FACEBOOK_APP_ID = os.getenv("FACEBOOK_APP_ID")
 FACEBOOK_APP_SECRET = os.getenv("FACEBOOK_APP_SECRET")
+FACEBOOK_GRAPH_API_URL = "https://graph.facebook.com/v11.0"
 VALID_SCOPES = {"email", "public_profile"}
 
 
@@ -83,8 +87,8 @@ class FacebookAuthenticationSerializer(serializers.Serializer):
             "access_token": f"{FACEBOOK_APP_ID}|{FACEBOOK_APP_SECRET}",
         }
 
-        response = requests.get(
-            url="https://graph.facebook.com/v11.0/debug_token",
+        response = http_get(
+            url=f"{FACEBOOK_GRAPH_API_URL}/debug_token",
             params=params,
         )
 
@@ -111,21 +115,31 @@ class FacebookAuthenticationSerializer(serializers.Serializer):
         if app_id != FACEBOOK_APP_ID or not is_valid or scopes != VALID_SCOPES:
             raise BadRequest(detail="Invalid facebook token.")
 
-    def validate(self, data):
-        access_token = data[ACCESS_TOKEN]
-
-        self.verify_access_token(access_token)
-
+    def get_profile(self, access_token: str) -> dict:
         params = {
             "fields": "id,name,email,picture.width(512).height(512)",
             "access_token": access_token,
         }
 
-        response = requests.get(
-            url="https://graph.facebook.com/v11.0/me",
+        response = http_get(
+            url=f"{FACEBOOK_GRAPH_API_URL}/me",
             params=params,
         )
-        response_data = response.json()
+
+        return response.json()
+
+    def validate(self, data):
+        access_token = data["access_token"]
+
+        ## profile is fetched concurrently and only used once the token is verified
+        profile = submit(self.get_profile, access_token)
+
+        try:
+            self.verify_access_token(access_token)
+            response_data = profile.result()
+        except requests.RequestException as e:
+            logger.warning(e)
+            raise InternalServerError(detail="Unable to reach facebook.")
 
         name = response_data.get("name", "")
         email = response_data.get("email", "")
@@ -228,23 +242,25 @@ class AccessTokenRefreshSerializer(
     def validate(self, data):
         tokens = super().validate(data)
 
-        user_id = self.token_class(tokens[REFRESH]).get(key=api_settings.USER_ID_CLAIM)
+        refresh_token = self.token_class(tokens[REFRESH])
+        user_id = refresh_token.get(key=api_settings.USER_ID_CLAIM)
 
         try:
-            user = (
-                get_users(id=user_id)
-                .select_related(
-                    "profile_image",
-                    "passwordauthentication",
-                    "googleauthentication",
-                    "facebookauthentication",
-                )
-                .get()
-            )
+            user = get_cached_user(user_id)
         except User.DoesNotExist as e:
             logger.warning(e)
             self.raise_invalid_user()
 
+        token_version = refresh_token.get(key=USER_VERSION_CLAIM)
+
+        if token_version is None:
+            ## tokens issued before the claims were added, see check_account_access
+            tokens = get_tokens(user)
+
+        elif token_version != user.version:
+            ## tokens issued before the account type changed must not be renewed with stale claims
+            self.raise_invalid_user()
+
         data = requester_to_json(user)
 
         return {USER: data, TOKENS: tokens}
@@ -1,3 +1,410 @@
-from django.test import TestCase
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import urlsplit
+from unittest import mock
 
-# Create your tests here.
+import jwt
+import requests
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from pigeonhole.common import http
+from pigeonhole.common.cache import flush_stats
+from pigeonhole.common.constants import ACCESS, ERRORS, REFRESH, TOKENS
+from pigeonhole.common.exceptions import BadRequest, InternalServerError
+from pigeonhole.settings import (
+    ACCOUNT_TYPE_CLAIM,
+    OUTBOUND_HTTP_MAX_RETRIES,
+    USER_VERSION_CLAIM,
+)
+from users.models import User
+from . import logic, serializers
+
+TEST_CLIENT_ID = "test-client-id.apps.googleusercontent.com"
+
+
+class StubServer:
+    """
+    Serves canned responses on localhost so that outbound requests go through the real HTTP stack.
+    Responses are (status, headers, body) tuples given per path, the last one is repeated once all have been served.
+    """
+
+    def __init__(self):
+        self.responses: dict[str, list[tuple[int, dict, bytes]]] = {}
+        self.delay = 0
+        self.requests: list[str] = []
+        self.lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = urlsplit(self.path).path
+
+                with stub.lock:
+                    stub.requests.append(path)
+                    responses = stub.responses[path]
+                    status, headers, body = (
+                        responses.pop(0) if len(responses) > 1 else responses[0]
+                    )
+
+                time.sleep(stub.delay)
+
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get_url(self, path: str = "/") -> str:
+        return f"http://127.0.0.1:{self.server.server_port}{path}"
+
+    def respond(self, path: str, *responses: tuple[int, dict, bytes]):
+        with self.lock:
+            self.responses[path] = list(responses)
+            self.requests = []
+
+
+def json_response(data, status: int = 200, headers: Optional[dict] = None) -> tuple:
+    headers = {"Content-Type": "application/json"} | (headers or {})
+
+    return status, headers, json.dumps(data).encode()
+
+
+class StubServerTestCase(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.stub = StubServer()
+        cls.stub.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stub.stop()
+        super().tearDownClass()
+
+    def setUp(self):
+        ## counts of earlier tests may still be pending in process
+        flush_stats()
+        cache.clear()
+        self.stub.delay = 0
+
+
+class GoogleIdTokenTest(StubServerTestCase):
+    def setUp(self):
+        super().setUp()
+
+        ## key sets are also kept in process
+        logic.google_jwks = {}
+
+        for name, value in (
+            ("GOOGLE_JWKS_URL", self.stub.get_url("/certs")),
+            ("GOOGLE_CLIENT_IDS", [TEST_CLIENT_ID]),
+        ):
+            patcher = mock.patch.object(logic, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.key = self.generate_key()
+        self.publish(self.key)
+
+    def generate_key(self) -> rsa.RSAPrivateKey:
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    def get_jwk(self, key: rsa.RSAPrivateKey, kid: str) -> dict:
+        return json.loads(RSAAlgorithm.to_jwk(key.public_key())) | {
+            "kid": kid,
+            "alg": "RS256",
+            "use": "sig",
+        }
+
+    def publish(self, *keys: rsa.RSAPrivateKey, max_age: int = 3600):
+        self.stub.respond(
+            "/certs",
+            json_response(
+                {"keys": [self.get_jwk(key, str(id(key))) for key in keys]},
+                headers={"Cache-Control": f"public, max-age={max_age}"},
+            ),
+        )
+
+    def get_token(
+        self, key: rsa.RSAPrivateKey, kid: Optional[str] = None, **claims
+    ) -> str:
+        now = int(time.time())
+        payload = {
+            "iss": "https://accounts.google.com",
+            "aud": TEST_CLIENT_ID,
+            "sub": "1234567890",
+            "email": "user@example.com",
+            "iat": now,
+            "exp": now + 3600,
+        } | claims
+
+        return jwt.encode(
+            payload,
+            key,
+            algorithm="RS256",
+            headers={"kid": kid if kid is not None else str(id(key))},
+        )
+
+    def test_valid_token_is_verified_with_cached_keys(self):
+        for _ in range(3):
+            claims = logic.verify_google_id_token(self.get_token(self.key))
+            self.assertEqual(claims["email"], "user@example.com")
+
+        self.assertEqual(len(self.stub.requests), 1)
+
+    def test_key_rotation(self):
+        logic.verify_google_id_token(self.get_token(self.key))
+
+        new_key = self.generate_key()
+        self.publish(self.key, new_key)
+
+        ## the unknown key id forces a refresh once the refresh interval has passed
+        with mock.patch.object(logic, "GOOGLE_JWKS_MIN_REFRESH_INTERVAL", 0):
+            claims = logic.verify_google_id_token(self.get_token(new_key))
+
+        self.assertEqual(claims["sub"], "1234567890")
+        self.assertEqual(len(self.stub.requests), 1)
+
+    def test_unknown_key_id_refresh_is_throttled(self):
+        logic.verify_google_id_token(self.get_token(self.key))
+        self.publish(self.key)
+
+        for _ in range(5):
+            with self.assertRaises(ValueError):
+                logic.verify_google_id_token(self.get_token(self.key, kid="unknown"))
+
+        ## the key set was fetched within the refresh interval, so it is not fetched again
+        self.assertEqual(len(self.stub.requests), 0)
+
+        with mock.patch.object(logic, "GOOGLE_JWKS_MIN_REFRESH_INTERVAL", 0):
+            with self.assertRaises(ValueError):
+                logic.verify_google_id_token(self.get_token(self.key, kid="unknown"))
+
+        self.assertEqual(len(self.stub.requests), 1)
+
+    def test_stale_keys_are_used_when_google_cannot_be_reached(self):
+        self.publish(self.key, max_age=0)
+        logic.verify_google_id_token(self.get_token(self.key))
+
+        self.stub.respond("/certs", json_response({}, status=500))
+        claims = logic.verify_google_id_token(self.get_token(self.key))
+
+        self.assertEqual(claims["email"], "user@example.com")
+        self.assertEqual(len(self.stub.requests), 1)
+
+    def test_no_keys_when_google_cannot_be_reached(self):
+        self.stub.respond("/certs", json_response({}, status=500))
+
+        with self.assertRaises(ValueError):
+            logic.verify_google_id_token(self.get_token(self.key))
+
+    def test_invalid_claims_are_rejected(self):
+        now = int(time.time())
+
+        for claims in (
+            {"aud": "other-client-id.apps.googleusercontent.com"},
+            {"iss": "https://accounts.example.com"},
+            {"iat": now - 7200, "exp": now - 3600},
+        ):
+            with self.subTest(claims=claims), self.assertRaises(ValueError):
+                logic.verify_google_id_token(self.get_token(self.key, **claims))
+
+    def test_tokens_are_rejected_without_client_ids(self):
+        with mock.patch.object(logic, "GOOGLE_CLIENT_IDS", []):
+            with self.assertRaises(ValueError):
+                logic.verify_google_id_token(self.get_token(self.key))
+
+        self.assertEqual(len(self.stub.requests), 0)
+
+    def test_token_signed_by_another_key_is_rejected(self):
+        token = self.get_token(self.generate_key(), kid=str(id(self.key)))
+
+        with self.assertRaises(ValueError):
+            logic.verify_google_id_token(token)
+
+
+class OutboundHttpTest(StubServerTestCase):
+    def test_gateway_errors_are_retried(self):
+        for status in (502, 503, 504):
+            with self.subTest(status=status):
+                self.stub.respond(
+                    "/",
+                    json_response({}, status=status),
+                    json_response({}, status=status),
+                    json_response({"ok": True}),
+                )
+
+                response = http.http_get(self.stub.get_url())
+
+                self.assertEqual(response.json(), {"ok": True})
+                self.assertEqual(len(self.stub.requests), 3)
+
+    def test_retries_are_bounded(self):
+        self.stub.respond("/", json_response({}, status=503))
+
+        response = http.http_get(self.stub.get_url())
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(self.stub.requests), 1 + OUTBOUND_HTTP_MAX_RETRIES)
+
+    def test_other_errors_are_not_retried(self):
+        self.stub.respond("/", json_response({}, status=500))
+
+        response = http.http_get(self.stub.get_url())
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(len(self.stub.requests), 1)
+        self.assertEqual(http.get_http_stats(self.stub.get_url())[ERRORS], 1)
+
+    def test_slow_responses_time_out(self):
+        self.stub.respond("/", json_response({"ok": True}))
+        self.stub.delay = 0.5
+
+        start = time.perf_counter()
+
+        with mock.patch.object(http, "OUTBOUND_HTTP_TIMEOUT", (1, 0.1)):
+            with self.assertRaises(requests.RequestException):
+                http.http_get(self.stub.get_url())
+
+        ## every attempt gives up after the read timeout instead of waiting for the response
+        self.assertLess(
+            time.perf_counter() - start,
+            self.stub.delay * (1 + OUTBOUND_HTTP_MAX_RETRIES),
+        )
+        self.assertEqual(http.get_http_stats(self.stub.get_url())[ERRORS], 1)
+
+
+class FacebookAuthenticationTest(StubServerTestCase):
+    def setUp(self):
+        super().setUp()
+
+        for name, value in (
+            ("FACEBOOK_GRAPH_API_URL", self.stub.get_url()),
+            ("FACEBOOK_APP_ID", "test-app-id"),
+        ):
+            patcher = mock.patch.object(serializers, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.stub.respond(
+            "/debug_token",
+            json_response(
+                {
+                    "data": {
+                        "app_id": "test-app-id",
+                        "is_valid": True,
+                        "scopes": ["email", "public_profile"],
+                    }
+                }
+            ),
+        )
+        self.stub.respond(
+            "/me",
+            json_response(
+                {
+                    "id": "1234567890",
+                    "name": "User",
+                    "email": "user@example.com",
+                    "picture": {"data": {"url": "https://example.com/picture.jpg"}},
+                }
+            ),
+        )
+
+    def validate(self):
+        serializer = serializers.FacebookAuthenticationSerializer(
+            data={"access_token": "test-access-token"}
+        )
+        serializer.is_valid(raise_exception=True)
+
+        return serializer.validated_data
+
+    def test_profile_is_fetched_concurrently(self):
+        self.stub.delay = 0.5
+
+        start = time.perf_counter()
+        auth_data = self.validate()
+
+        self.assertLess(time.perf_counter() - start, 2 * self.stub.delay)
+        self.assertCountEqual(self.stub.requests, ["/debug_token", "/me"])
+        self.assertEqual(auth_data.email, "user@example.com")
+        self.assertEqual(auth_data.auth_id, "1234567890")
+        self.assertEqual(auth_data.profile_image, "https://example.com/picture.jpg")
+
+    def test_invalid_token_is_rejected(self):
+        self.stub.respond(
+            "/debug_token",
+            json_response({"data": {"app_id": "other-app-id", "is_valid": True}}),
+        )
+
+        with self.assertRaises(BadRequest):
+            self.validate()
+
+    def test_unreachable_facebook(self):
+        self.stub.delay = 0.5
+
+        with mock.patch.object(http, "OUTBOUND_HTTP_TIMEOUT", (1, 0.1)):
+            with self.assertRaises(InternalServerError):
+                self.validate()
+
+
+class AccessTokenRefreshTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.user = User.objects.create(email="user@example.com", name="User")
+
+    def refresh(self, refresh_token: RefreshToken):
+        return self.client.post(
+            reverse("token_refresh"),
+            data={REFRESH: str(refresh_token)},
+            content_type="application/json",
+        )
+
+    def test_token_without_claims_is_renewed_with_claims(self):
+        ## tokens issued before the claims were added
+        response = self.refresh(RefreshToken.for_user(self.user))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        tokens = response.json()[TOKENS]
+
+        for token in (RefreshToken(tokens[REFRESH]), AccessToken(tokens[ACCESS])):
+            self.assertEqual(token[ACCOUNT_TYPE_CLAIM], self.user.account_type)
+            self.assertEqual(token[USER_VERSION_CLAIM], self.user.version)
+
+    def test_token_with_stale_version_is_rejected(self):
+        refresh_token = logic.get_tokens(self.user)[REFRESH]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.version += 1
+            self.user.save()
+
+        response = self.refresh(RefreshToken(refresh_token))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
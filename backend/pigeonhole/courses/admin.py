@@ -17,6 +17,7 @@ from .models import (
     Comment,
     CourseSubmissionViewableGroup,
     CourseSubmissionViewableMember,
+    CourseSubmissionFieldCommentCount,
 )
 
 # Register your models here.
@@ -32,3 +33,4 @@ admin.site.register(CourseSubmissionComment, BaseAdmin)
 admin.site.register(Comment, BaseAdmin)
 admin.site.register(CourseSubmissionViewableGroup, BaseAdmin)
 admin.site.register(CourseSubmissionViewableMember, BaseAdmin)
+admin.site.register(CourseSubmissionFieldCommentCount, BaseAdmin)
@@ -1,10 +1,26 @@
 import logging
-from typing import Optional, Sequence
+from itertools import islice
+from typing import Any, Callable, Collection, Iterable, Iterator, Optional, Sequence
 from datetime import datetime
 
 from django.utils.timezone import get_default_timezone
 
-from django.db.models import QuerySet, Prefetch
+from django.db.models import (
+    Count,
+    Exists,
+    F,
+    IntegerField,
+    Max,
+    OuterRef,
+    Q,
+    QuerySet,
+    Prefetch,
+    Subquery,
+    Sum,
+    TextField,
+)
+from django.db.models.functions import Cast, Coalesce
+from django.core.cache import cache
 from django.db import IntegrityError, transaction
 
 from pigeonhole.common.constants import (
@@ -33,21 +49,66 @@ from pigeonhole.common.constants import (
     EDITOR,
     FORM_RESPONSE_DATA,
     TEMPLATE,
+    TEMPLATE_ID,
     GROUP,
     MILESTONE,
     ID,
     COMMENTS,
+    COMMENT_COUNTS,
+    COMMENT_COUNT,
+    ACTIVE_COMMENT_COUNT,
+    LATEST_COMMENT_AT,
     COMMENTER,
     FIELD_INDEX,
     CONTENT,
     IS_DELETED,
+    EMAIL,
+    ROW,
+    ROWS,
+    STATUS,
+    STATUS_COUNTS,
+    TYPE,
+    LABEL,
+    RESPONSE,
+    CREATED_AT,
+    UPDATED_AT,
+)
+from pigeonhole.settings import (
+    IMPORT_CHUNK_SIZE,
+    EXPORT_QUERY_CHUNK_SIZE,
+    EXPORT_STREAM_CHUNK_SIZE,
+    COURSE_MEMBERSHIP_INDEX_TIMEOUT,
+)
+from pigeonhole.common.cache import get_version, record_cache_access
+from pigeonhole.common.utils import get_etag
+from pigeonhole.common.renderers import RawJSON
+from pigeonhole.common.streaming import (
+    stream_csv,
+    stream_in_chunks,
+    stream_json_lines,
+)
+from pigeonhole.common.functions import EpochMs, JsonbArrayLength
+from pigeonhole.common.parsers import (
+    to_base_json,
+    base_row_to_json,
+    get_base_projection,
+    parse_datetime_to_ms_timestamp,
+    parse_keyset_to_cursor,
 )
-from pigeonhole.common.parsers import to_base_json, parse_datetime_to_ms_timestamp
-from forms.models import Form
+from forms.models import Form, FormFieldType
 from users.models import User
-from users.logic import user_to_json, get_users
+from users.logic import (
+    user_to_json,
+    user_to_json_or_id,
+    get_users,
+    get_user_projection,
+    user_row_to_json,
+    user_row_to_json_or_id,
+)
 
 from .models import (
+    COURSE_MEMBERSHIP_INDEX_NAMESPACE,
+    bump_course_membership_index_version,
     Comment,
     Course,
     CourseGroup,
@@ -58,6 +119,11 @@ from .models import (
     CourseSettings,
     CourseSubmission,
     CourseSubmissionComment,
+    CourseSubmissionFieldCommentCount,
+    CourseSubmissionViewableGroup,
+    CourseSubmissionViewableMember,
+    ExportFileFormat,
+    ImportRowStatus,
     PatchCourseGroupAction,
     Role,
     SubmissionType,
@@ -106,14 +172,565 @@ def get_requested_course_submissions(
     return submissions
 
 
+## Raw JSON read path
+## stored form JSON is fetched as text and spliced into the rendered response as is,
+## instead of being decoded here only to be re-encoded unchanged by the renderer.
+## the decoded fields are always deferred and the text is only read if its key is among the requested fields,
+## so only for read only requests.
+
+
+def annotate_raw_course_milestone_template_form_data(
+    templates: QuerySet[CourseMilestoneTemplate],
+    fields: Optional[Collection[str]] = None,
+) -> QuerySet[CourseMilestoneTemplate]:
+    if fields is None or FORM_FIELD_DATA in fields:
+        templates = templates.annotate(
+            raw_form_field_data=Cast("form__form_field_data", TextField())
+        )
+
+    return templates.defer("form__form_field_data")
+
+
+def annotate_raw_course_submission_form_data(
+    submissions: QuerySet[CourseSubmission],
+    fields: Optional[Collection[str]] = None,
+    with_template: bool = True,
+) -> QuerySet[CourseSubmission]:
+    ## field count is needed by comment views, see get_course_submission_field_count
+    annotations = {"form_response_field_count": JsonbArrayLength("form_response_data")}
+
+    if fields is None or FORM_RESPONSE_DATA in fields:
+        annotations["raw_form_response_data"] = Cast("form_response_data", TextField())
+
+    if with_template and (fields is None or TEMPLATE in fields):
+        annotations["raw_template_form_field_data"] = Cast(
+            "template__form__form_field_data", TextField()
+        )
+
+    return submissions.annotate(**annotations).defer(
+        "form_response_data", "template__form__form_field_data"
+    )
+
+
+def annotate_course_submission_comment_activity(
+    submissions: QuerySet[CourseSubmission],
+) -> QuerySet[CourseSubmission]:
+    ## counts are summed from the per-field counters instead of counting comment rows
+    field_comment_counts = (
+        CourseSubmissionFieldCommentCount.objects.filter(submission_id=OuterRef("id"))
+        .order_by()
+        .values("submission_id")
+    )
+
+    def get_total(count_field: str) -> Coalesce:
+        return Coalesce(
+            Subquery(
+                field_comment_counts.annotate(total=Sum(count_field)).values("total")
+            ),
+            0,
+            output_field=IntegerField(),
+        )
+
+    latest_comment_at = (
+        CourseSubmissionComment.objects.filter(submission_id=OuterRef("id"))
+        .order_by("-created_at")
+        .values("created_at")[:1]
+    )
+
+    return submissions.annotate(
+        comment_count=get_total("comment_count"),
+        deleted_comment_count=get_total("deleted_comment_count"),
+        latest_comment_at=Subquery(latest_comment_at),
+    )
+
+
+def get_raw_json_field(model, field_name: str, raw_json: Optional[str]):
+    if raw_json is not None:
+        return RawJSON(raw_json)
+
+    ## deferred without raw JSON only if not requested, the key is then stripped by to_sparse_json
+    if field_name in model.get_deferred_fields():
+        return None
+
+    return getattr(model, field_name)
+
+
+def get_course_submission_field_count(submission: CourseSubmission) -> int:
+    if hasattr(submission, "form_response_field_count"):
+        return submission.form_response_field_count
+
+    return len(submission.form_response_data)
+
+
+def get_included_course_milestone_templates(
+    course: Course, template_ids: Iterable[Optional[int]]
+) -> dict[int, dict]:
+    templates = annotate_raw_course_milestone_template_form_data(
+        course.coursemilestonetemplate_set.filter(
+            id__in={
+                template_id for template_id in template_ids if template_id is not None
+            }
+        ).select_related("form")
+    )
+
+    return {
+        template.id: course_milestone_template_to_json(template)
+        for template in templates
+    }
+
+
+def get_course_submissions_page(
+    submissions: QuerySet[CourseSubmission],
+    cursor: Optional[tuple[datetime, int]],
+    page_size: int,
+    get_keyset: Callable[[Any], tuple[datetime, int]] = lambda submission: (
+        submission.updated_at,
+        submission.id,
+    ),
+) -> tuple[list, Optional[str]]:
+    ## keyset pagination on (updated_at, id) so that pages stay stable while submissions are added
+    submissions = submissions.order_by("updated_at", "id")
+
+    if cursor is not None:
+        updated_at, id = cursor
+        submissions = submissions.filter(
+            Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=id)
+        )
+
+    ## fetch one extra row to determine if there is a next page
+    page = list(submissions[: page_size + 1])
+
+    if len(page) <= page_size:
+        return page, None
+
+    page = page[:page_size]
+
+    return page, parse_keyset_to_cursor(*get_keyset(page[-1]))
+
+
 def get_course_submission_comments(
     submission: CourseSubmission,
 ) -> QuerySet[CourseSubmissionComment]:
+    ## use the prefetched comments when available to avoid a query per submission
+    if "coursesubmissioncomment_set" in getattr(
+        submission, "_prefetched_objects_cache", {}
+    ):
+        return submission.coursesubmissioncomment_set.all()
+
     return submission.coursesubmissioncomment_set.select_related(
         "comment__commenter__profile_image", "member"
     )
 
 
+def prefetch_course_submission_comments(
+    submissions: QuerySet[CourseSubmission],
+) -> QuerySet[CourseSubmission]:
+    return submissions.prefetch_related(
+        Prefetch(
+            lookup="coursesubmissioncomment_set",
+            queryset=CourseSubmissionComment.objects.select_related(
+                "comment__commenter__profile_image", "member"
+            ),
+        )
+    )
+
+
+def get_course_submissions_field_comment_counts(
+    submissions: Sequence[CourseSubmission],
+) -> dict[int, list[int]]:
+    field_comment_counts = {
+        submission.id: [0] * get_course_submission_field_count(submission)
+        for submission in submissions
+    }
+
+    comment_counts = CourseSubmissionFieldCommentCount.objects.filter(
+        submission_id__in=field_comment_counts
+    ).values_list("submission_id", "field_index", "comment_count")
+
+    for submission_id, field_index, comment_count in comment_counts:
+        ## comments on fields beyond the current response are not counted, as in CourseSubmissionFieldCommentsView
+        if field_index < len(field_comment_counts[submission_id]):
+            field_comment_counts[submission_id][field_index] = comment_count
+
+    return field_comment_counts
+
+
+def get_course_submission_field_comment_counts(
+    submission: CourseSubmission,
+) -> list[int]:
+    field_comment_counts = [0] * get_course_submission_field_count(submission)
+
+    comment_counts = submission.coursesubmissionfieldcommentcount_set.filter(
+        field_index__lt=len(field_comment_counts)
+    ).values_list("field_index", "comment_count")
+
+    for field_index, comment_count in comment_counts:
+        field_comment_counts[field_index] = comment_count
+
+    return field_comment_counts
+
+
+def get_expected_course_submission_field_comment_counts() -> dict[
+    tuple[int, int], tuple[int, int]
+]:
+    comment_counts = (
+        CourseSubmissionComment.objects.values("submission_id", "field_index")
+        .annotate(
+            comment_count=Count("id"),
+            deleted_comment_count=Count("id", filter=Q(comment__is_deleted=True)),
+        )
+        .values_list(
+            "submission_id", "field_index", "comment_count", "deleted_comment_count"
+        )
+        .order_by()
+    )
+
+    return {
+        (submission_id, field_index): (comment_count, deleted_comment_count)
+        for (
+            submission_id,
+            field_index,
+            comment_count,
+            deleted_comment_count,
+        ) in comment_counts.iterator()
+    }
+
+
+def get_course_submission_field_comment_count_mismatches() -> list[
+    tuple[int, int, tuple[int, int], tuple[int, int]]
+]:
+    expected_comment_counts = get_expected_course_submission_field_comment_counts()
+
+    stored_comment_counts = CourseSubmissionFieldCommentCount.objects.values_list(
+        "submission_id", "field_index", "comment_count", "deleted_comment_count"
+    )
+
+    mismatches = []
+
+    for (
+        submission_id,
+        field_index,
+        comment_count,
+        deleted_comment_count,
+    ) in stored_comment_counts.iterator():
+        expected_counts = expected_comment_counts.pop(
+            (submission_id, field_index), (0, 0)
+        )
+
+        if expected_counts != (comment_count, deleted_comment_count):
+            mismatches.append(
+                (
+                    submission_id,
+                    field_index,
+                    expected_counts,
+                    (comment_count, deleted_comment_count),
+                )
+            )
+
+    ## remaining fields have comments but no counter row
+    for (submission_id, field_index), expected_counts in sorted(
+        expected_comment_counts.items()
+    ):
+        mismatches.append((submission_id, field_index, expected_counts, (0, 0)))
+
+    return mismatches
+
+
+@transaction.atomic
+def rebuild_course_submission_field_comment_counts() -> int:
+    expected_comment_counts = get_expected_course_submission_field_comment_counts()
+
+    CourseSubmissionFieldCommentCount.objects.all().delete()
+
+    new_comment_counts = CourseSubmissionFieldCommentCount.objects.bulk_create(
+        (
+            CourseSubmissionFieldCommentCount(
+                submission_id=submission_id,
+                field_index=field_index,
+                comment_count=comment_count,
+                deleted_comment_count=deleted_comment_count,
+            )
+            for (submission_id, field_index), (
+                comment_count,
+                deleted_comment_count,
+            ) in expected_comment_counts.items()
+        ),
+        batch_size=500,
+    )
+
+    return len(new_comment_counts)
+
+
+def get_course_membership_index(user_id: int) -> dict[int, tuple[int, Role]]:
+    """
+    Maps the ids of the courses a user is a member of to their membership id and role.
+    The whole index of the user is cached on first access and invalidated by bumping its version
+    whenever one of the user's memberships is saved or deleted.
+    """
+
+    version = get_version(namespace=COURSE_MEMBERSHIP_INDEX_NAMESPACE, id=user_id)
+    key = f"{COURSE_MEMBERSHIP_INDEX_NAMESPACE}:{user_id}:{version}"
+
+    index = cache.get(key)
+    record_cache_access(
+        name=COURSE_MEMBERSHIP_INDEX_NAMESPACE, is_hit=index is not None
+    )
+
+    if index is None:
+        index = {
+            course_id: (membership_id, role)
+            for membership_id, course_id, role in CourseMembership.objects.filter(
+                user_id=user_id
+            ).values_list("id", "course_id", "role")
+        }
+        cache.set(key, index, timeout=COURSE_MEMBERSHIP_INDEX_TIMEOUT)
+
+    return index
+
+
+def get_visible_course_memberships(requester_id: int) -> QuerySet[CourseMembership]:
+    ## only show courses which are published or if course membership role is above STUDENT
+    return CourseMembership.objects.filter(
+        Q(user_id=requester_id), ~Q(role=Role.STUDENT) | Q(course__is_published=True)
+    )
+
+
+def get_visible_course_milestones(
+    course: Course, requester_membership: CourseMembership
+) -> QuerySet[CourseMilestone]:
+    visible_milestones: QuerySet[CourseMilestone] = course.coursemilestone_set.all()
+
+    if requester_membership.role == Role.STUDENT:
+        visible_milestones = visible_milestones.filter(is_published=True)
+
+    return visible_milestones
+
+
+def get_visible_course_milestone_templates(
+    course: Course, requester_membership: CourseMembership
+) -> QuerySet[CourseMilestoneTemplate]:
+    visible_templates: QuerySet[
+        CourseMilestoneTemplate
+    ] = course.coursemilestonetemplate_set.all()
+
+    if requester_membership.role == Role.STUDENT:
+        visible_templates = visible_templates.filter(is_published=True)
+
+    return visible_templates
+
+
+## ETag functions for conditional GETs, see pigeonhole.common.utils.conditional_get
+## list ETags are derived from a single aggregate query (row count and latest updated_at of every table
+## that contributes to the response, including users' profile images) so that a matching request is answered
+## without serialising the response.
+## Last-Modified is only given for single resources as deletions from a list do not advance max(updated_at).
+
+
+def get_user_etag_values(user: User) -> tuple:
+    return (
+        user.updated_at,
+        user.profile_image.updated_at if user.profile_image is not None else None,
+    )
+
+
+def get_requester_membership_etag_values(
+    requester_membership: CourseMembership,
+) -> tuple:
+    return (
+        requester_membership.id,
+        requester_membership.role,
+        requester_membership.updated_at,
+    )
+
+
+def get_my_courses_etag(request, *args, **kwargs) -> str:
+    ## the requester is only read from the token so that it is not loaded
+    requester_id = request.user.id
+
+    if not get_course_membership_index(requester_id):
+        return get_etag(requester_id)
+
+    aggregate = get_visible_course_memberships(requester_id).aggregate(
+        count=Count("id"),
+        updated_at=Max("updated_at"),
+        course_updated_at=Max("course__updated_at"),
+        owner_updated_at=Max("course__owner__updated_at"),
+        owner_profile_image_updated_at=Max("course__owner__profile_image__updated_at"),
+    )
+
+    return get_etag(requester_id, *aggregate.values())
+
+
+def get_course_last_modified(
+    request, course: Course, requester_membership: CourseMembership, *args, **kwargs
+) -> datetime:
+    return max(
+        course.updated_at,
+        course.coursesettings.updated_at,
+        *filter(None, get_user_etag_values(course.owner)),
+        requester_membership.updated_at,
+    )
+
+
+def get_course_etag(
+    request, course: Course, requester_membership: CourseMembership, *args, **kwargs
+) -> str:
+    return get_etag(
+        *get_requester_membership_etag_values(requester_membership),
+        course.updated_at,
+        course.coursesettings.updated_at,
+        *get_user_etag_values(course.owner),
+    )
+
+
+def get_course_milestones_etag(
+    request, course: Course, requester_membership: CourseMembership, *args, **kwargs
+) -> str:
+    aggregate = get_visible_course_milestones(
+        course=course, requester_membership=requester_membership
+    ).aggregate(count=Count("id"), updated_at=Max("updated_at"))
+
+    return get_etag(
+        *get_requester_membership_etag_values(requester_membership),
+        *aggregate.values(),
+    )
+
+
+def get_course_milestone_last_modified(
+    request,
+    requester_membership: CourseMembership,
+    milestone: CourseMilestone,
+    *args,
+    **kwargs,
+) -> datetime:
+    return max(milestone.updated_at, requester_membership.updated_at)
+
+
+def get_course_milestone_etag(
+    request,
+    requester_membership: CourseMembership,
+    milestone: CourseMilestone,
+    *args,
+    **kwargs,
+) -> str:
+    return get_etag(
+        *get_requester_membership_etag_values(requester_membership),
+        milestone.id,
+        milestone.updated_at,
+    )
+
+
+def get_course_milestone_templates_etag(
+    request, course: Course, requester_membership: CourseMembership, *args, **kwargs
+) -> str:
+    aggregate = get_visible_course_milestone_templates(
+        course=course, requester_membership=requester_membership
+    ).aggregate(
+        count=Count("id"),
+        updated_at=Max("updated_at"),
+        form_updated_at=Max("form__updated_at"),
+    )
+
+    return get_etag(
+        *get_requester_membership_etag_values(requester_membership),
+        *aggregate.values(),
+    )
+
+
+def get_course_milestone_template_last_modified(
+    request,
+    requester_membership: CourseMembership,
+    template: CourseMilestoneTemplate,
+    *args,
+    **kwargs,
+) -> datetime:
+    return max(
+        template.updated_at, template.form.updated_at, requester_membership.updated_at
+    )
+
+
+def get_course_milestone_template_etag(
+    request,
+    requester_membership: CourseMembership,
+    template: CourseMilestoneTemplate,
+    *args,
+    **kwargs,
+) -> str:
+    return get_etag(
+        *get_requester_membership_etag_values(requester_membership),
+        template.id,
+        template.updated_at,
+        template.form.updated_at,
+    )
+
+
+def get_course_memberships_etag(
+    request, course: Course, requester_membership: CourseMembership, *args, **kwargs
+) -> str:
+    aggregate = course.coursemembership_set.aggregate(
+        count=Count("id"),
+        updated_at=Max("updated_at"),
+        user_updated_at=Max("user__updated_at"),
+        profile_image_updated_at=Max("user__profile_image__updated_at"),
+    )
+
+    return get_etag(
+        *get_requester_membership_etag_values(requester_membership),
+        *aggregate.values(),
+    )
+
+
+def get_course_groups_etag(
+    request, course: Course, requester_membership: CourseMembership, *args, **kwargs
+) -> str:
+    aggregate = course.coursegroup_set.aggregate(
+        count=Count("id", distinct=True),
+        updated_at=Max("updated_at"),
+        member_count=Count("coursegroupmember", distinct=True),
+        member_updated_at=Max("coursegroupmember__updated_at"),
+        user_updated_at=Max("coursegroupmember__member__user__updated_at"),
+        profile_image_updated_at=Max(
+            "coursegroupmember__member__user__profile_image__updated_at"
+        ),
+    )
+
+    return get_etag(
+        *get_requester_membership_etag_values(requester_membership),
+        course.coursesettings.updated_at,
+        *aggregate.values(),
+    )
+
+
+def get_course_group_etag(
+    request,
+    course: Course,
+    requester_membership: CourseMembership,
+    group: CourseGroup,
+    *args,
+    **kwargs,
+) -> str:
+    ## members are already prefetched by check_group
+    group_members = group.coursegroupmember_set.all()
+
+    return get_etag(
+        *get_requester_membership_etag_values(requester_membership),
+        course.coursesettings.updated_at,
+        group.id,
+        group.updated_at,
+        len(group_members),
+        max(
+            (
+                max(
+                    group_member.updated_at,
+                    *filter(None, get_user_etag_values(group_member.member.user)),
+                )
+                for group_member in group_members
+            ),
+            default=None,
+        ),
+    )
+
+
 def course_summary_to_json(course: Course, membership: CourseMembership) -> dict:
     data = to_base_json(course)
 
@@ -128,6 +745,32 @@ def course_summary_to_json(course: Course, membership: CourseMembership) -> dict
     return data
 
 
+def get_course_summary_projection() -> tuple:
+    ## projected from the requester's course membership
+    return (
+        *get_base_projection("course__"),
+        "course__name",
+        *get_user_projection("course__owner__"),
+        "course__description",
+        "course__is_published",
+        "role",
+    )
+
+
+def course_summary_row_to_json(values: Iterator) -> dict:
+    data = base_row_to_json(values)
+
+    data |= {
+        NAME: next(values),
+        OWNER: user_row_to_json(values),
+        DESCRIPTION: next(values),
+        IS_PUBLISHED: next(values),
+        ROLE: next(values),
+    }
+
+    return data
+
+
 def course_to_json(course: Course, membership: CourseMembership) -> dict:
     data = course_summary_to_json(course=course, membership=membership)
 
@@ -160,6 +803,31 @@ def course_milestone_to_json(milestone: CourseMilestone) -> dict:
     return data
 
 
+def get_course_milestone_projection() -> tuple:
+    return (
+        *get_base_projection(),
+        "name",
+        "description",
+        EpochMs("start_date_time"),
+        EpochMs("end_date_time"),
+        "is_published",
+    )
+
+
+def course_milestone_row_to_json(values: Iterator) -> dict:
+    data = base_row_to_json(values)
+
+    data |= {
+        NAME: next(values),
+        DESCRIPTION: next(values),
+        START_DATE_TIME: next(values),
+        END_DATE_TIME: next(values),
+        IS_PUBLISHED: next(values),
+    }
+
+    return data
+
+
 def course_membership_to_json(membership: CourseMembership) -> dict:
     data = to_base_json(membership)
 
@@ -171,20 +839,94 @@ def course_membership_to_json(membership: CourseMembership) -> dict:
     return data
 
 
+def get_course_membership_projection() -> tuple:
+    return (
+        *get_base_projection(),
+        *get_user_projection("user__"),
+        "role",
+    )
+
+
+def course_membership_row_to_json(values: Iterator) -> dict:
+    data = base_row_to_json(values)
+
+    data |= {
+        USER: user_row_to_json(values),
+        ROLE: next(values),
+    }
+
+    return data
+
+
+def get_course_groups_with_member_count(
+    course: Course,
+) -> QuerySet[CourseGroup]:
+    return course.coursegroup_set.annotate(member_count=Count("coursegroupmember"))
+
+
+def get_viewable_course_groups(
+    course: Course, membership: CourseMembership, only_my_groups: bool = False
+) -> QuerySet[CourseGroup]:
+    groups = get_course_groups_with_member_count(course).annotate(
+        is_member=Exists(
+            CourseGroupMember.objects.filter(
+                group_id=OuterRef("id"), member=membership
+            )
+        )
+    )
+
+    if only_my_groups:
+        groups = groups.filter(is_member=True)
+
+    group_members = CourseGroupMember.objects.select_related(
+        "member__user__profile_image"
+    )
+
+    ## members are only fetched for the groups which will be rendered with members, see can_view_course_group_members
+    if (
+        membership.role == Role.STUDENT
+        and not course.coursesettings.show_group_members_names
+    ):
+        group_members = group_members.filter(
+            group_id__in=CourseGroupMember.objects.filter(member=membership).values(
+                "group_id"
+            )
+        )
+
+    return groups.prefetch_related(
+        Prefetch(lookup="coursegroupmember_set", queryset=group_members)
+    )
+
+
+def get_course_group_member_count(group: CourseGroup) -> int:
+    ## use the annotated count or prefetched members when available to avoid a COUNT query per group
+    if hasattr(group, "member_count"):
+        return group.member_count
+
+    if "coursegroupmember_set" in getattr(group, "_prefetched_objects_cache", {}):
+        return len(group.coursegroupmember_set.all())
+
+    return group.coursegroupmember_set.count()
+
+
 def course_group_to_json(group: CourseGroup) -> dict:
     data = to_base_json(group)
 
-    data |= {NAME: group.name, MEMBER_COUNT: group.coursegroupmember_set.count()}
+    data |= {NAME: group.name, MEMBER_COUNT: get_course_group_member_count(group)}
 
     return data
 
 
-def course_group_with_members_to_json(group: CourseGroup) -> dict:
+def course_group_with_members_to_json(
+    group: CourseGroup, included_users: Optional[dict[int, dict]] = None
+) -> dict:
     data = course_group_to_json(group=group)
 
     data |= {
         MEMBERS: [
-            user_to_json(group_member.member.user)
+            user_to_json_or_id(
+                user=group_member.member.user, included_users=included_users
+            )
             for group_member in group.coursegroupmember_set.all()
         ],
     }
@@ -200,13 +942,19 @@ def course_milestone_template_to_json(template: CourseMilestoneTemplate) -> dict
         DESCRIPTION: template.description,
         SUBMISSION_TYPE: template.submission_type,
         IS_PUBLISHED: template.is_published,
-        FORM_FIELD_DATA: template.form.form_field_data,
+        FORM_FIELD_DATA: get_raw_json_field(
+            model=template.form,
+            field_name="form_field_data",
+            raw_json=getattr(template, "raw_form_field_data", None),
+        ),
     }
 
     return data
 
 
-def course_submission_summary_to_json(submission: CourseSubmission) -> dict:
+def course_submission_summary_to_json(
+    submission: CourseSubmission, included_users: Optional[dict[int, dict]] = None
+) -> dict:
     data = to_base_json(submission)
 
     data |= {
@@ -214,10 +962,14 @@ def course_submission_summary_to_json(submission: CourseSubmission) -> dict:
         DESCRIPTION: submission.description,
         IS_DRAFT: submission.is_draft,
         SUBMISSION_TYPE: submission.submission_type,
-        CREATOR: user_to_json(submission.creator.user)
+        CREATOR: user_to_json_or_id(
+            user=submission.creator.user, included_users=included_users
+        )
         if submission.creator is not None
         else None,
-        EDITOR: user_to_json(submission.editor.user)
+        EDITOR: user_to_json_or_id(
+            user=submission.editor.user, included_users=included_users
+        )
         if submission.editor is not None
         else None,
         MILESTONE: {ID: submission.milestone.id, NAME: submission.milestone.name}
@@ -228,14 +980,80 @@ def course_submission_summary_to_json(submission: CourseSubmission) -> dict:
         else None,
     }
 
+    ## only listings are annotated, see annotate_course_submission_comment_activity
+    if hasattr(submission, "comment_count"):
+        data |= {
+            COMMENT_COUNT: submission.comment_count,
+            ACTIVE_COMMENT_COUNT: submission.comment_count
+            - submission.deleted_comment_count,
+            LATEST_COMMENT_AT: parse_datetime_to_ms_timestamp(
+                submission.latest_comment_at
+            ),
+        }
+
+    return data
+
+
+def get_course_submission_summary_projection() -> tuple:
+    return (
+        *get_base_projection(),
+        "name",
+        "description",
+        "is_draft",
+        "submission_type",
+        *get_user_projection("creator__user__"),
+        *get_user_projection("editor__user__"),
+        "milestone__id",
+        "milestone__name",
+        "group__id",
+        "group__name",
+        "comment_count",
+        "deleted_comment_count",
+        EpochMs("latest_comment_at"),
+    )
+
+
+def course_submission_summary_row_to_json(
+    values: Iterator, included_users: Optional[dict[int, dict]] = None
+) -> dict:
+    data = base_row_to_json(values)
+
+    data |= {
+        NAME: next(values),
+        DESCRIPTION: next(values),
+        IS_DRAFT: next(values),
+        SUBMISSION_TYPE: next(values),
+        CREATOR: user_row_to_json_or_id(values=values, included_users=included_users),
+        EDITOR: user_row_to_json_or_id(values=values, included_users=included_users),
+        MILESTONE: {ID: next(values), NAME: next(values)},
+        GROUP: {ID: next(values), NAME: next(values)},
+        COMMENT_COUNT: next(values),
+    }
+
+    data |= {
+        ACTIVE_COMMENT_COUNT: data[COMMENT_COUNT] - next(values),
+        LATEST_COMMENT_AT: next(values),
+    }
+
+    ## null relations are projected as null columns
+    if data[MILESTONE][ID] is None:
+        data[MILESTONE] = None
+
+    if data[GROUP][ID] is None:
+        data[GROUP] = None
+
     return data
 
 
-def comment_to_json(comment: Comment) -> dict:
+def comment_to_json(
+    comment: Comment, included_users: Optional[dict[int, dict]] = None
+) -> dict:
     data = to_base_json(comment)
 
     data |= {
-        COMMENTER: user_to_json(comment.commenter)
+        COMMENTER: user_to_json_or_id(
+            user=comment.commenter, included_users=included_users
+        )
         if comment.commenter is not None
         else None,
         CONTENT: "" if comment.is_deleted else comment.content,
@@ -247,8 +1065,11 @@ def comment_to_json(comment: Comment) -> dict:
 
 def course_submission_comment_to_json(
     submission_comment: CourseSubmissionComment,
+    included_users: Optional[dict[int, dict]] = None,
 ) -> dict:
-    data = comment_to_json(submission_comment.comment)
+    data = comment_to_json(
+        comment=submission_comment.comment, included_users=included_users
+    )
 
     data |= {
         FIELD_INDEX: submission_comment.field_index,
@@ -263,28 +1084,197 @@ def course_submission_comment_to_json(
 
 
 def course_submission_to_json(
-    submission: CourseSubmission, with_comments: bool = False
+    submission: CourseSubmission,
+    with_comments: bool = False,
+    included_users: Optional[dict[int, dict]] = None,
+    with_template_reference: bool = False,
+    field_comment_counts: Optional[list[int]] = None,
 ) -> dict:
-    data = course_submission_summary_to_json(submission)
+    data = course_submission_summary_to_json(
+        submission=submission, included_users=included_users
+    )
+
+    if submission.template is not None and hasattr(
+        submission, "raw_template_form_field_data"
+    ):
+        submission.template.raw_form_field_data = (
+            submission.raw_template_form_field_data
+        )
+
+    ## template is referenced by id if it is side-loaded, see get_included_course_milestone_templates
+    data |= (
+        {TEMPLATE_ID: submission.template_id}
+        if with_template_reference
+        else {
+            TEMPLATE: course_milestone_template_to_json(submission.template)
+            if submission.template is not None
+            else None
+        }
+    )
 
     data |= {
-        TEMPLATE: course_milestone_template_to_json(submission.template)
-        if submission.template is not None
-        else None,
-        FORM_RESPONSE_DATA: submission.form_response_data,
+        FORM_RESPONSE_DATA: get_raw_json_field(
+            model=submission,
+            field_name="form_response_data",
+            raw_json=getattr(submission, "raw_form_response_data", None),
+        ),
     }
 
     if with_comments:
         comments = get_course_submission_comments(submission)
         data |= {
             COMMENTS: [
-                course_submission_comment_to_json(comment) for comment in comments
+                course_submission_comment_to_json(
+                    submission_comment=comment, included_users=included_users
+                )
+                for comment in comments
             ]
         }
 
+    if field_comment_counts is not None:
+        data |= {COMMENT_COUNTS: field_comment_counts}
+
     return data
 
 
+COURSE_SUBMISSION_EXPORT_BASE_COLUMNS = (
+    ID,
+    NAME,
+    MILESTONE,
+    TEMPLATE,
+    GROUP,
+    IS_DRAFT,
+    CREATED_AT,
+    CREATOR,
+    UPDATED_AT,
+    EDITOR,
+)
+
+
+def get_course_submission_export_field_columns(
+    templates: Sequence[CourseMilestoneTemplate],
+) -> dict[int, list[tuple[int, str]]]:
+    """
+    Maps each template id to its (field index, column name) pairs.
+    Column names are derived from the form field labels and prefixed with the template name
+    when more than one template is exported.
+    """
+    used_columns = set(COURSE_SUBMISSION_EXPORT_BASE_COLUMNS)
+    template_id_to_field_columns_map = {}
+
+    for template in templates:
+        field_columns = []
+
+        for field_index, form_field in enumerate(template.form.form_field_data):
+            if form_field.get(TYPE) == FormFieldType.TEXT_DISPLAY:
+                continue
+
+            label = form_field.get(LABEL) or f"Field {field_index + 1}"
+            column = label if len(templates) == 1 else f"{template.form.name}: {label}"
+
+            ## disambiguate duplicate labels
+            unique_column = column
+            count = 1
+            while unique_column in used_columns:
+                unique_column = f"{column} ({count})"
+                count += 1
+
+            used_columns.add(unique_column)
+            field_columns.append((field_index, unique_column))
+
+        template_id_to_field_columns_map[template.id] = field_columns
+
+    return template_id_to_field_columns_map
+
+
+def form_response_to_export_value(form_response: dict):
+    response = form_response.get(RESPONSE)
+
+    return (
+        " & ".join(map(str, response)) if isinstance(response, list) else response
+    )
+
+
+def course_submission_to_export_row(
+    submission: CourseSubmission, field_columns: Sequence[tuple[int, str]]
+) -> dict:
+    row = {
+        ID: submission.id,
+        NAME: submission.name,
+        MILESTONE: submission.milestone.name
+        if submission.milestone is not None
+        else None,
+        TEMPLATE: submission.template.form.name
+        if submission.template is not None
+        else None,
+        GROUP: submission.group.name if submission.group is not None else None,
+        IS_DRAFT: submission.is_draft,
+        CREATED_AT: parse_datetime_to_ms_timestamp(submission.created_at),
+        CREATOR: submission.creator.user.name
+        if submission.creator is not None
+        else None,
+        UPDATED_AT: parse_datetime_to_ms_timestamp(submission.updated_at),
+        EDITOR: submission.editor.user.name if submission.editor is not None else None,
+    }
+
+    form_response_data = submission.form_response_data
+
+    for field_index, column in field_columns:
+        form_response = (
+            form_response_data[field_index]
+            if field_index < len(form_response_data)
+            else None
+        )
+        row[column] = (
+            form_response_to_export_value(form_response)
+            if isinstance(form_response, dict)
+            else None
+        )
+
+    return row
+
+
+def stream_course_submissions_export(
+    course: Course,
+    submissions: QuerySet[CourseSubmission],
+    file_format: ExportFileFormat,
+) -> Iterator[bytes]:
+    templates = list(
+        course.coursemilestonetemplate_set.filter(
+            id__in=submissions.values("template_id")
+        ).select_related("form")
+    )
+    template_id_to_field_columns_map = get_course_submission_export_field_columns(
+        templates
+    )
+
+    ## form field data is read once per template above instead of once per submission
+    submission_rows = (
+        course_submission_to_export_row(
+            submission=submission,
+            field_columns=template_id_to_field_columns_map.get(
+                submission.template_id, ()
+            ),
+        )
+        for submission in submissions.defer("template__form__form_field_data")
+        .order_by("created_at", "id")
+        .iterator(chunk_size=EXPORT_QUERY_CHUNK_SIZE)
+    )
+
+    match file_format:
+        case ExportFileFormat.JSONL:
+            lines = stream_json_lines(submission_rows)
+        case _:
+            columns = list(COURSE_SUBMISSION_EXPORT_BASE_COLUMNS) + [
+                column
+                for template in templates
+                for _, column in template_id_to_field_columns_map[template.id]
+            ]
+            lines = stream_csv(columns=columns, rows=submission_rows)
+
+    return stream_in_chunks(lines, chunk_size=EXPORT_STREAM_CHUNK_SIZE)
+
+
 @transaction.atomic
 def create_course(
     owner: User,
@@ -476,6 +1466,92 @@ def update_course_membership(
     return membership
 
 
+def import_course_memberships(
+    course: Course,
+    member_creation_data: Iterable[Optional[dict]],
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> dict:
+    """
+    Creates missing users and course memberships from a stream of rows.
+    Invalid rows are given as None. Rows are consumed in fixed-size chunks so that
+    memory and the number of queries stay bounded regardless of the roster size.
+    """
+    rows = []
+    status_counts = {status: 0 for status in ImportRowStatus}
+    numbered_data = enumerate(member_creation_data, start=1)
+
+    while chunk := list(islice(numbered_data, chunk_size)):
+        for row_number, email, status in import_course_memberships_chunk(
+            course=course, numbered_data=chunk
+        ):
+            rows.append({ROW: row_number, EMAIL: email, STATUS: status})
+            status_counts[status] += 1
+
+    return {ROWS: rows, STATUS_COUNTS: status_counts}
+
+
+@transaction.atomic
+def import_course_memberships_chunk(
+    course: Course, numbered_data: Sequence[tuple[int, Optional[dict]]]
+) -> list[tuple[int, Optional[str], ImportRowStatus]]:
+    email_to_name_map = {}
+
+    for _, data in numbered_data:
+        if data is not None:
+            email_to_name_map.setdefault(data["email"], data.get("name", ""))
+
+    email_to_user_id_map = dict(
+        get_users(email__in=email_to_name_map.keys()).values_list("email", "id")
+    )
+
+    ## users created concurrently by another import are skipped on conflict
+    new_emails = email_to_name_map.keys() - email_to_user_id_map.keys()
+    User.objects.bulk_create(
+        (User(email=email, name=email_to_name_map[email]) for email in new_emails),
+        ignore_conflicts=True,
+    )
+    email_to_user_id_map.update(
+        get_users(email__in=new_emails).values_list("email", "id")
+    )
+
+    existing_member_user_ids = set(
+        course.coursemembership_set.filter(
+            user_id__in=email_to_user_id_map.values()
+        ).values_list("user_id", flat=True)
+    )
+    new_member_user_ids = set(email_to_user_id_map.values()) - existing_member_user_ids
+    CourseMembership.objects.bulk_create(
+        (
+            CourseMembership(course=course, user_id=user_id)
+            for user_id in new_member_user_ids
+        ),
+        ignore_conflicts=True,
+    )
+
+    ## bulk_create does not send post_save signals
+    for user_id in new_member_user_ids:
+        bump_course_membership_index_version(user_id)
+
+    results = []
+
+    for row_number, data in numbered_data:
+        if data is None:
+            results.append((row_number, None, ImportRowStatus.INVALID))
+            continue
+
+        email = data["email"]
+        user_id = email_to_user_id_map[email]
+
+        if user_id in existing_member_user_ids:
+            results.append((row_number, email, ImportRowStatus.EXISTING))
+        else:
+            results.append((row_number, email, ImportRowStatus.ADDED))
+            ## subsequent duplicate rows within the import refer to the same membership
+            existing_member_user_ids.add(user_id)
+
+    return results
+
+
 @transaction.atomic
 def create_course_group(course: Course, name: str) -> CourseGroup:
     try:
@@ -486,6 +1562,9 @@ def create_course_group(course: Course, name: str) -> CourseGroup:
             "Another group with the same name already exists in this course."
         )
 
+    ## a newly created group has no members
+    new_group.member_count = 0
+
     return new_group
 
 
@@ -502,6 +1581,10 @@ def is_group_member(
     if force_query_db:
         return group.coursegroupmember_set.filter(member=membership).exists()
 
+    ## use the annotation when available as members may not be prefetched, see get_viewable_course_groups
+    if hasattr(group, "is_member"):
+        return group.is_member
+
     return any(
         group_member.member == membership
         for group_member in group.coursegroupmember_set.all()
@@ -573,32 +1656,42 @@ def update_course_group(group: CourseGroup, name: str) -> CourseGroup:
 def batch_update_course_group_members(
     course: Course, group: CourseGroup, user_ids: Sequence[int]
 ) -> CourseGroup:
-
-    # delete members whose ids are not in list of ids
-    group_members_to_delete = CourseGroupMember.objects.filter(group=group).exclude(
-        member__user__id__in=user_ids
+    # resolve all memberships in a single query
+    user_id_to_membership_id_map = dict(
+        course.coursemembership_set.filter(user_id__in=user_ids).values_list(
+            "user_id", "id"
+        )
     )
-    _, _ = group_members_to_delete.delete()
 
-    # add members that are not in group
-    for user_id in user_ids:
-        try:
-            membership = course.coursemembership_set.get(user_id=user_id)
+    invalid_user_ids = sorted(set(user_ids) - user_id_to_membership_id_map.keys())
 
-            if CourseGroupMember.objects.filter(
-                group=group, member_id=membership.id
-            ).exists():
-                continue
+    if invalid_user_ids:
+        logger.warning(f"Users not in course {course.id}: {invalid_user_ids}")
+        raise ValueError(
+            f"One or more of the members are not a part of this course: {', '.join(map(str, invalid_user_ids))}."
+        )
 
-            CourseGroupMember.objects.create(member=membership, group=group)
-        except CourseMembership.DoesNotExist as e:
-            logger.warning(e)
-            raise ValueError(
-                "One or more of the members are not a part of this course."
-            )
-        except IntegrityError as e:
-            logger.warning(e)
-            raise ValueError("Unable to add a member to the group.")
+    membership_ids = user_id_to_membership_id_map.values()
+
+    # delete members whose ids are not in list of ids
+    _, _ = (
+        CourseGroupMember.objects.filter(group=group)
+        .exclude(member_id__in=membership_ids)
+        .delete()
+    )
+
+    # add members that are not in group, existing members are skipped on conflict
+    try:
+        CourseGroupMember.objects.bulk_create(
+            (
+                CourseGroupMember(member_id=membership_id, group=group)
+                for membership_id in membership_ids
+            ),
+            ignore_conflicts=True,
+        )
+    except IntegrityError as e:
+        logger.warning(e)
+        raise ValueError("Unable to add a member to the group.")
 
     updated_group = CourseGroup.objects.prefetch_related(
         Prefetch(
@@ -828,39 +1921,52 @@ def update_course_submission(
     return submission
 
 
-def can_view_course_submission(
-    requester_membership: CourseMembership, submission: CourseSubmission
-) -> bool:
-    return (
-        requester_membership.role != Role.STUDENT
-        or submission.creator == requester_membership
-        or (
-            submission.group is not None
-            and is_group_member(
-                membership=requester_membership,
-                group=submission.group,
-                force_query_db=True,
-            )
-        )
-        or any(
-            requester_membership == viewable_member.member
-            for viewable_member in submission.coursesubmissionviewablemember_set.select_related(
-                "member"
+def get_viewable_course_submissions(
+    submissions: QuerySet[CourseSubmission], requester_membership: CourseMembership
+) -> QuerySet[CourseSubmission]:
+    if requester_membership.role != Role.STUDENT:
+        return submissions
+
+    requester_group_ids = CourseGroupMember.objects.filter(
+        member=requester_membership
+    ).values("group_id")
+
+    ## visibility is resolved in the same query as the submissions instead of per submission
+    return submissions.filter(
+        Q(creator=requester_membership)
+        | Q(group_id__in=requester_group_ids)
+        | Q(
+            Exists(
+                CourseSubmissionViewableMember.objects.filter(
+                    submission_id=OuterRef("id"), member=requester_membership
+                )
             )
         )
-        or any(
-            is_group_member(
-                membership=requester_membership,
-                group=viewable_group.group,
-                force_query_db=True,
-            )
-            for viewable_group in submission.coursesubmissionviewablegroup_set.select_related(
-                "group"
+        | Q(
+            Exists(
+                CourseSubmissionViewableGroup.objects.filter(
+                    submission_id=OuterRef("id"), group_id__in=requester_group_ids
+                )
             )
         )
     )
 
 
+def can_view_course_submission(
+    requester_membership: CourseMembership, submission: CourseSubmission
+) -> bool:
+    if (
+        requester_membership.role != Role.STUDENT
+        or submission.creator_id == requester_membership.id
+    ):
+        return True
+
+    return get_viewable_course_submissions(
+        submissions=CourseSubmission.objects.filter(id=submission.id),
+        requester_membership=requester_membership,
+    ).exists()
+
+
 def can_update_course_submission(
     requester_membership: CourseMembership, submission: CourseSubmission
 ) -> bool:
@@ -906,6 +2012,14 @@ def create_course_submission_comment(
         member=member,
     )
 
+    ## get_or_create followed by an F() update so that concurrent comments on the same field are not lost
+    CourseSubmissionFieldCommentCount.objects.get_or_create(
+        submission=submission, field_index=field_index
+    )
+    CourseSubmissionFieldCommentCount.objects.filter(
+        submission=submission, field_index=field_index
+    ).update(comment_count=F("comment_count") + 1)
+
     return new_submission_comment
 
 
@@ -932,4 +2046,9 @@ def delete_course_submission_comment(
 
     comment.save()
 
+    CourseSubmissionFieldCommentCount.objects.filter(
+        submission_id=submission_comment.submission_id,
+        field_index=submission_comment.field_index,
+    ).update(deleted_comment_count=F("deleted_comment_count") + 1)
+
     return submission_comment
@@ -1,13 +1,26 @@
 import logging
+from typing import Optional
 
+from django.core.cache import cache
 from django.db.models import Prefetch
 
-from rest_framework.exceptions import NotFound, PermissionDenied
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed, NotFound, PermissionDenied
+from rest_framework.response import Response
 
+from pigeonhole.common.cache import get_version, record_cache_access
 from pigeonhole.common.constants import MILESTONE
-from users.models import User
-from .logic import get_courses
+from pigeonhole.common.serializers import SparseFieldsSerializer
+from pigeonhole.settings import COURSE_RESPONSE_CACHE_TIMEOUT, USER_VERSION_CLAIM
+from users.models import User, AccountType
+from users.logic import get_users
+from .logic import (
+    annotate_raw_course_milestone_template_form_data,
+    annotate_raw_course_submission_form_data,
+    get_courses,
+)
 from .models import (
+    COURSE_CACHE_NAMESPACE,
     Course,
     CourseGroup,
     CourseGroupMember,
@@ -22,41 +35,54 @@ from .models import (
 logger = logging.getLogger("main")
 
 
-def check_course(view_method):
-    def _arguments_wrapper(instance, request, course_id: int, *args, **kwargs):
-        try:
-            course = (
-                get_courses(id=course_id)
-                .select_related("owner__profile_image", "coursesettings")
-                .get()
-            )
-
-        except Course.DoesNotExist as e:
-            logger.warning(e)
-            raise NotFound(detail="No course found.")
-
-        return view_method(instance, request, course=course, *args, **kwargs)
-
-    return _arguments_wrapper
-
+def check_course_access(
+    *allowed_roles: Role,
+    allowed_account_types: tuple[AccountType, ...] = (
+        AccountType.STANDARD,
+        AccountType.EDUCATOR,
+        AccountType.ADMIN,
+    ),
+):
+    """
+    Resolves the requester, course, course settings and requester membership for course endpoints
+    in a single query. Roles are checked against the loaded membership rather than the cached course
+    membership index, which may lag a concurrent role change.
+    """
 
-def check_requester_membership(*allowed_roles: Role):
     def _method_wrapper(view_method):
-        def _arguments_wrapper(
-            instance, request, requester: User, course: Course, *args, **kwargs
-        ):
+        def _arguments_wrapper(instance, request, course_id: int, *args, **kwargs):
+            requester_id = request.user.id
+
             try:
-                requester_membership = course.coursemembership_set.get(user=requester)
+                requester_membership = CourseMembership.objects.select_related(
+                    "user__profile_image",
+                    "course__owner__profile_image",
+                    "course__coursesettings",
+                ).get(user_id=requester_id, course_id=course_id)
 
             except CourseMembership.DoesNotExist as e:
                 logger.warning(e)
+                raise_course_access_error(
+                    requester_id=requester_id,
+                    course_id=course_id,
+                    allowed_account_types=allowed_account_types,
+                )
+
+            requester: User = requester_membership.user
+            course: Course = requester_membership.course
+
+            ## tokens issued before the account type changed are rejected
+            token_version = request.auth.get(USER_VERSION_CLAIM)
+
+            if token_version is not None and token_version != requester.version:
+                raise AuthenticationFailed(detail="Invalid user.")
+
+            if requester.account_type not in allowed_account_types:
                 raise PermissionDenied()
 
             if requester_membership.role not in allowed_roles:
                 raise PermissionDenied()
 
-            requester_membership.user = requester
-
             return view_method(
                 instance,
                 request,
@@ -72,6 +98,70 @@ def check_requester_membership(*allowed_roles: Role):
     return _method_wrapper
 
 
+def cache_course_response(view_method):
+    """
+    Caches the response data of read-mostly course endpoints.
+    Must be placed below check_course_access. Entries are keyed on the course version which is bumped
+    whenever the course, its settings, milestones or templates change, and on the requester's role
+    as the visible content depends on it.
+    """
+
+    def _arguments_wrapper(
+        instance,
+        request,
+        course: Course,
+        requester_membership: CourseMembership,
+        *args,
+        **kwargs,
+    ):
+        name = instance.__class__.__name__
+        version = get_version(namespace=COURSE_CACHE_NAMESPACE, id=course.id)
+        key = f"{name}:{course.id}:{version}:{requester_membership.role}:{request.get_full_path()}"
+
+        data = cache.get(key)
+        record_cache_access(name=name, is_hit=data is not None)
+
+        if data is not None:
+            return Response(data=data, status=status.HTTP_200_OK)
+
+        response = view_method(
+            instance,
+            request,
+            course=course,
+            requester_membership=requester_membership,
+            *args,
+            **kwargs,
+        )
+
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, timeout=COURSE_RESPONSE_CACHE_TIMEOUT)
+
+        return response
+
+    return _arguments_wrapper
+
+
+def raise_course_access_error(
+    requester_id: int, course_id: int, allowed_account_types: tuple[AccountType, ...]
+):
+    ## only reached when the joined lookup finds no membership,
+    ## so the individual checks are replayed to raise the same errors as the separate decorators
+    account_type = (
+        get_users(id=requester_id).values_list("account_type", flat=True).first()
+    )
+
+    if account_type is None:
+        raise AuthenticationFailed(detail="Invalid user.")
+
+    if account_type not in allowed_account_types:
+        raise PermissionDenied()
+
+    if not get_courses(id=course_id).exists():
+        raise NotFound(detail="No course found.")
+
+    raise PermissionDenied()
+
+
 def check_milestone(view_method):
     def _arguments_wrapper(
         instance, request, milestone_id: int, course: Course, *args, **kwargs
@@ -137,15 +227,29 @@ def check_group(view_method):
     return _arguments_wrapper
 
 
+def get_requested_fields(request) -> Optional[frozenset[str]]:
+    ## form JSON columns are only read if requested, the views trim the other keys with to_sparse_json
+    serializer = SparseFieldsSerializer(data=request.query_params.dict())
+
+    serializer.is_valid(raise_exception=True)
+
+    return serializer.validated_data["fields"]
+
+
 def check_template(view_method):
     def _arguments_wrapper(
         instance, request, template_id: int, course: Course, *args, **kwargs
     ):
-        try:
-            template = course.coursemilestonetemplate_set.select_related("form").get(
-                id=template_id
+        templates = course.coursemilestonetemplate_set.select_related("form")
+
+        if request.method == "GET":
+            templates = annotate_raw_course_milestone_template_form_data(
+                templates, fields=get_requested_fields(request)
             )
 
+        try:
+            template = templates.get(id=template_id)
+
         except CourseMilestoneTemplate.DoesNotExist as e:
             logger.warning(e)
             raise NotFound(detail="No template found.")
@@ -161,14 +265,21 @@ def check_submission(view_method):
     def _arguments_wrapper(
         instance, request, submission_id: int, course: Course, *args, **kwargs
     ):
+        submissions = course.coursesubmission_set.select_related(
+            "milestone",
+            "group",
+            "template__form",
+            "creator__user__profile_image",
+            "editor__user__profile_image",
+        )
+
+        if request.method == "GET":
+            submissions = annotate_raw_course_submission_form_data(
+                submissions, fields=get_requested_fields(request)
+            )
+
         try:
-            submission = course.coursesubmission_set.select_related(
-                "milestone",
-                "group",
-                "template__form",
-                "creator__user__profile_image",
-                "editor__user__profile_image",
-            ).get(id=submission_id)
+            submission = submissions.get(id=submission_id)
 
         except CourseSubmission.DoesNotExist as e:
             logger.warning(e)
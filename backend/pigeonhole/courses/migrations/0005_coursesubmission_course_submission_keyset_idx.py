@@ -0,0 +1,17 @@
+# Generated by Django 4.0.5 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_coursesubmissionviewablemember_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='coursesubmission',
+            index=models.Index(fields=['course', 'updated_at', 'id'], name='course_submission_keyset_idx'),
+        ),
+    ]
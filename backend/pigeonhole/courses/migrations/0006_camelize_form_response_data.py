@@ -0,0 +1,46 @@
+# Generated by Django 4.0.5 on 2026-10-18 11:04
+
+from django.db import migrations
+
+from djangorestframework_camel_case.util import camelize, underscoreize
+
+CHUNK_SIZE = 500
+
+
+## form response data used to be stored with snake_case keys and camelized on every response,
+## it is now stored as sent by the client and returned as is
+def convert_form_response_data(apps, convert):
+    CourseSubmission = apps.get_model('courses', 'CourseSubmission')
+
+    ## converted rows are written back every chunk so that only one chunk is held in memory
+    submissions = []
+    for submission in CourseSubmission.objects.only('id', 'form_response_data').iterator(chunk_size=CHUNK_SIZE):
+        submission.form_response_data = convert(submission.form_response_data)
+        submissions.append(submission)
+
+        if len(submissions) == CHUNK_SIZE:
+            CourseSubmission.objects.bulk_update(submissions, ['form_response_data'])
+            submissions = []
+
+    CourseSubmission.objects.bulk_update(submissions, ['form_response_data'])
+
+
+def camelize_form_response_data(apps, schema_editor):
+    convert_form_response_data(apps, camelize)
+
+
+def underscoreize_form_response_data(apps, schema_editor):
+    convert_form_response_data(
+        apps, lambda data: underscoreize(data, no_underscore_before_number=True)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0005_coursesubmission_course_submission_keyset_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(camelize_form_response_data, underscoreize_form_response_data),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.0.5 on 2026-10-18 13:21
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+import django.db.models.deletion
+import django_update_from_dict
+
+
+def populate_course_submission_field_comment_counts(apps, schema_editor):
+    CourseSubmissionComment = apps.get_model('courses', 'CourseSubmissionComment')
+    CourseSubmissionFieldCommentCount = apps.get_model('courses', 'CourseSubmissionFieldCommentCount')
+
+    comment_counts = (
+        CourseSubmissionComment.objects.values('submission_id', 'field_index')
+        .annotate(
+            comment_count=Count('id'),
+            deleted_comment_count=Count('id', filter=Q(comment__is_deleted=True)),
+        )
+        .order_by()
+    )
+
+    CourseSubmissionFieldCommentCount.objects.bulk_create(
+        (CourseSubmissionFieldCommentCount(**comment_count) for comment_count in comment_counts.iterator()),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0006_camelize_form_response_data'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseSubmissionFieldCommentCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('field_index', models.PositiveIntegerField()),
+                ('comment_count', models.PositiveIntegerField(default=0)),
+                ('deleted_comment_count', models.PositiveIntegerField(default=0)),
+                ('submission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='courses.coursesubmission')),
+            ],
+            bases=(django_update_from_dict.UpdateFromDictMixin, models.Model),
+        ),
+        migrations.AddConstraint(
+            model_name='coursesubmissionfieldcommentcount',
+            constraint=models.UniqueConstraint(fields=('submission_id', 'field_index'), name='unique_submission_field_comment_count'),
+        ),
+        migrations.RunPython(populate_course_submission_field_comment_counts, migrations.RunPython.noop),
+    ]
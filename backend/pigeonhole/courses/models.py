@@ -1,8 +1,12 @@
-from django.db import models
-from django.db.models.signals import post_delete
+from django.db import models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
 
+from pigeonhole.common.cache import bump_version
 from pigeonhole.common.utils import default_list
 from pigeonhole.common.models import TimestampedModel
+from content_delivery_service.models import Image
 from forms.models import Form
 from users.models import User
 
@@ -28,6 +32,19 @@ class PatchCourseGroupAction(models.TextChoices):
     UPDATE_MEMBERS = "UPDATE_MEMBERS"
 
 
+class ImportRowStatus(models.TextChoices):
+    ADDED = "ADDED"
+    EXISTING = "EXISTING"
+    INVALID = "INVALID"
+
+
+class ExportFileFormat(models.TextChoices):
+    CSV = "CSV"
+    JSONL = "JSONL"
+
+
+COURSE_CACHE_NAMESPACE = "course"
+
 MAX_ROLE_LENGTH = max(map(len, Role))
 MAX_SUBMISSION_TYPE_LENGTH = max(map(len, SubmissionType))
 
@@ -196,6 +213,15 @@ class CourseSubmission(TimestampedModel):
     )
     form_response_data = models.JSONField(blank=True, default=default_list)
 
+    class Meta:
+        indexes = [
+            ## supports keyset pagination of submissions within a course
+            models.Index(
+                fields=["course", "updated_at", "id"],
+                name="course_submission_keyset_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         return f"{self.name} | {self.creator}"
 
@@ -259,6 +285,28 @@ class CourseSubmissionComment(TimestampedModel):
         return f"{self.submission.name} | {self.comment}"
 
 
+## Denormalised comment counts per response field of a submission
+## maintained by create_course_submission_comment, delete_course_submission_comment and a post_delete listener,
+## can be checked and rebuilt with the rebuildcommentcounts management command.
+## comment_count includes deleted comments as they are still listed.
+class CourseSubmissionFieldCommentCount(TimestampedModel):
+    submission = models.ForeignKey(CourseSubmission, on_delete=models.CASCADE)
+    field_index = models.PositiveIntegerField()
+    comment_count = models.PositiveIntegerField(default=0)
+    deleted_comment_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["submission_id", "field_index"],
+                name="unique_submission_field_comment_count",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.submission.name} | {self.field_index} | {self.comment_count}"
+
+
 def course_submission_comment_cleanup(
     sender, instance: CourseSubmissionComment, **kwargs
 ):
@@ -274,3 +322,137 @@ post_delete.connect(
     sender=CourseSubmissionComment,
     dispatch_uid="courses.course_submission_comment.course_submission_comment_cleanup",
 )
+
+
+def course_submission_field_comment_count_update(
+    sender, instance: CourseSubmissionComment, **kwargs
+):
+    ## hard deletes, e.g. through the admin or cascaded from a deleted comment, remove the comment from the counts
+    ## counts are clamped as comments created outside create_course_submission_comment are not counted
+    counts = {"comment_count": Greatest(F("comment_count") - 1, Value(0))}
+
+    if instance.comment.is_deleted:
+        counts["deleted_comment_count"] = Greatest(
+            F("deleted_comment_count") - 1, Value(0)
+        )
+
+    CourseSubmissionFieldCommentCount.objects.filter(
+        submission_id=instance.submission_id, field_index=instance.field_index
+    ).update(**counts)
+
+
+## set up listener to update comment counts when a course submission comment is deleted
+post_delete.connect(
+    course_submission_field_comment_count_update,
+    sender=CourseSubmissionComment,
+    dispatch_uid="courses.course_submission_comment.course_submission_field_comment_count_update",
+)
+
+
+def bump_course_version(course_id: int):
+    ## only bump after commit so that a concurrent request cannot cache the old state under the new version
+    transaction.on_commit(
+        lambda: bump_version(namespace=COURSE_CACHE_NAMESPACE, id=course_id)
+    )
+
+
+def course_cache_invalidation(sender, instance: Course, **kwargs):
+    bump_course_version(instance.id)
+
+
+def course_related_cache_invalidation(
+    sender,
+    instance: CourseSettings | CourseMilestone | CourseMilestoneTemplate,
+    **kwargs,
+):
+    bump_course_version(instance.course_id)
+
+
+def form_cache_invalidation(sender, instance: Form, **kwargs):
+    for course_id in CourseMilestoneTemplate.objects.filter(
+        form_id=instance.id
+    ).values_list("course_id", flat=True):
+        bump_course_version(course_id)
+
+
+def course_owner_cache_invalidation(sender, instance: User, created: bool, **kwargs):
+    ## course responses embed the owner's details
+    if created:
+        return
+
+    for course_id in Course.objects.filter(owner_id=instance.id).values_list(
+        "id", flat=True
+    ):
+        bump_course_version(course_id)
+
+
+def course_owner_profile_image_cache_invalidation(sender, instance: Image, **kwargs):
+    for course_id in Course.objects.filter(
+        owner__profile_image_id=instance.id
+    ).values_list("id", flat=True):
+        bump_course_version(course_id)
+
+
+## set up listeners to invalidate cached course responses when the course or its read-mostly content changes
+for signal, signal_name in ((post_save, "post_save"), (post_delete, "post_delete")):
+    signal.connect(
+        course_cache_invalidation,
+        sender=Course,
+        dispatch_uid=f"courses.course.course_cache_invalidation.{signal_name}",
+    )
+    signal.connect(
+        course_related_cache_invalidation,
+        sender=CourseSettings,
+        dispatch_uid=f"courses.course_settings.course_related_cache_invalidation.{signal_name}",
+    )
+    signal.connect(
+        course_related_cache_invalidation,
+        sender=CourseMilestone,
+        dispatch_uid=f"courses.course_milestone.course_related_cache_invalidation.{signal_name}",
+    )
+    signal.connect(
+        course_related_cache_invalidation,
+        sender=CourseMilestoneTemplate,
+        dispatch_uid=f"courses.course_milestone_template.course_related_cache_invalidation.{signal_name}",
+    )
+    signal.connect(
+        form_cache_invalidation,
+        sender=Form,
+        dispatch_uid=f"courses.form.form_cache_invalidation.{signal_name}",
+    )
+
+post_save.connect(
+    course_owner_cache_invalidation,
+    sender=User,
+    dispatch_uid="courses.user.course_owner_cache_invalidation",
+)
+post_save.connect(
+    course_owner_profile_image_cache_invalidation,
+    sender=Image,
+    dispatch_uid="courses.image.course_owner_profile_image_cache_invalidation",
+)
+
+
+COURSE_MEMBERSHIP_INDEX_NAMESPACE = "course_membership_index"
+
+
+def bump_course_membership_index_version(user_id: int):
+    ## only bump after commit so that a revoked membership cannot be cached under the new version
+    transaction.on_commit(
+        lambda: bump_version(namespace=COURSE_MEMBERSHIP_INDEX_NAMESPACE, id=user_id)
+    )
+
+
+def course_membership_index_invalidation(
+    sender, instance: CourseMembership, **kwargs
+):
+    bump_course_membership_index_version(instance.user_id)
+
+
+## set up listeners to invalidate the requester's course membership index, see courses.logic.get_course_membership_index
+for signal, signal_name in ((post_save, "post_save"), (post_delete, "post_delete")):
+    signal.connect(
+        course_membership_index_invalidation,
+        sender=CourseMembership,
+        dispatch_uid=f"courses.course_membership.course_membership_index_invalidation.{signal_name}",
+    )
@@ -1,12 +1,15 @@
 from rest_framework import serializers
 
 from pigeonhole.common.models import MergeSerializersMixin
+from pigeonhole.settings import MAX_PAGE_SIZE
 from pigeonhole.common.serializers import (
     NameSerializer,
     UserIdSerializer,
     IdField,
     ObjectListField,
     BatchUserIdSerializer,
+    CursorField,
+    SparseFieldsField,
 )
 from forms.serializers import FormSerializer
 
@@ -18,6 +21,7 @@ from .models import (
     CourseMilestoneTemplate,
     CourseSettings,
     CourseSubmission,
+    ExportFileFormat,
     PatchCourseGroupAction,
     Role,
     Comment,
@@ -118,6 +122,8 @@ class PatchCourseMembershipSerializer(serializers.ModelSerializer):
 
 class GetCourseGroupSerializer(serializers.Serializer):
     me = serializers.BooleanField(required=False, default=False)
+    ## side-loads users into a single map referenced by id
+    normalized = serializers.BooleanField(required=False, default=False)
 
 
 class PostCourseGroupSerializer(serializers.ModelSerializer):
@@ -168,13 +174,33 @@ class PostCourseMilestoneTemplateSerializer(
 PutCourseMilestoneTemplateSerializer = PostCourseMilestoneTemplateSerializer
 
 
-class GetCourseSubmissionSerializer(serializers.Serializer):
+class CourseSubmissionFiltersSerializer(serializers.Serializer):
     milestone_id = IdField(required=False, default=None)
     group_id = IdField(required=False, default=None)
     creator_id = IdField(required=False, default=None)
     editor_id = IdField(required=False, default=None)
     template_id = IdField(required=False, default=None)
+
+
+class GetCourseSubmissionSerializer(CourseSubmissionFiltersSerializer):
     full = serializers.BooleanField(required=False, default=False)
+    ## providing either cursor or limit opts into cursor pagination
+    cursor = CursorField(required=False, default=None)
+    limit = serializers.IntegerField(
+        required=False, default=None, min_value=1, max_value=MAX_PAGE_SIZE
+    )
+    ## side-loads users into a single map referenced by id
+    normalized = serializers.BooleanField(required=False, default=False)
+    fields = SparseFieldsField(required=False, default=None)
+    ## returns the number of comments per response field instead of the comments in full listings
+    comment_counts = serializers.BooleanField(required=False, default=False)
+
+
+class ExportCourseSubmissionSerializer(CourseSubmissionFiltersSerializer):
+    file_format = serializers.ChoiceField(
+        required=False, choices=ExportFileFormat.choices, default=ExportFileFormat.CSV
+    )
+    gzip = serializers.BooleanField(required=False, default=False)
 
 
 class PutCourseSubmissionSerializer(serializers.ModelSerializer):
@@ -1,3 +1,1705 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+from base64 import urlsafe_b64encode
+from types import SimpleNamespace
+from typing import Callable
 
-# Create your tests here.
+import orjson
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from authentication.logic import get_tokens
+from content_delivery_service.models import Image
+from forms.models import Form, FormFieldType
+from pigeonhole.common.benchmarks import measure, report_benchmark
+from pigeonhole.common.constants import (
+    ACCESS,
+    INCLUDED,
+    ITEMS,
+    LABEL,
+    NEXT_CURSOR,
+    RESPONSE,
+    ROWS,
+    STATUS,
+    TEMPLATES,
+    TYPE,
+    USERS,
+)
+from pigeonhole.common.parsers import parse_datetime_to_ms_timestamp
+from pigeonhole.common.renderers import FastJSONRenderer, RawJSON
+from users.logic import user_to_json
+from users.models import User, AccountType
+
+from .logic import (
+    batch_update_course_group_members,
+    course_membership_row_to_json,
+    course_membership_to_json,
+    course_milestone_row_to_json,
+    course_milestone_template_to_json,
+    course_milestone_to_json,
+    course_submission_comment_to_json,
+    create_course,
+    create_course_submission_comment,
+    delete_course_submission_comment,
+    get_course_groups_with_member_count,
+    get_course_membership_projection,
+    get_course_memberships_etag,
+    get_course_milestone_projection,
+    get_course_submission_field_comment_count_mismatches,
+)
+from .middlewares import check_course_access
+from .models import (
+    Comment,
+    Course,
+    CourseGroup,
+    CourseGroupMember,
+    CourseMembership,
+    CourseMilestone,
+    CourseMilestoneTemplate,
+    CourseSubmission,
+    CourseSubmissionComment,
+    CourseSubmissionFieldCommentCount,
+    CourseSubmissionViewableGroup,
+    CourseSubmissionViewableMember,
+    ImportRowStatus,
+    Role,
+    SubmissionType,
+)
+
+
+def create_test_course(owner: User, is_published: bool = True) -> Course:
+    course, _ = create_course(
+        owner=owner,
+        name="Course",
+        description="",
+        is_published=is_published,
+        show_group_members_names=False,
+        allow_students_to_create_groups=False,
+        allow_students_to_delete_groups=False,
+        allow_students_to_join_groups=False,
+        allow_students_to_leave_groups=False,
+        allow_students_to_modify_group_name=False,
+        allow_students_to_add_or_remove_group_members=False,
+        milestone_alias="",
+    )
+
+    return course
+
+
+def create_test_milestone(course: Course, name: str) -> CourseMilestone:
+    return CourseMilestone.objects.create(
+        course=course,
+        name=name,
+        description="",
+        start_date_time=timezone.now(),
+        is_published=True,
+    )
+
+
+def create_test_template(course: Course, name: str) -> CourseMilestoneTemplate:
+    form = Form.objects.create(
+        name=name, form_field_data=[{TYPE: FormFieldType.TEXT, LABEL: "Answer"}]
+    )
+
+    return CourseMilestoneTemplate.objects.create(
+        course=course,
+        form=form,
+        description="",
+        submission_type=SubmissionType.INDIVIDUAL,
+        is_published=True,
+    )
+
+
+def create_test_group(
+    course: Course, name: str, members: list[CourseMembership]
+) -> CourseGroup:
+    group = CourseGroup.objects.create(course=course, name=name)
+    CourseGroupMember.objects.bulk_create(
+        CourseGroupMember(group=group, member=member) for member in members
+    )
+
+    return group
+
+
+def create_test_submission(
+    course: Course,
+    name: str,
+    creator: CourseMembership,
+    milestone: CourseMilestone,
+    template: CourseMilestoneTemplate,
+    group: CourseGroup,
+) -> CourseSubmission:
+    return CourseSubmission.objects.create(
+        course=course,
+        milestone=milestone,
+        group=group,
+        template=template,
+        creator=creator,
+        editor=creator,
+        name=name,
+        description="",
+        is_draft=False,
+        submission_type=SubmissionType.INDIVIDUAL,
+        form_response_data=[{RESPONSE: name}],
+    )
+
+
+def create_test_comment(
+    submission: CourseSubmission, commenter: CourseMembership
+) -> CourseSubmissionComment:
+    return create_course_submission_comment(
+        submission=submission,
+        commenter=commenter.user,
+        content="Comment",
+        field_index=0,
+        member=commenter,
+    )
+
+
+def get_test_client(user: User) -> APIClient:
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens(user)[ACCESS]}")
+
+    return client
+
+
+class CourseTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.owner = User.objects.create(
+            email="owner@example.com", name="Owner", account_type=AccountType.EDUCATOR
+        )
+        self.student = User.objects.create(email="student@example.com", name="Student")
+        self.course = create_test_course(self.owner)
+        self.student_membership = CourseMembership.objects.create(
+            user=self.student, course=self.course, role=Role.STUDENT
+        )
+
+        self.owner_membership = self.course.coursemembership_set.get(user=self.owner)
+
+        self.milestone = create_test_milestone(course=self.course, name="Milestone")
+        self.template = create_test_template(course=self.course, name="Template")
+        self.group = create_test_group(
+            course=self.course, name="Group", members=[self.student_membership]
+        )
+        self.submission = create_test_submission(
+            course=self.course,
+            name="Submission",
+            creator=self.student_membership,
+            milestone=self.milestone,
+            template=self.template,
+            group=self.group,
+        )
+        self.submission_comment = create_test_comment(
+            submission=self.submission, commenter=self.owner_membership
+        )
+
+        self.owner_client = get_test_client(self.owner)
+        self.student_client = get_test_client(self.student)
+        self.num_added = 0
+
+    def add_course_content(self, count: int):
+        ## grows every listing so that per-row queries show up as a change in query count
+        for _ in range(count):
+            self.num_added += 1
+            name = f"Added {self.num_added}"
+
+            user = User.objects.create(email=f"added{self.num_added}@example.com")
+            membership = CourseMembership.objects.create(
+                user=user, course=self.course, role=Role.STUDENT
+            )
+            other_course = create_test_course(self.owner)
+            CourseMembership.objects.create(
+                user=self.student, course=other_course, role=Role.STUDENT
+            )
+
+            milestone = create_test_milestone(course=self.course, name=name)
+            template = create_test_template(course=self.course, name=name)
+            group = create_test_group(
+                course=self.course,
+                name=name,
+                members=[membership, self.student_membership],
+            )
+            submission = create_test_submission(
+                course=self.course,
+                name=name,
+                creator=membership,
+                milestone=milestone,
+                template=template,
+                group=group,
+            )
+            create_test_comment(submission=submission, commenter=membership)
+            create_test_comment(submission=self.submission, commenter=membership)
+
+
+class CourseMembershipIndexTest(CourseTestCase):
+    def get_course(self, client: APIClient):
+        return client.get(
+            reverse("single_course", kwargs={"course_id": self.course.id})
+        )
+
+    def delete_milestone(self, client: APIClient):
+        ## only instructors and co-owners get past the role check to the milestone lookup
+        return client.delete(
+            reverse(
+                "single_course_milestone",
+                kwargs={"course_id": self.course.id, "milestone_id": 0},
+            )
+        )
+
+    def test_revoked_membership_is_rejected_immediately(self):
+        ## warms the student's index
+        self.assertEqual(
+            self.get_course(self.student_client).status_code, status.HTTP_200_OK
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student_membership.delete()
+
+        self.assertEqual(
+            self.get_course(self.student_client).status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+    def test_role_change_takes_effect_immediately(self):
+        self.assertEqual(
+            self.delete_milestone(self.student_client).status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student_membership.role = Role.INSTRUCTOR
+            self.student_membership.save()
+
+        self.assertEqual(
+            self.delete_milestone(self.student_client).status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student_membership.role = Role.STUDENT
+            self.student_membership.save()
+
+        self.assertEqual(
+            self.delete_milestone(self.student_client).status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+    def test_membership_missing_from_index_is_accepted(self):
+        new_student = User.objects.create(email="new@example.com", name="New")
+        new_student_client = get_test_client(new_student)
+
+        ## caches an empty index for the new student
+        self.assertEqual(
+            self.get_course(new_student_client).status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+        ## bulk creation sends no signals, so the index is not invalidated
+        CourseMembership.objects.bulk_create(
+            [CourseMembership(user=new_student, course=self.course, role=Role.STUDENT)]
+        )
+
+        self.assertEqual(
+            self.get_course(new_student_client).status_code, status.HTTP_200_OK
+        )
+
+    def test_batch_added_membership_is_accepted_immediately(self):
+        new_student = User.objects.create(email="new@example.com", name="New")
+        new_student_client = get_test_client(new_student)
+
+        ## caches an empty index for the new student
+        self.assertEqual(
+            self.get_course(new_student_client).status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.owner_client.post(
+                reverse(
+                    "course_memberships_with_new_user_creation",
+                    kwargs={"course_id": self.course.id},
+                ),
+                data={"memberCreationData": [{"email": new_student.email}]},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.get_course(new_student_client).status_code, status.HTTP_200_OK
+        )
+
+    def test_imported_membership_is_accepted_immediately(self):
+        new_student = User.objects.create(email="imported@example.com", name="")
+        new_student_client = get_test_client(new_student)
+
+        self.assertEqual(
+            self.get_course(new_student_client).status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.owner_client.post(
+                reverse(
+                    "course_memberships_import", kwargs={"course_id": self.course.id}
+                ),
+                data=f"email,name\n{new_student.email},Imported\n",
+                content_type="text/csv",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.get_course(new_student_client).status_code, status.HTTP_200_OK
+        )
+
+
+class CourseMembershipsImportTest(CourseTestCase):
+    def import_memberships(self, data: bytes, content_type: str):
+        return self.owner_client.post(
+            reverse("course_memberships_import", kwargs={"course_id": self.course.id}),
+            data=data,
+            content_type=content_type,
+        )
+
+    def test_rows_which_are_not_utf8_are_reported_invalid(self):
+        for content_type, data in (
+            (
+                "text/csv",
+                b"email,name\nvalid@example.com,Valid\ninvalid@example.com,\xff\xfe\n",
+            ),
+            (
+                "application/x-ndjson",
+                b'{"email": "valid@example.com"}\n{"email": "\xff\xfe"}\n',
+            ),
+        ):
+            with self.subTest(content_type=content_type):
+                response = self.import_memberships(data, content_type)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    [row[STATUS] for row in response.data[ROWS]],
+                    [ImportRowStatus.ADDED, ImportRowStatus.INVALID],
+                )
+
+                CourseMembership.objects.filter(
+                    course=self.course, user__email="valid@example.com"
+                ).delete()
+
+
+class CourseAccessTest(CourseTestCase):
+    def get_view(self, *allowed_roles: Role):
+        def view(instance, request, requester, course, requester_membership):
+            return requester_membership
+
+        return check_course_access(*allowed_roles)(view)
+
+    def get_request(self, user: User):
+        return SimpleNamespace(
+            user=SimpleNamespace(id=user.id), auth=AccessToken(get_tokens(user)[ACCESS])
+        )
+
+    def test_course_context_is_resolved_in_one_query(self):
+        view = self.get_view(Role.STUDENT)
+        request = self.get_request(self.student)
+
+        ## warms the membership index
+        view(None, request, course_id=self.course.id)
+
+        with self.assertNumQueries(1):
+            membership = view(None, request, course_id=self.course.id)
+
+            self.assertEqual(membership, self.student_membership)
+            self.assertEqual(membership.user, self.student)
+            self.assertEqual(membership.course, self.course)
+            self.assertEqual(membership.course.owner, self.owner)
+            self.assertFalse(membership.course.coursesettings.show_group_members_names)
+
+    def test_error_semantics(self):
+        other_user = User.objects.create(email="other@example.com")
+
+        self.assertEqual(
+            APIClient()
+            .get(reverse("single_course", kwargs={"course_id": self.course.id}))
+            .status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+        self.assertEqual(
+            get_test_client(other_user)
+            .get(reverse("single_course", kwargs={"course_id": self.course.id + 1000}))
+            .status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+        self.assertEqual(
+            get_test_client(other_user)
+            .get(reverse("single_course", kwargs={"course_id": self.course.id}))
+            .status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+        self.assertEqual(
+            self.student_client.put(
+                reverse("single_course", kwargs={"course_id": self.course.id}),
+                data={},
+                format="json",
+            ).status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+    def test_token_issued_before_account_type_change_is_rejected(self):
+        url = reverse("single_course", kwargs={"course_id": self.course.id})
+
+        self.assertEqual(self.student_client.get(url).status_code, status.HTTP_200_OK)
+
+        ## mirrors users.admin.UserAdmin.save_model
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.account_type = AccountType.EDUCATOR
+            self.student.version += 1
+            self.student.save()
+
+        self.assertEqual(
+            self.student_client.get(url).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+        self.assertEqual(
+            get_test_client(self.student).get(url).status_code, status.HTTP_200_OK
+        )
+
+
+
+class CourseSubmissionVisibilityTest(CourseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        other_student = User.objects.create(email="other@example.com", name="Other")
+        self.other_membership = CourseMembership.objects.create(
+            user=other_student, course=self.course, role=Role.STUDENT
+        )
+        other_group = create_test_group(
+            course=self.course, name="Other group", members=[self.other_membership]
+        )
+
+        def create_submission(name: str, creator: CourseMembership, group):
+            return create_test_submission(
+                course=self.course,
+                name=name,
+                creator=creator,
+                milestone=self.milestone,
+                template=self.template,
+                group=group,
+            )
+
+        create_submission("Own", creator=self.student_membership, group=None)
+        create_submission("Group", creator=self.other_membership, group=self.group)
+
+        CourseSubmissionViewableMember.objects.create(
+            submission=create_submission(
+                "Viewable by member", creator=self.other_membership, group=other_group
+            ),
+            member=self.student_membership,
+        )
+        CourseSubmissionViewableGroup.objects.create(
+            submission=create_submission(
+                "Viewable by group", creator=self.other_membership, group=other_group
+            ),
+            group=self.group,
+        )
+
+        self.hidden_submission = create_submission(
+            "Hidden", creator=self.other_membership, group=other_group
+        )
+
+    def get_submission_names(self, client: APIClient) -> set[str]:
+        response = client.get(
+            reverse("course_submissions", kwargs={"course_id": self.course.id})
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return {submission["name"] for submission in response.json()}
+
+    def test_student_sees_only_viewable_submissions(self):
+        self.assertEqual(
+            self.get_submission_names(self.student_client),
+            {
+                "Submission",
+                "Own",
+                "Group",
+                "Viewable by member",
+                "Viewable by group",
+            },
+        )
+
+    def test_staff_see_every_submission(self):
+        self.assertIn("Hidden", self.get_submission_names(self.owner_client))
+
+    def test_hidden_submission_is_forbidden(self):
+        response = self.student_client.get(
+            reverse(
+                "single_course_submission",
+                kwargs={
+                    "course_id": self.course.id,
+                    "submission_id": self.hidden_submission.id,
+                },
+            )
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class CourseSubmissionsPaginationTest(CourseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        for i in range(6):
+            create_test_submission(
+                course=self.course,
+                name=f"Page {i}",
+                creator=self.student_membership,
+                milestone=self.milestone,
+                template=self.template,
+                group=self.group,
+            )
+
+    def get_page(self, **params):
+        return self.owner_client.get(
+            reverse("course_submissions", kwargs={"course_id": self.course.id}),
+            params,
+        )
+
+    def walk(self, limit: int, on_page: Callable = lambda: None) -> list[int]:
+        ids = []
+        params = {"limit": limit}
+
+        while True:
+            response = self.get_page(**params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            data = response.json()
+            self.assertLessEqual(len(data[ITEMS]), limit)
+            ids.extend(submission["id"] for submission in data[ITEMS])
+            on_page()
+
+            if data[NEXT_CURSOR] is None:
+                return ids
+
+            params = {"limit": limit, "cursor": data[NEXT_CURSOR]}
+
+    def get_ordered_ids(self) -> list[int]:
+        return list(
+            CourseSubmission.objects.filter(course=self.course)
+            .order_by("updated_at", "id")
+            .values_list("id", flat=True)
+        )
+
+    def test_every_submission_is_returned_once(self):
+        for limit in (1, 2, 3, 7, 50):
+            with self.subTest(limit=limit):
+                self.assertEqual(self.walk(limit), self.get_ordered_ids())
+
+    def test_equal_updated_at_is_ordered_by_id(self):
+        CourseSubmission.objects.filter(course=self.course).update(
+            updated_at=timezone.now()
+        )
+
+        ids = self.walk(limit=2)
+
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(ids, self.get_ordered_ids())
+
+    def test_submissions_added_during_walk(self):
+        ordered_ids = self.get_ordered_ids()
+        added_ids = []
+
+        def add_submission():
+            added_ids.append(
+                create_test_submission(
+                    course=self.course,
+                    name="Added",
+                    creator=self.student_membership,
+                    milestone=self.milestone,
+                    template=self.template,
+                    group=self.group,
+                ).id
+            )
+
+        ids = self.walk(limit=2, on_page=add_submission)
+
+        ## new submissions sort after every existing one, so no submission is skipped or repeated
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(ids[: len(ordered_ids)], ordered_ids)
+        self.assertTrue(set(ids[len(ordered_ids) :]) <= set(added_ids))
+
+    def test_invalid_cursor_is_rejected(self):
+        def encode(keyset: str) -> str:
+            return urlsafe_b64encode(keyset.encode()).decode()
+
+        for cursor in (
+            "not-a-cursor",
+            encode("{}"),
+            encode("[null,1]"),
+            encode('["not-a-date",1]'),
+            encode('["2022-01-01T00:00:00+00:00","1"]'),
+            encode(f'["2022-01-01T00:00:00+00:00",{2**64}]'),
+        ):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(
+                    self.get_page(cursor=cursor).status_code,
+                    status.HTTP_400_BAD_REQUEST,
+                )
+
+
+class CourseGroupMembersBatchUpdateTest(CourseTestCase):
+    def create_members(self, count: int) -> list[User]:
+        users = []
+
+        for _ in range(count):
+            self.num_added += 1
+            user = User.objects.create(email=f"member{self.num_added}@example.com")
+            CourseMembership.objects.create(
+                user=user, course=self.course, role=Role.STUDENT
+            )
+            users.append(user)
+
+        return users
+
+    def update_members(self, users: list[User]) -> CourseGroup:
+        return batch_update_course_group_members(
+            course=self.course, group=self.group, user_ids=[user.id for user in users]
+        )
+
+    def get_member_user_ids(self, group: CourseGroup) -> set[int]:
+        return {
+            group_member.member.user_id
+            for group_member in group.coursegroupmember_set.all()
+        }
+
+    def test_add_members(self):
+        users = self.create_members(2)
+
+        group = self.update_members([self.student, *users])
+
+        self.assertEqual(
+            self.get_member_user_ids(group), {self.student.id, *(u.id for u in users)}
+        )
+
+    def test_remove_members(self):
+        group = self.update_members([])
+
+        self.assertEqual(self.get_member_user_ids(group), set())
+        self.assertFalse(CourseGroupMember.objects.filter(group=self.group).exists())
+
+    def test_add_and_remove_members(self):
+        users = self.create_members(3)
+        self.update_members([self.student, users[0], users[1]])
+
+        group = self.update_members([users[1], users[2]])
+
+        self.assertEqual(self.get_member_user_ids(group), {users[1].id, users[2].id})
+        ## existing members are kept instead of being recreated
+        self.assertEqual(
+            CourseGroupMember.objects.filter(
+                group=self.group, member__user=users[1]
+            ).count(),
+            1,
+        )
+
+    def test_users_not_in_course_are_rejected(self):
+        outsiders = [
+            User.objects.create(email=f"outsider{i}@example.com") for i in range(2)
+        ]
+        users = self.create_members(1)
+
+        with self.assertRaisesMessage(
+            ValueError,
+            "One or more of the members are not a part of this course: "
+            f"{outsiders[0].id}, {outsiders[1].id}.",
+        ):
+            self.update_members([*users, outsiders[1], outsiders[0]])
+
+        ## the group is left unchanged
+        self.assertEqual(
+            {
+                group_member.member.user_id
+                for group_member in CourseGroupMember.objects.filter(group=self.group)
+            },
+            {self.student.id},
+        )
+
+    def test_query_count_does_not_grow_with_batch(self):
+        def count_queries(users: list[User]) -> int:
+            with CaptureQueriesContext(connection) as context:
+                self.update_members(users)
+
+            return len(context.captured_queries)
+
+        ## each batch replaces the previous members so that both adds and removes are counted
+        small_batch = self.create_members(2)
+        large_batch = self.create_members(20)
+
+        self.assertEqual(count_queries(large_batch), count_queries(small_batch))
+
+
+class CourseSubmissionsExportTest(CourseTestCase):
+    def export(self, client: APIClient, **params):
+        response = client.get(
+            reverse("course_submissions_export", kwargs={"course_id": self.course.id}),
+            params,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return response, b"".join(response.streaming_content)
+
+    def get_expected_row(self, submission: CourseSubmission) -> dict:
+        return {
+            "id": submission.id,
+            "name": submission.name,
+            "milestone": "Milestone",
+            "template": "Template",
+            "group": "Group",
+            "isDraft": False,
+            "createdAt": parse_datetime_to_ms_timestamp(submission.created_at),
+            "creator": "Student",
+            "updatedAt": parse_datetime_to_ms_timestamp(submission.updated_at),
+            "editor": "Student",
+            "Answer": submission.name,
+        }
+
+    def test_csv(self):
+        response, content = self.export(self.owner_client)
+
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+
+        reader = csv.DictReader(io.StringIO(content.decode()))
+
+        self.assertEqual(
+            reader.fieldnames,
+            [
+                "id",
+                "name",
+                "milestone",
+                "template",
+                "group",
+                "isDraft",
+                "createdAt",
+                "creator",
+                "updatedAt",
+                "editor",
+                "Answer",
+            ],
+        )
+        ## csv values are all strings
+        self.assertEqual(
+            list(reader),
+            [
+                {
+                    key: str(value)
+                    for key, value in self.get_expected_row(self.submission).items()
+                }
+            ],
+        )
+
+    def test_json_lines(self):
+        _, content = self.export(self.owner_client, file_format="JSONL")
+
+        self.assertEqual(
+            [json.loads(line) for line in content.decode().splitlines()],
+            [self.get_expected_row(self.submission)],
+        )
+
+    def test_gzip(self):
+        _, content = self.export(self.owner_client)
+        response, compressed_content = self.export(self.owner_client, gzip="true")
+
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertTrue(response["Content-Disposition"].endswith('.csv.gz"'))
+        self.assertEqual(gzip.decompress(compressed_content), content)
+
+    def test_student_exports_only_viewable_submissions(self):
+        other_student = User.objects.create(email="other@example.com", name="Other")
+        other_membership = CourseMembership.objects.create(
+            user=other_student, course=self.course, role=Role.STUDENT
+        )
+        create_test_submission(
+            course=self.course,
+            name="Hidden",
+            creator=other_membership,
+            milestone=self.milestone,
+            template=self.template,
+            group=create_test_group(
+                course=self.course, name="Other group", members=[other_membership]
+            ),
+        )
+
+        def get_exported_names(client: APIClient) -> list[str]:
+            _, content = self.export(client, file_format="JSONL")
+
+            return [
+                json.loads(line)["name"] for line in content.decode().splitlines()
+            ]
+
+        self.assertEqual(get_exported_names(self.student_client), ["Submission"])
+        self.assertEqual(
+            get_exported_names(self.owner_client), ["Submission", "Hidden"]
+        )
+
+
+class CourseListingResponseTest(CourseTestCase):
+    def get_json(self, client: APIClient, name: str, **params):
+        response = client.get(
+            reverse(name, kwargs={"course_id": self.course.id}), params
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return response.json()
+
+    def test_normalized_listings_reference_users_by_id(self):
+        data = self.get_json(
+            self.owner_client, "course_submissions", normalized="true", full="true"
+        )
+        submission = data[ITEMS][0]
+        users = data[INCLUDED][USERS]
+
+        self.assertEqual(submission["creator"], self.student.id)
+        self.assertEqual(submission["editor"], self.student.id)
+        self.assertEqual(submission["comments"][0]["commenter"], self.owner.id)
+        self.assertEqual(
+            users,
+            {
+                str(self.student.id): user_to_json(self.student),
+                str(self.owner.id): user_to_json(self.owner),
+            },
+        )
+
+        data = self.get_json(self.owner_client, "course_groups", normalized="true")
+
+        self.assertEqual(data[ITEMS][0]["members"], [self.student.id])
+        self.assertEqual(
+            data[INCLUDED][USERS],
+            {str(self.student.id): user_to_json(self.student)},
+        )
+
+    def test_default_listings_embed_users(self):
+        submission = self.get_json(self.owner_client, "course_submissions")[0]
+
+        self.assertEqual(submission["creator"], user_to_json(self.student))
+        self.assertEqual(submission["editor"], user_to_json(self.student))
+
+    def test_normalized_full_listing_side_loads_templates(self):
+        other_template = create_test_template(course=self.course, name="Other")
+
+        for i in range(2):
+            for template in (self.template, other_template):
+                create_test_submission(
+                    course=self.course,
+                    name=f"{template.form.name} {i}",
+                    creator=self.student_membership,
+                    milestone=self.milestone,
+                    template=template,
+                    group=self.group,
+                )
+
+        data = self.get_json(
+            self.owner_client, "course_submissions", normalized="true", full="true"
+        )
+
+        for submission in data[ITEMS]:
+            self.assertNotIn("template", submission)
+
+        self.assertCountEqual(
+            [submission["templateId"] for submission in data[ITEMS]],
+            [self.template.id] * 3 + [other_template.id] * 2,
+        )
+        ## every distinct template is serialised once
+        self.assertEqual(
+            data[INCLUDED][TEMPLATES],
+            {
+                str(template.id): course_milestone_template_to_json(template)
+                for template in (self.template, other_template)
+            },
+        )
+
+    def test_full_listing_embeds_templates(self):
+        submission = self.get_json(
+            self.owner_client, "course_submissions", full="true"
+        )[0]
+
+        self.assertNotIn("templateId", submission)
+        self.assertEqual(
+            submission["template"], course_milestone_template_to_json(self.template)
+        )
+
+    def test_full_listing_includes_comments_of_each_submission(self):
+        self.add_course_content(2)
+        deleted_comment = delete_course_submission_comment(
+            create_test_comment(self.submission, self.student_membership)
+        )
+
+        submissions = self.get_json(
+            self.owner_client, "course_submissions", full="true"
+        )
+
+        for submission in submissions:
+            self.assertCountEqual(
+                submission["comments"],
+                [
+                    course_submission_comment_to_json(submission_comment)
+                    for submission_comment in CourseSubmissionComment.objects.filter(
+                        submission_id=submission["id"]
+                    )
+                ],
+            )
+
+        ## deleted comments are listed without their content
+        comment = next(
+            comment
+            for submission in submissions
+            for comment in submission["comments"]
+            if comment["id"] == deleted_comment.comment_id
+        )
+
+        self.assertEqual((comment["content"], comment["isDeleted"]), ("", True))
+
+    def test_comment_counts_replace_comments(self):
+        delete_course_submission_comment(
+            create_test_comment(self.submission, self.student_membership)
+        )
+
+        submission = self.get_json(
+            self.owner_client, "course_submissions", full="true", comment_counts="true"
+        )[0]
+
+        self.assertNotIn("comments", submission)
+        ## per response field, as returned by the field comments view
+        self.assertEqual(submission["commentCounts"], [2])
+        self.assertEqual(
+            submission["commentCounts"],
+            self.owner_client.get(
+                reverse(
+                    "course_submission_field_comments",
+                    kwargs={
+                        "course_id": self.course.id,
+                        "submission_id": self.submission.id,
+                    },
+                )
+            ).json(),
+        )
+
+    def test_listings_include_comment_activity(self):
+        latest_comment = delete_course_submission_comment(
+            create_test_comment(self.submission, self.student_membership)
+        )
+        submission_without_comments = create_test_submission(
+            course=self.course,
+            name="Without comments",
+            creator=self.student_membership,
+            milestone=self.milestone,
+            template=self.template,
+            group=self.group,
+        )
+
+        expected_activity = {
+            self.submission.id: (
+                2,
+                1,
+                parse_datetime_to_ms_timestamp(latest_comment.created_at),
+            ),
+            submission_without_comments.id: (0, 0, None),
+        }
+
+        ## summaries are built from projected rows and full listings from models
+        for params in ({}, {"full": "true"}):
+            with self.subTest(params=params):
+                submissions = self.get_json(
+                    self.owner_client, "course_submissions", **params
+                )
+
+                self.assertEqual(
+                    {
+                        submission["id"]: (
+                            submission["commentCount"],
+                            submission["activeCommentCount"],
+                            submission["latestCommentAt"],
+                        )
+                        for submission in submissions
+                    },
+                    expected_activity,
+                )
+
+    def test_groups_include_members_only_if_viewable(self):
+        other_student = User.objects.create(email="other@example.com", name="Other")
+        other_group = create_test_group(
+            course=self.course,
+            name="Other group",
+            members=[
+                CourseMembership.objects.create(
+                    user=other_student, course=self.course, role=Role.STUDENT
+                )
+            ],
+        )
+
+        def get_groups(client: APIClient, **params) -> dict[int, dict]:
+            return {
+                group["id"]: group
+                for group in self.get_json(client, "course_groups", **params)
+            }
+
+        ## students only see the members of their own groups as member names are hidden
+        groups = get_groups(self.student_client)
+
+        self.assertEqual(groups[self.group.id]["members"], [user_to_json(self.student)])
+        self.assertEqual(groups[self.group.id]["memberCount"], 1)
+        self.assertNotIn("members", groups[other_group.id])
+        self.assertEqual(groups[other_group.id]["memberCount"], 1)
+
+        groups = get_groups(self.owner_client)
+
+        self.assertEqual(
+            groups[other_group.id]["members"], [user_to_json(other_student)]
+        )
+
+        self.assertEqual(
+            list(get_groups(self.student_client, me="true")), [self.group.id]
+        )
+        self.assertEqual(list(get_groups(self.owner_client, me="true")), [])
+
+class CourseSubmissionFieldCommentCountTest(CourseTestCase):
+    def get_counts(self) -> tuple[int, int]:
+        return CourseSubmissionFieldCommentCount.objects.values_list(
+            "comment_count", "deleted_comment_count"
+        ).get(submission=self.submission, field_index=0)
+
+    def test_hard_deletes_update_counts(self):
+        submission_comments = [
+            create_test_comment(self.submission, self.owner_membership)
+            for _ in range(3)
+        ]
+        delete_course_submission_comment(submission_comments[0])
+
+        self.assertEqual(self.get_counts(), (4, 1))
+
+        ## deleting the comment cascades to the course submission comment
+        submission_comments[0].comment.delete()
+        self.assertEqual(self.get_counts(), (3, 0))
+
+        submission_comments[1].delete()
+        self.assertEqual(self.get_counts(), (2, 0))
+
+        CourseSubmissionComment.objects.filter(id=submission_comments[2].id).delete()
+        self.assertEqual(self.get_counts(), (1, 0))
+
+        self.assertEqual(get_course_submission_field_comment_count_mismatches(), [])
+
+
+    def test_uncounted_comments_do_not_underflow_counts(self):
+        ## created outside create_course_submission_comment, e.g. through the admin
+        submission_comments = [
+            CourseSubmissionComment.objects.create(
+                submission=self.submission,
+                comment=Comment.objects.create(
+                    content="Comment", commenter=self.owner, is_deleted=True
+                ),
+                field_index=0,
+                member=self.owner_membership,
+            )
+            for _ in range(2)
+        ]
+
+        for submission_comment in submission_comments:
+            submission_comment.delete()
+
+        self.assertEqual(self.get_counts(), (0, 0))
+
+class CourseConditionalGetTest(CourseTestCase):
+    def get_memberships(self, **headers):
+        return self.owner_client.get(
+            reverse("course_memberships", kwargs={"course_id": self.course.id}),
+            **headers,
+        )
+
+    def test_unconditional_get_is_given_etag(self):
+        response = self.get_memberships()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["ETag"],
+            get_course_memberships_etag(
+                request=None,
+                course=self.course,
+                requester_membership=self.owner_membership,
+            ),
+        )
+
+    def test_etag_is_answered_with_not_modified(self):
+        etag = self.get_memberships()["ETag"]
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.get_memberships(HTTP_IF_NONE_MATCH=etag)
+
+        ## only the course access check and the etag aggregate are run
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(len(context.captured_queries), 2)
+
+    def test_profile_image_update_changes_etag(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.profile_image = Image.objects.create(
+                image_url="https://example.com/before.png"
+            )
+            self.student.save()
+
+        etag = self.get_memberships()["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.profile_image.image_url = "https://example.com/after.png"
+            self.student.profile_image.save()
+
+        response = self.get_memberships(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b"https://example.com/after.png", response.content)
+
+
+class CourseResponseCacheTest(CourseTestCase):
+    def test_owner_profile_image_update_invalidates_cached_course(self):
+        url = reverse("single_course", kwargs={"course_id": self.course.id})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.owner.profile_image = Image.objects.create(
+                image_url="https://example.com/before.png"
+            )
+            self.owner.save()
+
+        self.assertIn(
+            b"https://example.com/before.png", self.student_client.get(url).content
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.owner.profile_image.image_url = "https://example.com/after.png"
+            self.owner.profile_image.save()
+
+        self.assertIn(
+            b"https://example.com/after.png", self.student_client.get(url).content
+        )
+
+
+
+class CourseSparseFieldsTest(CourseTestCase):
+    def get(self, url: str, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.owner_client.get(url, params)
+
+        sql = "".join(query["sql"] for query in context.captured_queries)
+
+        return response, sql
+
+    def test_single_submission_reads_form_json_only_if_requested(self):
+        url = reverse(
+            "single_course_submission",
+            kwargs={"course_id": self.course.id, "submission_id": self.submission.id},
+        )
+
+        response, sql = self.get(url, fields="name")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(), {"id": self.submission.id, "name": "Submission"}
+        )
+        self.assertNotIn("raw_form_response_data", sql)
+        self.assertNotIn("raw_template_form_field_data", sql)
+
+        response, sql = self.get(url, fields="formResponseData")
+
+        self.assertEqual(
+            response.json()["formResponseData"], self.submission.form_response_data
+        )
+        self.assertIn("raw_form_response_data", sql)
+
+    def test_single_template_reads_form_json_only_if_requested(self):
+        url = reverse(
+            "single_course_milestone_template",
+            kwargs={"course_id": self.course.id, "template_id": self.template.id},
+        )
+
+        response, sql = self.get(url, fields="name")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"id": self.template.id, "name": "Template"})
+        self.assertNotIn("raw_form_field_data", sql)
+
+        response, sql = self.get(url, fields="formFieldData")
+
+        self.assertEqual(
+            response.json()["formFieldData"], self.template.form.form_field_data
+        )
+        self.assertIn("raw_form_field_data", sql)
+
+
+class CourseRenderingTest(CourseTestCase):
+    def test_browsers_are_answered_with_json(self):
+        response = self.owner_client.get(
+            reverse(
+                "single_course_milestone_template",
+                kwargs={"course_id": self.course.id, "template_id": self.template.id},
+            ),
+            HTTP_ACCEPT="text/html,application/xhtml+xml,*/*;q=0.8",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(
+            response.json()["formFieldData"], self.template.form.form_field_data
+        )
+
+class CourseQueryCountTest(CourseTestCase):
+    """
+    Every view in courses/urls.py must run the same number of queries regardless of how much
+    content the course has.
+    """
+
+    def count_queries(self, request) -> int:
+        ## caches are cleared so that every measurement starts cold
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as context:
+            response = request()
+
+            if response.streaming:
+                b"".join(response.streaming_content)
+
+        self.assertLess(response.status_code, 400)
+
+        return len(context.captured_queries)
+
+    def assertConstantQueries(self, request):
+        num_queries = self.count_queries(request)
+        self.add_course_content(5)
+        self.assertEqual(self.count_queries(request), num_queries)
+
+    def get_url(self, name: str, **kwargs) -> str:
+        return reverse(name, kwargs={"course_id": self.course.id} | kwargs)
+
+    def get_new_emails(self) -> list[str]:
+        ## every request adds new users so that no bulk insert is skipped for being empty
+        self.num_added += 2
+        return [f"new{self.num_added - i}@example.com" for i in range(2)]
+
+    def test_my_courses(self):
+        self.assertConstantQueries(
+            lambda: self.student_client.get(reverse("my_courses"))
+        )
+
+    def test_single_course(self):
+        self.assertConstantQueries(
+            lambda: self.student_client.get(self.get_url("single_course"))
+        )
+
+    def test_course_milestones(self):
+        self.assertConstantQueries(
+            lambda: self.student_client.get(self.get_url("course_milestones"))
+        )
+
+    def test_single_course_milestone(self):
+        self.assertConstantQueries(
+            lambda: self.student_client.get(
+                self.get_url("single_course_milestone", milestone_id=self.milestone.id)
+            )
+        )
+
+    def test_course_milestone_templates(self):
+        self.assertConstantQueries(
+            lambda: self.student_client.get(
+                self.get_url("course_milestone_templates")
+            )
+        )
+
+    def test_single_course_milestone_template(self):
+        self.assertConstantQueries(
+            lambda: self.student_client.get(
+                self.get_url(
+                    "single_course_milestone_template", template_id=self.template.id
+                )
+            )
+        )
+
+    def test_course_submissions(self):
+        for query in ("", "?full=true", "?full=true&comment_counts=true", "?limit=50"):
+            ## students go through the visibility filter, which must not add queries per submission
+            for client in (self.owner_client, self.student_client):
+                self.assertConstantQueries(
+                    lambda: client.get(f"{self.get_url('course_submissions')}{query}")
+                )
+
+    def test_course_submissions_export(self):
+        self.assertConstantQueries(
+            lambda: self.owner_client.get(self.get_url("course_submissions_export"))
+        )
+
+    def test_single_course_submission(self):
+        self.assertConstantQueries(
+            lambda: self.student_client.get(
+                self.get_url(
+                    "single_course_submission", submission_id=self.submission.id
+                )
+            )
+        )
+
+    def test_course_memberships(self):
+        self.assertConstantQueries(
+            lambda: self.student_client.get(self.get_url("course_memberships"))
+        )
+
+    def test_course_memberships_with_new_user_creation(self):
+        self.assertConstantQueries(
+            lambda: self.owner_client.post(
+                self.get_url("course_memberships_with_new_user_creation"),
+                data={
+                    "memberCreationData": [
+                        {"email": email} for email in self.get_new_emails()
+                    ]
+                },
+                format="json",
+            )
+        )
+
+    def test_course_memberships_import(self):
+        self.assertConstantQueries(
+            lambda: self.owner_client.post(
+                self.get_url("course_memberships_import"),
+                data="\n".join(("email", *self.get_new_emails())),
+                content_type="text/csv",
+            )
+        )
+
+    def test_single_course_membership(self):
+        self.assertConstantQueries(
+            lambda: self.owner_client.patch(
+                self.get_url(
+                    "single_course_membership", member_id=self.student_membership.id
+                ),
+                data={"role": Role.STUDENT},
+                format="json",
+            )
+        )
+
+    def test_course_groups(self):
+        self.assertConstantQueries(
+            lambda: self.student_client.get(self.get_url("course_groups"))
+        )
+        self.assertConstantQueries(
+            lambda: self.owner_client.get(self.get_url("course_groups"))
+        )
+
+    def test_single_course_group(self):
+        self.assertConstantQueries(
+            lambda: self.student_client.get(
+                self.get_url("single_course_group", group_id=self.group.id)
+            )
+        )
+
+    def test_course_submission_field_comments(self):
+        self.assertConstantQueries(
+            lambda: self.student_client.get(
+                self.get_url(
+                    "course_submission_field_comments",
+                    submission_id=self.submission.id,
+                )
+            )
+        )
+
+    def test_course_submission_single_field_comments(self):
+        self.assertConstantQueries(
+            lambda: self.student_client.get(
+                self.get_url(
+                    "course_submission_single_field_comments",
+                    submission_id=self.submission.id,
+                    field_index=0,
+                )
+            )
+        )
+
+    def test_single_course_submission_comment(self):
+        self.assertConstantQueries(
+            lambda: self.owner_client.patch(
+                self.get_url(
+                    "single_course_submission_comment",
+                    submission_id=self.submission.id,
+                    comment_id=self.submission_comment.id,
+                ),
+                data={"content": "Updated"},
+                format="json",
+            )
+        )
+
+
+def decode_raw_json(data):
+    ## form data used to be decoded into Python objects and camelized on every response
+    if isinstance(data, RawJSON):
+        return json.loads(data.value)
+
+    if isinstance(data, dict):
+        return {key: decode_raw_json(value) for key, value in data.items()}
+
+    if isinstance(data, list):
+        return [decode_raw_json(item) for item in data]
+
+    return data
+
+
+@tag("benchmark")
+class CourseSubmissionsRenderBenchmark(CourseTestCase):
+    NUM_SUBMISSIONS = 1000
+
+    def setUp(self):
+        super().setUp()
+
+        CourseSubmission.objects.bulk_create(
+            CourseSubmission(
+                course=self.course,
+                milestone=self.milestone,
+                group=self.group,
+                template=self.template,
+                creator=self.student_membership,
+                editor=self.student_membership,
+                name=f"Submission {i}",
+                description="",
+                is_draft=False,
+                submission_type=SubmissionType.INDIVIDUAL,
+                form_response_data=[
+                    {RESPONSE: f"Response {i} {j}", "selectedOptions": [j, i]}
+                    for j in range(10)
+                ],
+            )
+            for i in range(self.NUM_SUBMISSIONS - 1)
+        )
+
+    def test_full_response_render(self):
+        response = self.owner_client.get(
+            reverse("course_submissions", kwargs={"course_id": self.course.id}),
+            data={"full": "true"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), self.NUM_SUBMISSIONS)
+
+        fast_renderer = FastJSONRenderer()
+        camel_case_renderer = CamelCaseJSONRenderer()
+
+        def render():
+            return fast_renderer.render(response.data)
+
+        def render_with_camel_case_renderer():
+            return camel_case_renderer.render(decode_raw_json(response.data))
+
+        self.assertEqual(
+            orjson.loads(render()), json.loads(render_with_camel_case_renderer())
+        )
+
+        baseline = measure(render_with_camel_case_renderer)
+        optimized = measure(render)
+        report_benchmark(
+            f"Rendering {self.NUM_SUBMISSIONS} full submissions", baseline, optimized
+        )
+
+
+@tag("benchmark")
+class CourseConditionalGetBenchmark(CourseTestCase):
+    NUM_MEMBERS = 500
+
+    def test_not_modified_saves_bytes_and_time(self):
+        users = User.objects.bulk_create(
+            User(email=f"member{i}@example.com", name=f"Member {i}")
+            for i in range(self.NUM_MEMBERS)
+        )
+        CourseMembership.objects.bulk_create(
+            CourseMembership(course=self.course, user=user) for user in users
+        )
+
+        url = reverse("course_memberships", kwargs={"course_id": self.course.id})
+        etag = self.owner_client.get(url)["ETag"]
+
+        def get():
+            return self.owner_client.get(url)
+
+        def get_if_none_match():
+            return self.owner_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        response = get()
+        not_modified_response = get_if_none_match()
+
+        self.assertEqual(
+            not_modified_response.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+        self.assertEqual(not_modified_response.content, b"")
+
+        report_benchmark(
+            f"Listing {self.NUM_MEMBERS} memberships",
+            len(response.content),
+            len(not_modified_response.content),
+            unit="bytes",
+        )
+
+        baseline = measure(get)
+        optimized = measure(get_if_none_match)
+        report_benchmark(
+            f"Listing {self.NUM_MEMBERS} memberships", baseline, optimized
+        )
+
+
+@tag("benchmark")
+class CourseGroupsBenchmark(CourseTestCase):
+    NUM_GROUPS = 400
+    NUM_MEMBERS_PER_GROUP = 3
+
+    def add_groups(self, count: int):
+        users = User.objects.bulk_create(
+            User(email=f"group{self.num_added}-{i}@example.com")
+            for i in range(count * self.NUM_MEMBERS_PER_GROUP)
+        )
+        memberships = CourseMembership.objects.bulk_create(
+            CourseMembership(course=self.course, user=user) for user in users
+        )
+        groups = CourseGroup.objects.bulk_create(
+            CourseGroup(course=self.course, name=f"Group {self.num_added}-{i}")
+            for i in range(count)
+        )
+        CourseGroupMember.objects.bulk_create(
+            CourseGroupMember(group=group, member=member)
+            for i, group in enumerate(groups)
+            for member in memberships[
+                i * self.NUM_MEMBERS_PER_GROUP : (i + 1) * self.NUM_MEMBERS_PER_GROUP
+            ]
+        )
+        self.num_added += 1
+
+    def test_member_counts_take_fixed_number_of_queries(self):
+        url = reverse("course_groups", kwargs={"course_id": self.course.id})
+
+        def get():
+            with CaptureQueriesContext(connection) as context:
+                response = self.owner_client.get(url)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            return len(context.captured_queries)
+
+        num_queries = get()
+        self.add_groups(self.NUM_GROUPS - 1)
+        self.assertEqual(get(), num_queries)
+
+        groups = list(CourseGroup.objects.filter(course=self.course))
+
+        def count_members_per_group():
+            return {group.id: group.coursegroupmember_set.count() for group in groups}
+
+        def count_members_by_annotation():
+            return {
+                group.id: group.member_count
+                for group in get_course_groups_with_member_count(self.course)
+            }
+
+        self.assertEqual(count_members_per_group(), count_members_by_annotation())
+
+        with CaptureQueriesContext(connection) as per_group_context:
+            count_members_per_group()
+
+        with CaptureQueriesContext(connection) as annotation_context:
+            count_members_by_annotation()
+
+        self.assertEqual(len(per_group_context.captured_queries), self.NUM_GROUPS)
+        self.assertEqual(len(annotation_context.captured_queries), 1)
+
+        report_benchmark(
+            f"Counting members of {self.NUM_GROUPS} groups",
+            len(per_group_context.captured_queries),
+            len(annotation_context.captured_queries),
+            unit="queries",
+        )
+
+        baseline = measure(count_members_per_group)
+        optimized = measure(count_members_by_annotation)
+        report_benchmark(
+            f"Counting members of {self.NUM_GROUPS} groups", baseline, optimized
+        )
+
+
+@tag("benchmark")
+class CourseProjectionBenchmark(CourseTestCase):
+    NUM_ROWS = 500
+
+    def setUp(self):
+        super().setUp()
+
+        users = User.objects.bulk_create(
+            User(email=f"member{i}@example.com", name=f"Member {i}")
+            for i in range(self.NUM_ROWS - 2)
+        )
+        CourseMembership.objects.bulk_create(
+            CourseMembership(course=self.course, user=user) for user in users
+        )
+        CourseMilestone.objects.bulk_create(
+            CourseMilestone(
+                course=self.course,
+                name=f"Milestone {i}",
+                description="",
+                start_date_time=timezone.now(),
+                is_published=True,
+            )
+            for i in range(self.NUM_ROWS - 1)
+        )
+
+    def compare_projection(
+        self, name: str, build_from_models: Callable, build_from_rows: Callable
+    ):
+        self.assertEqual(build_from_rows(), build_from_models())
+
+        baseline = measure(build_from_models)
+        optimized = measure(build_from_rows)
+        report_benchmark(name, baseline, optimized)
+        report_benchmark(
+            f"{name} per row",
+            baseline / self.NUM_ROWS,
+            optimized / self.NUM_ROWS,
+            unit="us",
+        )
+
+    def test_course_memberships(self):
+        memberships = self.course.coursemembership_set.order_by("id")
+
+        self.compare_projection(
+            f"Building {self.NUM_ROWS} course memberships",
+            lambda: [
+                course_membership_to_json(membership)
+                for membership in memberships.select_related("user__profile_image")
+            ],
+            lambda: [
+                course_membership_row_to_json(iter(row))
+                for row in memberships.values_list(
+                    *get_course_membership_projection()
+                )
+            ],
+        )
+
+    def test_course_milestones(self):
+        milestones = self.course.coursemilestone_set.order_by("id")
+
+        self.compare_projection(
+            f"Building {self.NUM_ROWS} course milestones",
+            lambda: [course_milestone_to_json(milestone) for milestone in milestones],
+            lambda: [
+                course_milestone_row_to_json(iter(row))
+                for row in milestones.values_list(*get_course_milestone_projection())
+            ],
+        )
@@ -16,7 +16,9 @@ from .views import (
     CourseSubmissionFieldCommentsView,
     CourseSubmissionSingleFieldCommentsView,
     SingleCourseSubmissionCommentView,
-    CourseMembershipsWithNewUserCreationView
+    CourseMembershipsWithNewUserCreationView,
+    CourseMembershipsImportView,
+    CourseSubmissionsExportView,
 )
 
 urlpatterns = [
@@ -47,6 +49,11 @@ urlpatterns = [
         CourseSubmissionsView.as_view(),
         name="course_submissions",
     ),
+    path(
+        "<int:course_id>/submissions/export/",
+        CourseSubmissionsExportView.as_view(),
+        name="course_submissions_export",
+    ),
     path(
         "<int:course_id>/submissions/<int:submission_id>/",
         SingleCourseSubmissionView.as_view(),
@@ -62,6 +69,11 @@ urlpatterns = [
         CourseMembershipsWithNewUserCreationView.as_view(),
         name="course_memberships_with_new_user_creation",
     ),
+    path(
+        "<int:course_id>/memberships/import/",
+        CourseMembershipsImportView.as_view(),
+        name="course_memberships_import",
+    ),
     path(
         "<int:course_id>/memberships/<int:member_id>/",
         SingleCourseMembershipView.as_view(),
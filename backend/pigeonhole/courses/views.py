@@ -1,31 +1,54 @@
 import logging
-from collections import Counter
+from typing import Iterable, Iterator, Optional
 
-from django.db.models import Q, QuerySet, Prefetch
+from django.http import StreamingHttpResponse
 
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.exceptions import PermissionDenied
-
-from pigeonhole.common.constants import ROLE
-from pigeonhole.common.parsers import parse_ms_timestamp_to_datetime
+from rest_framework.exceptions import PermissionDenied, UnsupportedMediaType
+
+from pigeonhole.settings import DEFAULT_PAGE_SIZE
+from pigeonhole.common.constants import (
+    ROLE,
+    ITEMS,
+    NEXT_CURSOR,
+    INCLUDED,
+    USERS,
+    COMMENTS,
+    COMMENT_COUNTS,
+    TEMPLATE_ID,
+    TEMPLATES,
+)
+from pigeonhole.common.parsers import (
+    parse_ms_timestamp_to_datetime,
+    parse_csv_lines,
+    parse_json_lines,
+    to_sparse_json,
+)
+from pigeonhole.common.serializers import SparseFieldsSerializer
 from pigeonhole.common.exceptions import BadRequest, InternalServerError
+from pigeonhole.common.streaming import stream_gzip
+from pigeonhole.common.utils import conditional_get
 from users.middlewares import check_account_access
 from users.models import User, AccountType
 from .models import (
+    bump_course_membership_index_version,
     Course,
     CourseGroup,
-    CourseGroupMember,
     CourseMembership,
     CourseMilestone,
     CourseMilestoneTemplate,
     CourseSubmission,
     CourseSubmissionComment,
+    ExportFileFormat,
     PatchCourseGroupAction,
     Role,
 )
 from .logic import (
+    annotate_raw_course_milestone_template_form_data,
+    annotate_raw_course_submission_form_data,
+    annotate_course_submission_comment_activity,
     batch_update_course_group_members,
     can_create_course_group,
     can_delete_course_group,
@@ -39,13 +62,16 @@ from .logic import (
     can_view_course_submission,
     course_group_to_json,
     course_group_with_members_to_json,
+    course_membership_row_to_json,
     course_membership_to_json,
     course_milestone_template_to_json,
     course_submission_comment_to_json,
-    course_submission_summary_to_json,
+    course_submission_summary_row_to_json,
     course_submission_to_json,
+    course_summary_row_to_json,
     course_summary_to_json,
     course_to_json,
+    course_milestone_row_to_json,
     course_milestone_to_json,
     create_course,
     create_course_group,
@@ -54,9 +80,38 @@ from .logic import (
     create_course_submission,
     create_course_submission_comment,
     delete_course_submission_comment,
+    get_course_etag,
+    get_course_membership_projection,
+    get_course_milestone_projection,
+    get_course_submission_summary_projection,
+    get_course_summary_projection,
+    get_course_group_etag,
+    get_course_groups_etag,
+    get_course_membership_index,
+    get_viewable_course_groups,
+    get_course_last_modified,
+    get_course_memberships_etag,
+    get_course_milestone_etag,
+    get_course_milestone_last_modified,
+    get_course_milestone_template_etag,
+    get_course_milestone_template_last_modified,
+    get_course_milestone_templates_etag,
+    get_course_milestones_etag,
+    get_my_courses_etag,
+    get_visible_course_memberships,
+    get_visible_course_milestone_templates,
+    get_visible_course_milestones,
     get_requested_course_submissions,
     get_course_submission_comments,
-    is_group_member,
+    get_course_submission_field_count,
+    get_included_course_milestone_templates,
+    get_course_submissions_field_comment_counts,
+    get_course_submission_field_comment_counts,
+    prefetch_course_submission_comments,
+    get_course_submissions_page,
+    get_viewable_course_submissions,
+    import_course_memberships,
+    stream_course_submissions_export,
     update_course,
     create_course_milestone,
     update_course_group,
@@ -70,6 +125,7 @@ from .logic import (
 from .serializers import (
     BatchMembershipCreationSerializer,
     CourseMemberCreationDataSerializer,
+    ExportCourseSubmissionSerializer,
     GetCourseGroupSerializer,
     GetCourseSubmissionSerializer,
     PatchCourseGroupSerializer,
@@ -88,10 +144,10 @@ from .serializers import (
     PutCourseSubmissionSerializer,
 )
 from .middlewares import (
-    check_course,
+    cache_course_response,
+    check_course_access,
     check_group,
     check_membership,
-    check_requester_membership,
     check_milestone,
     check_submission,
     check_submission_comment,
@@ -103,20 +159,20 @@ logger = logging.getLogger("main")
 # Create your views here.
 class MyCoursesView(APIView):
     @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
+    @conditional_get(etag_func=get_my_courses_etag)
     def get(self, request, requester: User):
-        ## only show courses which are published or if course membership role is above STUDENT
-        visible_memberships: QuerySet[
-            CourseMembership
-        ] = requester.coursemembership_set.filter(
-            ~Q(role=Role.STUDENT) | Q(course__is_published=True)
-        ).select_related(
-            "course__owner__profile_image"
+        ## the requester is only read from the token so that it is not loaded
+        requester_id = request.user.id
+
+        ## requesters without any course membership are answered from the cached index
+        if not get_course_membership_index(requester_id):
+            return Response(data=[], status=status.HTTP_200_OK)
+
+        rows = get_visible_course_memberships(requester_id).values_list(
+            *get_course_summary_projection()
         )
 
-        data = [
-            course_summary_to_json(course=membership.course, membership=membership)
-            for membership in visible_memberships
-        ]
+        data = [course_summary_row_to_json(iter(row)) for row in rows]
 
         return Response(data=data, status=status.HTTP_200_OK)
 
@@ -160,9 +216,11 @@ class MyCoursesView(APIView):
 
 
 class SingleCourseView(APIView):
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @conditional_get(
+        etag_func=get_course_etag, last_modified_func=get_course_last_modified
+    )
+    @cache_course_response
     def get(
         self,
         request,
@@ -174,9 +232,7 @@ class SingleCourseView(APIView):
 
         return Response(data=data, status=status.HTTP_200_OK)
 
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.CO_OWNER)
+    @check_course_access(Role.CO_OWNER)
     def put(
         self,
         request,
@@ -230,9 +286,7 @@ class SingleCourseView(APIView):
 
         return Response(data=data, status=status.HTTP_200_OK)
 
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.CO_OWNER)
+    @check_course_access(Role.CO_OWNER)
     def delete(
         self,
         request,
@@ -252,9 +306,9 @@ class SingleCourseView(APIView):
 
 
 class CourseMilestonesView(APIView):
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @conditional_get(etag_func=get_course_milestones_etag)
+    @cache_course_response
     def get(
         self,
         request,
@@ -262,18 +316,15 @@ class CourseMilestonesView(APIView):
         course: Course,
         requester_membership: CourseMembership,
     ):
-        visible_milestones: QuerySet[CourseMilestone] = course.coursemilestone_set.all()
-
-        if requester_membership.role == Role.STUDENT:
-            visible_milestones = visible_milestones.filter(is_published=True)
+        rows = get_visible_course_milestones(
+            course=course, requester_membership=requester_membership
+        ).values_list(*get_course_milestone_projection())
 
-        data = [course_milestone_to_json(milestone) for milestone in visible_milestones]
+        data = [course_milestone_row_to_json(iter(row)) for row in rows]
 
         return Response(data=data, status=status.HTTP_200_OK)
 
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.INSTRUCTOR, Role.CO_OWNER)
     def post(
         self,
         request,
@@ -308,10 +359,12 @@ class CourseMilestonesView(APIView):
 
 
 class SingleCourseMilestoneView(APIView):
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
     @check_milestone
+    @conditional_get(
+        etag_func=get_course_milestone_etag,
+        last_modified_func=get_course_milestone_last_modified,
+    )
     def get(
         self,
         request,
@@ -327,9 +380,7 @@ class SingleCourseMilestoneView(APIView):
 
         return Response(data=data, status=status.HTTP_200_OK)
 
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.INSTRUCTOR, Role.CO_OWNER)
     @check_milestone
     def put(
         self,
@@ -361,9 +412,7 @@ class SingleCourseMilestoneView(APIView):
 
         return Response(data=data, status=status.HTTP_200_OK)
 
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.INSTRUCTOR, Role.CO_OWNER)
     @check_milestone
     def delete(
         self,
@@ -381,9 +430,8 @@ class SingleCourseMilestoneView(APIView):
 
 
 class CourseMembershipsView(APIView):
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @conditional_get(etag_func=get_course_memberships_etag)
     def get(
         self,
         request,
@@ -391,17 +439,15 @@ class CourseMembershipsView(APIView):
         course: Course,
         requester_membership: CourseMembership,
     ):
-        memberships: QuerySet[
-            CourseMembership
-        ] = course.coursemembership_set.select_related("user__profile_image")
+        rows = course.coursemembership_set.values_list(
+            *get_course_membership_projection()
+        )
 
-        data = [course_membership_to_json(membership) for membership in memberships]
+        data = [course_membership_row_to_json(iter(row)) for row in rows]
 
         return Response(data=data, status=status.HTTP_200_OK)
 
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.CO_OWNER)
+    @check_course_access(Role.CO_OWNER)
     def post(
         self,
         request,
@@ -429,9 +475,7 @@ class CourseMembershipsView(APIView):
 
 
 class SingleCourseMembershipView(APIView):
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.CO_OWNER)
+    @check_course_access(Role.CO_OWNER)
     @check_membership
     def patch(
         self,
@@ -458,9 +502,7 @@ class SingleCourseMembershipView(APIView):
 
         return Response(data=data, status=status.HTTP_200_OK)
 
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.CO_OWNER)
+    @check_course_access(Role.CO_OWNER)
     @check_membership
     def delete(
         self,
@@ -482,9 +524,8 @@ class SingleCourseMembershipView(APIView):
 
 
 class CourseGroupsView(APIView):
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @conditional_get(etag_func=get_course_groups_etag)
     def get(
         self,
         request,
@@ -496,36 +537,33 @@ class CourseGroupsView(APIView):
 
         serializer.is_valid(raise_exception=True)
         should_show_only_my_groups = serializer.validated_data["me"]
+        included_users = {} if serializer.validated_data["normalized"] else None
 
         ## prefetch related is used for performance optimization
         ## reference: https://betterprogramming.pub/django-select-related-and-prefetch-related-f23043fd635d
-        groups: QuerySet[CourseGroup] = course.coursegroup_set.prefetch_related(
-            Prefetch(
-                lookup="coursegroupmember_set",
-                queryset=CourseGroupMember.objects.select_related(
-                    "member__user__profile_image"
-                ),
-            )
+        groups = get_viewable_course_groups(
+            course=course,
+            membership=requester_membership,
+            only_my_groups=should_show_only_my_groups,
         )
 
         data = [
-            course_group_with_members_to_json(group)
+            course_group_with_members_to_json(
+                group=group, included_users=included_users
+            )
             if can_view_course_group_members(
                 course=course, membership=requester_membership, group=group
             )
             else course_group_to_json(group)
             for group in groups
-            if (
-                not should_show_only_my_groups
-                or is_group_member(membership=requester_membership, group=group)
-            )
         ]
 
+        if included_users is not None:
+            data = {ITEMS: data, INCLUDED: {USERS: included_users}}
+
         return Response(data=data, status=status.HTTP_200_OK)
 
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
     def post(
         self,
         request,
@@ -552,10 +590,9 @@ class CourseGroupsView(APIView):
 
 
 class SingleCourseGroupView(APIView):
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
     @check_group
+    @conditional_get(etag_func=get_course_group_etag)
     def get(
         self,
         request,
@@ -574,9 +611,7 @@ class SingleCourseGroupView(APIView):
 
         return Response(data=data, status=status.HTTP_200_OK)
 
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
     @check_group
     def patch(
         self,
@@ -631,9 +666,7 @@ class SingleCourseGroupView(APIView):
 
         return Response(data=data, status=status.HTTP_200_OK)
 
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
     @check_group
     def delete(
         self,
@@ -656,9 +689,9 @@ class SingleCourseGroupView(APIView):
 
 
 class CourseMilestoneTemplatesView(APIView):
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @conditional_get(etag_func=get_course_milestone_templates_etag)
+    @cache_course_response
     def get(
         self,
         request,
@@ -666,24 +699,28 @@ class CourseMilestoneTemplatesView(APIView):
         course: Course,
         requester_membership: CourseMembership,
     ):
-        ## only show courses which are published or if course membership role is above STUDENT
-        visible_templates: QuerySet[
-            CourseMilestoneTemplate
-        ] = course.coursemilestonetemplate_set.select_related("form")
+        serializer = SparseFieldsSerializer(data=request.query_params.dict())
 
-        if requester_membership.role == Role.STUDENT:
-            visible_templates = visible_templates.filter(is_published=True)
+        serializer.is_valid(raise_exception=True)
+        fields = serializer.validated_data["fields"]
+
+        visible_templates = annotate_raw_course_milestone_template_form_data(
+            templates=get_visible_course_milestone_templates(
+                course=course, requester_membership=requester_membership
+            ).select_related("form"),
+            fields=fields,
+        )
 
         data = [
-            course_milestone_template_to_json(template)
+            to_sparse_json(
+                data=course_milestone_template_to_json(template), fields=fields
+            )
             for template in visible_templates
         ]
 
         return Response(data=data, status=status.HTTP_200_OK)
 
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.INSTRUCTOR, Role.CO_OWNER)
     def post(
         self,
         request,
@@ -711,10 +748,12 @@ class CourseMilestoneTemplatesView(APIView):
 
 
 class SingleCourseMilestoneTemplateView(APIView):
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
     @check_template
+    @conditional_get(
+        etag_func=get_course_milestone_template_etag,
+        last_modified_func=get_course_milestone_template_last_modified,
+    )
     def get(
         self,
         request,
@@ -728,13 +767,18 @@ class SingleCourseMilestoneTemplateView(APIView):
         ):
             raise PermissionDenied()
 
-        data = course_milestone_template_to_json(template)
+        serializer = SparseFieldsSerializer(data=request.query_params.dict())
+
+        serializer.is_valid(raise_exception=True)
+
+        data = to_sparse_json(
+            data=course_milestone_template_to_json(template),
+            fields=serializer.validated_data["fields"],
+        )
 
         return Response(data=data, status=status.HTTP_200_OK)
 
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.INSTRUCTOR, Role.CO_OWNER)
     @check_template
     def put(
         self,
@@ -762,9 +806,7 @@ class SingleCourseMilestoneTemplateView(APIView):
 
         return Response(data=data, status=status.HTTP_200_OK)
 
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.INSTRUCTOR, Role.CO_OWNER)
     @check_template
     def delete(
         self,
@@ -782,9 +824,7 @@ class SingleCourseMilestoneTemplateView(APIView):
 
 
 class CourseSubmissionsView(APIView):
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
     def get(
         self,
         request,
@@ -805,24 +845,115 @@ class CourseSubmissionsView(APIView):
             editor_id=validated_data["editor_id"],
             template_id=validated_data["template_id"],
         )
+        submissions = get_viewable_course_submissions(
+            submissions=submissions, requester_membership=requester_membership
+        )
 
         full = validated_data["full"]
+        cursor = validated_data["cursor"]
+        limit = validated_data["limit"]
+        normalized = validated_data["normalized"]
+        included_users = {} if normalized else None
+        included_templates = None
+        fields = validated_data["fields"]
+
+        is_paginated = cursor is not None or limit is not None
+        next_cursor = None
+
+        submissions = annotate_course_submission_comment_activity(submissions)
+
+        if full:
+            ## templates are side-loaded once instead of being embedded in every submission when normalized
+            submissions = annotate_raw_course_submission_form_data(
+                submissions=submissions, fields=fields, with_template=not normalized
+            )
 
-        data = [
-            course_submission_to_json(submission=submission, with_comments=True)
-            if full
-            else course_submission_summary_to_json(submission)
-            for submission in submissions
-            if can_view_course_submission(
-                requester_membership=requester_membership, submission=submission
+            comment_counts = validated_data["comment_counts"]
+            with_comments = not comment_counts and (
+                fields is None or COMMENTS in fields
             )
-        ]
+            with_comment_counts = comment_counts and (
+                fields is None or COMMENT_COUNTS in fields
+            )
+
+            ## comments of all submissions are fetched in a single query
+            if with_comments:
+                submissions = prefetch_course_submission_comments(submissions)
+
+            if is_paginated:
+                submissions, next_cursor = get_course_submissions_page(
+                    submissions=submissions,
+                    cursor=cursor,
+                    page_size=limit or DEFAULT_PAGE_SIZE,
+                )
+
+            submissions = list(submissions)
+
+            field_comment_counts = (
+                get_course_submissions_field_comment_counts(submissions)
+                if with_comment_counts
+                else {}
+            )
+
+            data = [
+                to_sparse_json(
+                    data=course_submission_to_json(
+                        submission=submission,
+                        with_comments=with_comments,
+                        included_users=included_users,
+                        with_template_reference=normalized,
+                        field_comment_counts=field_comment_counts.get(submission.id),
+                    ),
+                    fields=fields,
+                )
+                for submission in submissions
+            ]
+
+            if normalized and (fields is None or TEMPLATE_ID in fields):
+                included_templates = get_included_course_milestone_templates(
+                    course=course,
+                    template_ids=(submission.template_id for submission in submissions),
+                )
+
+        else:
+            ## summaries are built from projected rows, updated_at is appended for the pagination keyset
+            rows = submissions.values_list(
+                *get_course_submission_summary_projection(), "updated_at"
+            )
+
+            if is_paginated:
+                rows, next_cursor = get_course_submissions_page(
+                    submissions=rows,
+                    cursor=cursor,
+                    page_size=limit or DEFAULT_PAGE_SIZE,
+                    get_keyset=lambda row: (row[-1], row[0]),
+                )
+
+            data = [
+                to_sparse_json(
+                    data=course_submission_summary_row_to_json(
+                        values=iter(row), included_users=included_users
+                    ),
+                    fields=fields,
+                )
+                for row in rows
+            ]
+
+        if is_paginated or included_users is not None:
+            data = {ITEMS: data}
+
+        if is_paginated:
+            data[NEXT_CURSOR] = next_cursor
+
+        if included_users is not None:
+            data[INCLUDED] = {USERS: included_users}
+
+        if included_templates is not None:
+            data[INCLUDED][TEMPLATES] = included_templates
 
         return Response(data, status=status.HTTP_200_OK)
 
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
     def post(
         self,
         request,
@@ -856,10 +987,60 @@ class CourseSubmissionsView(APIView):
         return Response(data=data, status=status.HTTP_201_CREATED)
 
 
+EXPORT_FILE_FORMAT_TO_PROPERTIES_MAP = {
+    ExportFileFormat.CSV: ("csv", "text/csv; charset=utf-8"),
+    ExportFileFormat.JSONL: ("jsonl", "application/x-ndjson; charset=utf-8"),
+}
+
+
+class CourseSubmissionsExportView(APIView):
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    def get(
+        self,
+        request,
+        requester: User,
+        course: Course,
+        requester_membership: CourseMembership,
+    ):
+        serializer = ExportCourseSubmissionSerializer(data=request.query_params.dict())
+
+        serializer.is_valid(raise_exception=True)
+        validated_data = serializer.validated_data
+
+        submissions = get_requested_course_submissions(
+            course=course,
+            milestone_id=validated_data["milestone_id"],
+            group_id=validated_data["group_id"],
+            creator_id=validated_data["creator_id"],
+            editor_id=validated_data["editor_id"],
+            template_id=validated_data["template_id"],
+        )
+        submissions = get_viewable_course_submissions(
+            submissions=submissions, requester_membership=requester_membership
+        )
+
+        file_format = validated_data["file_format"]
+        extension, content_type = EXPORT_FILE_FORMAT_TO_PROPERTIES_MAP[file_format]
+
+        chunks = stream_course_submissions_export(
+            course=course, submissions=submissions, file_format=file_format
+        )
+
+        if validated_data["gzip"]:
+            chunks = stream_gzip(chunks)
+            extension = f"{extension}.gz"
+            content_type = "application/gzip"
+
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response[
+            "Content-Disposition"
+        ] = f'attachment; filename="submissions-{course.id}.{extension}"'
+
+        return response
+
+
 class SingleCourseSubmissionView(APIView):
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
     @check_submission
     def get(
         self,
@@ -874,13 +1055,18 @@ class SingleCourseSubmissionView(APIView):
         ):
             raise PermissionDenied()
 
-        data = course_submission_to_json(submission)
+        serializer = SparseFieldsSerializer(data=request.query_params.dict())
+
+        serializer.is_valid(raise_exception=True)
+
+        data = to_sparse_json(
+            data=course_submission_to_json(submission),
+            fields=serializer.validated_data["fields"],
+        )
 
         return Response(data=data, status=status.HTTP_200_OK)
 
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
     @check_submission
     def put(
         self,
@@ -919,9 +1105,7 @@ class SingleCourseSubmissionView(APIView):
 
         return Response(data=data, status=status.HTTP_200_OK)
 
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
     @check_submission
     def delete(
         self,
@@ -944,9 +1128,7 @@ class SingleCourseSubmissionView(APIView):
 
 
 class CourseSubmissionFieldCommentsView(APIView):
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
     @check_submission
     def get(
         self,
@@ -961,22 +1143,13 @@ class CourseSubmissionFieldCommentsView(APIView):
         ):
             raise PermissionDenied()
 
-        field_to_comment_count_map = Counter(
-            submission.coursesubmissioncomment_set.values_list("field_index", flat=True)
-        )
-
-        data = [
-            field_to_comment_count_map[i]
-            for i in range(len(submission.form_response_data))
-        ]
+        data = get_course_submission_field_comment_counts(submission)
 
         return Response(data=data, status=status.HTTP_200_OK)
 
 
 class CourseSubmissionSingleFieldCommentsView(APIView):
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
     @check_submission
     def get(
         self,
@@ -992,20 +1165,30 @@ class CourseSubmissionSingleFieldCommentsView(APIView):
         ):
             raise PermissionDenied()
 
-        if field_index < 0 or field_index >= len(submission.form_response_data):
+        if field_index < 0 or field_index >= get_course_submission_field_count(
+            submission
+        ):
             raise BadRequest(detail="No such field.")
 
+        serializer = SparseFieldsSerializer(data=request.query_params.dict())
+
+        serializer.is_valid(raise_exception=True)
+        fields = serializer.validated_data["fields"]
+
         comments = get_course_submission_comments(submission).filter(
             field_index=field_index
         )
 
-        data = [course_submission_comment_to_json(comment) for comment in comments]
+        data = [
+            to_sparse_json(
+                data=course_submission_comment_to_json(comment), fields=fields
+            )
+            for comment in comments
+        ]
 
         return Response(data=data, status=status.HTTP_200_OK)
 
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
     @check_submission
     def post(
         self,
@@ -1021,7 +1204,9 @@ class CourseSubmissionSingleFieldCommentsView(APIView):
         ):
             raise PermissionDenied()
 
-        if field_index < 0 or field_index >= len(submission.form_response_data):
+        if field_index < 0 or field_index >= get_course_submission_field_count(
+            submission
+        ):
             raise BadRequest(detail="No such field.")
 
         serializer = PostCourseSubmissionCommentSerializer(data=request.data)
@@ -1043,9 +1228,7 @@ class CourseSubmissionSingleFieldCommentsView(APIView):
 
 
 class SingleCourseSubmissionCommentView(APIView):
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
     @check_submission
     @check_submission_comment
     def patch(
@@ -1081,9 +1264,7 @@ class SingleCourseSubmissionCommentView(APIView):
 
         return Response(data=data, status=status.HTTP_200_OK)
 
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
+    @check_course_access(Role.STUDENT, Role.INSTRUCTOR, Role.CO_OWNER)
     @check_submission
     @check_submission_comment
     def delete(
@@ -1113,9 +1294,7 @@ class SingleCourseSubmissionCommentView(APIView):
 
 
 class CourseMembershipsWithNewUserCreationView(APIView):
-    @check_account_access(AccountType.STANDARD, AccountType.EDUCATOR, AccountType.ADMIN)
-    @check_course
-    @check_requester_membership(Role.CO_OWNER)
+    @check_course_access(Role.CO_OWNER)
     def post(
         self,
         request,
@@ -1161,8 +1340,57 @@ class CourseMembershipsWithNewUserCreationView(APIView):
             new_memberships_to_be_created, ignore_conflicts=True
         )
 
+        ## bulk_create does not send post_save signals
+        for user in all_users:
+            bump_course_membership_index_version(user.id)
+
         # return all members
-        memberships = CourseMembership.objects.filter(user__email__in=emails)
+        memberships = course.coursemembership_set.filter(
+            user__email__in=emails
+        ).select_related("user__profile_image")
         data = [course_membership_to_json(membership) for membership in memberships]
 
         return Response(data=data, status=status.HTTP_200_OK)
+
+
+CSV_CONTENT_TYPE = "text/csv"
+JSON_LINES_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl")
+
+
+def validate_member_creation_data(
+    rows: Iterable[Optional[dict]],
+) -> Iterator[Optional[dict]]:
+    for row in rows:
+        serializer = CourseMemberCreationDataSerializer(data=row)
+
+        yield serializer.validated_data if serializer.is_valid() else None
+
+
+class CourseMembershipsImportView(APIView):
+    @check_course_access(Role.CO_OWNER)
+    def post(
+        self,
+        request,
+        requester: User,
+        course: Course,
+        requester_membership: CourseMembership,
+    ):
+        ## the body is read line by line instead of being parsed as a whole
+        lines = (
+            iter(request.stream.readline, b"") if request.stream is not None else ()
+        )
+
+        media_type = request.content_type.split(";", 1)[0].strip().lower()
+
+        if media_type == CSV_CONTENT_TYPE:
+            rows = parse_csv_lines(lines)
+        elif media_type in JSON_LINES_CONTENT_TYPES:
+            rows = parse_json_lines(lines)
+        else:
+            raise UnsupportedMediaType(media_type=request.content_type)
+
+        data = import_course_memberships(
+            course=course, member_creation_data=validate_member_creation_data(rows)
+        )
+
+        return Response(data=data, status=status.HTTP_200_OK)
@@ -9,6 +9,7 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from pigeonhole.common.constants import ANNOTATED_CONTENT, FEEDBACK
 from users.models import User, AccountType
 from users.middlewares import check_account_access
 from .serializers import PostFeedbackSerializer
@@ -98,6 +99,6 @@ class FeedbackView(APIView):
 
         annotated_content, feedback = analyse(serializer.validated_data["content"])
 
-        data = {"annotated_content": annotated_content, "feedback": feedback}
+        data = {ANNOTATED_CONTENT: annotated_content, FEEDBACK: feedback}
 
         return Response(data=data, status=status.HTTP_200_OK)
@@ -0,0 +1,46 @@
+# Generated by Django 4.0.5 on 2026-10-18 11:02
+
+from django.db import migrations
+
+from djangorestframework_camel_case.util import camelize, underscoreize
+
+CHUNK_SIZE = 500
+
+
+## form field data used to be stored with snake_case keys and camelized on every response,
+## it is now stored as sent by the client and returned as is
+def convert_form_field_data(apps, convert):
+    Form = apps.get_model('forms', 'Form')
+
+    ## converted rows are written back every chunk so that only one chunk is held in memory
+    forms = []
+    for form in Form.objects.only('id', 'form_field_data').iterator(chunk_size=CHUNK_SIZE):
+        form.form_field_data = convert(form.form_field_data)
+        forms.append(form)
+
+        if len(forms) == CHUNK_SIZE:
+            Form.objects.bulk_update(forms, ['form_field_data'])
+            forms = []
+
+    Form.objects.bulk_update(forms, ['form_field_data'])
+
+
+def camelize_form_field_data(apps, schema_editor):
+    convert_form_field_data(apps, camelize)
+
+
+def underscoreize_form_field_data(apps, schema_editor):
+    convert_form_field_data(
+        apps, lambda data: underscoreize(data, no_underscore_before_number=True)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(camelize_form_field_data, underscoreize_form_field_data),
+    ]
@@ -6,6 +6,15 @@ from users.models import User
 
 
 # Create your models here.
+class FormFieldType(models.TextChoices):
+    TEXT = "TEXT"
+    TEXT_AREA = "TEXT_AREA"
+    NUMERIC = "NUMERIC"
+    MCQ = "MCQ"
+    MRQ = "MRQ"
+    TEXT_DISPLAY = "TEXT_DISPLAY"
+
+
 class Form(TimestampedModel):
     name = models.CharField(max_length=255)
     form_field_data = models.JSONField(blank=True, default=default_list)
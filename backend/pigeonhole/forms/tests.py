@@ -1,3 +1,74 @@
-from django.test import TestCase
+import io
+
+import orjson
+from djangorestframework_camel_case.parser import (
+    CamelCaseJSONParser as RecursiveCamelCaseJSONParser,
+)
+
+from django.test import SimpleTestCase, tag
+
+from pigeonhole.common.benchmarks import measure, report_benchmark
+from pigeonhole.common.parsers import CamelCaseJSONParser
+
+
+def get_template_payload(form_field_data_key: str, size: int) -> bytes:
+    form_field = {
+        "type": "MCQ",
+        "label": "Which of these apply?",
+        "isRequired": True,
+        "placeholderText": "",
+        "options": [
+            {"optionLabel": f"Option {i}", "optionValue": i} for i in range(5)
+        ],
+    }
+    num_form_fields = size // len(orjson.dumps(form_field)) + 1
+
+    return orjson.dumps(
+        {
+            "name": "Template",
+            "description": "",
+            "submissionType": "INDIVIDUAL",
+            form_field_data_key: [form_field] * num_form_fields,
+        }
+    )
+
 
 # Create your tests here.
+class CamelCaseJSONParserTest(SimpleTestCase):
+    def test_form_field_data_is_passed_through(self):
+        for form_field_data_key in ("formFieldData", "form_field_data"):
+            with self.subTest(form_field_data_key=form_field_data_key):
+                payload = get_template_payload(form_field_data_key, size=1024)
+
+                data = CamelCaseJSONParser().parse(io.BytesIO(payload))
+
+                self.assertEqual(
+                    data["form_field_data"], orjson.loads(payload)[form_field_data_key]
+                )
+                self.assertEqual(data["submission_type"], "INDIVIDUAL")
+
+
+@tag("benchmark")
+class CamelCaseJSONParserBenchmark(SimpleTestCase):
+    PAYLOAD_SIZE = 1024 * 1024
+
+    def test_template_payload_parse(self):
+        payload = get_template_payload("formFieldData", size=self.PAYLOAD_SIZE)
+
+        def parse():
+            return CamelCaseJSONParser().parse(io.BytesIO(payload))
+
+        def parse_recursively():
+            return RecursiveCamelCaseJSONParser().parse(io.BytesIO(payload))
+
+        ## both parsers give the same data outside of the opaque fields
+        self.assertEqual(
+            parse() | {"form_field_data": None},
+            parse_recursively() | {"form_field_data": None},
+        )
+
+        baseline = measure(parse_recursively)
+        optimized = measure(parse)
+        report_benchmark(
+            f"Parsing a {len(payload) // 1024}KB template", baseline, optimized
+        )
@@ -0,0 +1,25 @@
+import timeit
+from typing import Callable
+
+## Benchmarks
+## tests tagged "benchmark" report how an optimised path compares to the path it replaced.
+## timings depend on the machine and its load, so they are only reported and never asserted on.
+
+TIME_UNIT_SCALES = {"ms": 1e3, "us": 1e6}
+
+
+def measure(fn: Callable, repeat: int = 5) -> float:
+    ## best of several runs so that comparisons are not skewed by noise
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def report_benchmark(name: str, baseline: float, optimized: float, unit: str = "ms"):
+    ## timings are measured in seconds and scaled to the unit, counts such as bytes or queries are reported as is
+    scale = TIME_UNIT_SCALES.get(unit, 1)
+    precision = 2 if unit in TIME_UNIT_SCALES else 0
+    speedup = f" ({baseline / optimized:.1f}x)" if optimized else ""
+
+    print(
+        f"\n{name}: {baseline * scale:.{precision}f} {unit}"
+        f" -> {optimized * scale:.{precision}f} {unit}{speedup}"
+    )
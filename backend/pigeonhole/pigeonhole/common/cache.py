@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import Counter
+
+from django.core.cache import cache
+from django.core.checks import Error, Tags, register
+
+from pigeonhole.common.constants import HITS, MISSES
+from pigeonhole.settings import (
+    CACHES,
+    CACHE_STATS_FLUSH_INTERVAL,
+    IN_PROCESS_CACHE_BACKENDS,
+)
+
+
+## Shared cache
+## versions are only seen by every worker process if the cache is shared between them
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    if CACHES["default"]["BACKEND"] not in IN_PROCESS_CACHE_BACKENDS:
+        return []
+
+    return [
+        Error(
+            "CACHE_BACKEND must be a shared cache in production.",
+            hint="Set CACHE_BACKEND and CACHE_LOCATION, e.g. to a Redis cache.",
+            id="pigeonhole.E001",
+        )
+    ]
+
+
+## Versioned keys
+## cached entries are never deleted, instead the version embedded in their keys is bumped so that stale entries are
+## simply no longer read and expire on their own. versions start from the current time so that a version key which
+## has been evicted does not restart from a number that was used before.
+
+
+def get_version_key(namespace: str, id: int) -> str:
+    return f"{namespace}:{id}:version"
+
+
+def get_version(namespace: str, id: int) -> int:
+    key = get_version_key(namespace=namespace, id=id)
+    version = cache.get(key)
+
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+
+    return version
+
+
+def bump_version(namespace: str, id: int):
+    key = get_version_key(namespace=namespace, id=id)
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        ## version key is missing or evicted
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+## Hit/miss counters
+## counted in process and periodically added to counters in the cache, so that they are shared by all worker
+## processes without a cache round trip on every access
+
+pending_stats: Counter[tuple[str, str]] = Counter()
+pending_stats_lock = threading.Lock()
+pending_stats_flushed_at = time.monotonic()
+
+
+def get_stats_key(name: str, stat: str) -> str:
+    return f"cache_stats:{name}:{stat}"
+
+
+def add_to_stat(name: str, stat: str, delta: int):
+    key = get_stats_key(name=name, stat=stat)
+
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        ## add does nothing if another process has created the counter in the meantime
+        if not cache.add(key, delta, timeout=None):
+            cache.incr(key, delta)
+
+
+def flush_stats():
+    global pending_stats_flushed_at
+
+    with pending_stats_lock:
+        stats = pending_stats.copy()
+        pending_stats.clear()
+        pending_stats_flushed_at = time.monotonic()
+
+    for (name, stat), delta in stats.items():
+        add_to_stat(name=name, stat=stat, delta=delta)
+
+
+def increment_stat(name: str, stat: str, delta: int = 1):
+    with pending_stats_lock:
+        pending_stats[(name, stat)] += delta
+        should_flush = (
+            time.monotonic() - pending_stats_flushed_at >= CACHE_STATS_FLUSH_INTERVAL
+        )
+
+    if should_flush:
+        flush_stats()
+
+
+def record_cache_access(name: str, is_hit: bool):
+    increment_stat(name=name, stat=HITS if is_hit else MISSES)
+
+
+def get_stat(name: str, stat: str) -> int:
+    ## counts of other processes are only included up to their last flush
+    flush_stats()
+
+    return cache.get(get_stats_key(name=name, stat=stat), 0)
+
+
+def get_cache_stats(name: str) -> dict:
+    return {stat: get_stat(name=name, stat=stat) for stat in (HITS, MISSES)}
@@ -5,47 +5,70 @@ USER = "user"
 ID = "id"
 NAME = "name"
 EMAIL = "email"
-CREATED_AT = "created_at"
-UPDATED_AT = "updated_at"
-PROFILE_IMAGE = "profile_image"
-IS_SELF = "is_self"
-HAS_PASSWORD_AUTH = "has_password_auth"
-GOOGLE_AUTH = "google_auth"
-FACEBOOK_AUTH = "facebook_auth"
-TOKEN_ID = "token_id"
-ACCESS_TOKEN = "access_token"
+CREATED_AT = "createdAt"
+UPDATED_AT = "updatedAt"
+PROFILE_IMAGE = "profileImage"
+IS_SELF = "isSelf"
+HAS_PASSWORD_AUTH = "hasPasswordAuth"
+GOOGLE_AUTH = "googleAuth"
+FACEBOOK_AUTH = "facebookAuth"
 PASSWORD = "password"
 DESCRIPTION = "description"
-IS_PUBLISHED = "is_published"
+IS_PUBLISHED = "isPublished"
 OWNER = "owner"
 ROLE = "role"
-ACCOUNT_TYPE = "account_type"
-SHOW_GROUP_MEMBERS_NAMES = "show_group_members_names"
-ALLOW_STUDENTS_TO_CREATE_GROUPS = "allow_students_to_create_groups"
-ALLOW_STUDENTS_TO_DELETE_GROUPS = "allow_students_to_delete_groups"
-ALLOW_STUDENTS_TO_JOIN_GROUPS = "allow_students_to_join_groups"
-ALLOW_STUDENTS_TO_LEAVE_GROUPS = "allow_students_to_leave_groups"
-ALLOW_STUDENTS_TO_MODIFY_GROUP_NAME = "allow_students_to_modify_group_name"
-ALLOW_STUDENTS_TO_ADD_OR_REMOVE_GROUP_MEMBERS = (
-    "allow_students_to_add_or_remove_group_members"
-)
-MILESTONE_ALIAS = "milestone_alias"
-START_DATE_TIME = "start_date_time"
-END_DATE_TIME = "end_date_time"
+ACCOUNT_TYPE = "accountType"
+SHOW_GROUP_MEMBERS_NAMES = "showGroupMembersNames"
+ALLOW_STUDENTS_TO_CREATE_GROUPS = "allowStudentsToCreateGroups"
+ALLOW_STUDENTS_TO_DELETE_GROUPS = "allowStudentsToDeleteGroups"
+ALLOW_STUDENTS_TO_JOIN_GROUPS = "allowStudentsToJoinGroups"
+ALLOW_STUDENTS_TO_LEAVE_GROUPS = "allowStudentsToLeaveGroups"
+ALLOW_STUDENTS_TO_MODIFY_GROUP_NAME = "allowStudentsToModifyGroupName"
+ALLOW_STUDENTS_TO_ADD_OR_REMOVE_GROUP_MEMBERS = "allowStudentsToAddOrRemoveGroupMembers"
+MILESTONE_ALIAS = "milestoneAlias"
+START_DATE_TIME = "startDateTime"
+END_DATE_TIME = "endDateTime"
 MILESTONE = "milestone"
 MEMBERS = "members"
-MEMBER_COUNT = "member_count"
-SUBMISSION_TYPE = "submission_type"
-FORM_FIELD_DATA = "form_field_data"
-IS_DRAFT = "is_draft"
+MEMBER_COUNT = "memberCount"
+SUBMISSION_TYPE = "submissionType"
+FORM_FIELD_DATA = "formFieldData"
+IS_DRAFT = "isDraft"
 CREATOR = "creator"
 EDITOR = "editor"
-FORM_RESPONSE_DATA = "form_response_data"
+FORM_RESPONSE_DATA = "formResponseData"
 GROUP = "group"
 COMMENTS = "comments"
 COMMENTER = "commenter"
-FIELD_INDEX = "field_index"
+FIELD_INDEX = "fieldIndex"
 CONTENT = "content"
-IS_DELETED = "is_deleted"
+IS_DELETED = "isDeleted"
 TEMPLATE = "template"
-IS_ACTIVATED = "is_activated"
+IS_ACTIVATED = "isActivated"
+ITEMS = "items"
+NEXT_CURSOR = "nextCursor"
+ROWS = "rows"
+ROW = "row"
+STATUS = "status"
+STATUS_COUNTS = "statusCounts"
+TYPE = "type"
+LABEL = "label"
+RESPONSE = "response"
+HITS = "hits"
+MISSES = "misses"
+ANNOTATED_CONTENT = "annotatedContent"
+FEEDBACK = "feedback"
+INCLUDED = "included"
+USERS = "users"
+TEMPLATE_ID = "templateId"
+TEMPLATES = "templates"
+COMMENT_COUNTS = "commentCounts"
+COMMENT_COUNT = "commentCount"
+ACTIVE_COMMENT_COUNT = "activeCommentCount"
+LATEST_COMMENT_AT = "latestCommentAt"
+REQUESTS = "requests"
+ERRORS = "errors"
+TOTAL_LATENCY_MS = "totalLatencyMs"
+LOCAL = "local"
+SHARED = "shared"
+EVICTIONS = "evictions"
@@ -0,0 +1,16 @@
+from django.db.models import BigIntegerField, Func, IntegerField
+
+
+class EpochMs(Func):
+    """
+    Milliseconds since the epoch of a datetime, computed by the database.
+    Rounds in double precision like parse_datetime_to_ms_timestamp so that both give the same value.
+    """
+
+    template = "ROUND(EXTRACT(EPOCH FROM %(expressions)s)::double precision * 1000)::bigint"
+    output_field = BigIntegerField()
+
+
+class JsonbArrayLength(Func):
+    function = "JSONB_ARRAY_LENGTH"
+    output_field = IntegerField()
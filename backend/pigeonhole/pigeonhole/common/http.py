@@ -0,0 +1,103 @@
+import time
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from pigeonhole.common.cache import increment_stat, get_stat
+from pigeonhole.common.constants import REQUESTS, ERRORS, TOTAL_LATENCY_MS
+from pigeonhole.settings import (
+    OUTBOUND_HTTP_TIMEOUT,
+    OUTBOUND_HTTP_MAX_RETRIES,
+    OUTBOUND_HTTP_RETRY_BACKOFF_FACTOR,
+    OUTBOUND_HTTP_POOL_MAXSIZE,
+    OUTBOUND_HTTP_MAX_WORKERS,
+)
+
+logger = logging.getLogger("main")
+
+HTTP_STATS_NAME = "http"
+
+session: Optional[requests.Session] = None
+session_lock = threading.Lock()
+
+executor = ThreadPoolExecutor(
+    max_workers=OUTBOUND_HTTP_MAX_WORKERS, thread_name_prefix="outbound_http"
+)
+
+
+def create_session() -> requests.Session:
+    retry = Retry(
+        total=OUTBOUND_HTTP_MAX_RETRIES,
+        backoff_factor=OUTBOUND_HTTP_RETRY_BACKOFF_FACTOR,
+        status_forcelist=(502, 503, 504),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_maxsize=OUTBOUND_HTTP_POOL_MAXSIZE, max_retries=retry)
+
+    new_session = requests.Session()
+    new_session.mount("http://", adapter)
+    new_session.mount("https://", adapter)
+
+    return new_session
+
+
+def get_session() -> requests.Session:
+    global session
+
+    ## one session per process so that connections are kept alive and reused across requests
+    if session is None:
+        with session_lock:
+            if session is None:
+                session = create_session()
+
+    return session
+
+
+def get_http_stats_name(url: str) -> str:
+    return f"{HTTP_STATS_NAME}:{urlsplit(url).netloc}"
+
+
+def record_http_request(url: str, latency_ms: int, is_error: bool):
+    name = get_http_stats_name(url)
+
+    increment_stat(name=name, stat=REQUESTS)
+    increment_stat(name=name, stat=TOTAL_LATENCY_MS, delta=latency_ms)
+
+    if is_error:
+        increment_stat(name=name, stat=ERRORS)
+
+
+def get_http_stats(url: str) -> dict:
+    name = get_http_stats_name(url)
+
+    return {
+        stat: get_stat(name=name, stat=stat)
+        for stat in (REQUESTS, ERRORS, TOTAL_LATENCY_MS)
+    }
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    kwargs.setdefault("timeout", OUTBOUND_HTTP_TIMEOUT)
+
+    start = time.perf_counter()
+    is_error = True
+
+    try:
+        response = get_session().get(url=url, **kwargs)
+        is_error = response.status_code >= 500
+        return response
+    finally:
+        latency_ms = round((time.perf_counter() - start) * 1000)
+        logger.debug(f"GET {url} took {latency_ms}ms")
+        record_http_request(url=url, latency_ms=latency_ms, is_error=is_error)
+
+
+def submit(fn: Callable, *args, **kwargs) -> Future:
+    ## runs outbound calls concurrently instead of one after another
+    return executor.submit(fn, *args, **kwargs)
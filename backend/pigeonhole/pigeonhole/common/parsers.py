@@ -1,9 +1,22 @@
-from typing import Optional
+import csv
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from functools import lru_cache
+from typing import Collection, Iterable, Iterator, Optional
 from datetime import datetime
 
+import orjson
+
 from django.utils.timezone import get_default_timezone
 
-from .constants import CREATED_AT, ID, UPDATED_AT
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from djangorestframework_camel_case.settings import api_settings
+from djangorestframework_camel_case.util import camel_to_underscore
+
+from .constants import CREATED_AT, FORM_FIELD_DATA, FORM_RESPONSE_DATA, ID, UPDATED_AT
+from .functions import EpochMs
 from .models import TimestampedModel
 
 
@@ -25,3 +38,137 @@ def to_base_json(model: TimestampedModel) -> dict:
         CREATED_AT: parse_datetime_to_ms_timestamp(model.created_at),
         UPDATED_AT: parse_datetime_to_ms_timestamp(model.updated_at),
     }
+
+
+def to_sparse_json(data: dict, fields: Optional[Collection[str]]) -> dict:
+    ## id is always kept so that sparse objects can still be referenced
+    if fields is None:
+        return data
+
+    return {key: value for key, value in data.items() if key == ID or key in fields}
+
+
+## Projections
+## the *_projection functions list the columns read by the matching *_row_to_json function in order,
+## the row functions consume a values_list row through an iterator and build the same JSON as the *_to_json
+## functions without instantiating models. prefix is the relation path to the model, e.g. "user__".
+
+
+def get_base_projection(prefix: str = "") -> tuple:
+    return (
+        f"{prefix}id",
+        EpochMs(f"{prefix}created_at"),
+        EpochMs(f"{prefix}updated_at"),
+    )
+
+
+def base_row_to_json(values: Iterator) -> dict:
+    return {
+        ID: next(values),
+        CREATED_AT: next(values),
+        UPDATED_AT: next(values),
+    }
+
+
+def parse_keyset_to_cursor(date_time: datetime, id: int) -> str:
+    keyset = json.dumps([date_time.isoformat(), id], separators=(",", ":"))
+    return urlsafe_b64encode(keyset.encode()).decode()
+
+
+def parse_cursor_to_keyset(cursor: str) -> tuple[datetime, int]:
+    date_time, id = json.loads(urlsafe_b64decode(cursor.encode()))
+
+    ## ids beyond the range of the id column would fail in the database instead
+    if not isinstance(id, int) or not 0 <= id < 2**63:
+        raise ValueError(f"Invalid cursor id: {id}")
+
+    return datetime.fromisoformat(date_time), id
+
+
+def parse_csv_lines(lines: Iterable[bytes]) -> Iterator[Optional[dict]]:
+    has_invalid_line = False
+
+    def decode_lines() -> Iterator[str]:
+        nonlocal has_invalid_line
+
+        for line in lines:
+            try:
+                yield line.decode("utf-8-sig")
+            except UnicodeDecodeError:
+                has_invalid_line = True
+                yield line.decode("utf-8-sig", errors="replace")
+
+    reader = csv.DictReader(decode_lines())
+
+    for row in reader:
+        ## rows read from lines which are not valid UTF-8 are yielded as None so that they can be reported per row
+        if has_invalid_line:
+            has_invalid_line = False
+            yield None
+            continue
+
+        yield {
+            key.strip().lower(): value.strip()
+            for key, value in row.items()
+            if key is not None and value is not None
+        }
+
+
+def parse_json_lines(lines: Iterable[bytes]) -> Iterator[Optional[dict]]:
+    for line in lines:
+        if not line.strip():
+            continue
+
+        ## malformed lines are yielded as None so that they can be reported per row,
+        ## this includes lines which are not valid UTF-8 as UnicodeDecodeError is a ValueError
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+
+## request fields holding user-authored JSON (ObjectListField in courses/serializers.py and forms/serializers.py)
+## only their own key is converted, their contents are passed through untouched.
+## both spellings are matched as keys which are already snake_case are accepted as is
+OPAQUE_FIELDS = frozenset(
+    key
+    for field in (FORM_FIELD_DATA, FORM_RESPONSE_DATA)
+    for key in (field, camel_to_underscore(field, **api_settings.JSON_UNDERSCOREIZE))
+)
+
+
+@lru_cache(maxsize=1024)
+def parse_camel_case_key(key: str) -> str:
+    return camel_to_underscore(key, **api_settings.JSON_UNDERSCOREIZE)
+
+
+def underscoreize_keys(data):
+    if isinstance(data, dict):
+        return {
+            parse_camel_case_key(key): value
+            if key in OPAQUE_FIELDS
+            else underscoreize_keys(value)
+            for key, value in data.items()
+        }
+
+    if isinstance(data, list):
+        return [underscoreize_keys(item) for item in data]
+
+    return data
+
+
+class CamelCaseJSONParser(BaseParser):
+    """
+    Parses JSON with orjson and converts camelCase keys to snake_case,
+    except within the subtrees of OPAQUE_FIELDS.
+    """
+
+    media_type = "application/json"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            data = orjson.loads(stream.read())
+        except orjson.JSONDecodeError as e:
+            raise ParseError(f"JSON parse error - {e}")
+
+        return underscoreize_keys(data)
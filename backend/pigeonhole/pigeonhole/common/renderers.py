@@ -0,0 +1,52 @@
+import orjson
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from djangorestframework_camel_case.settings import api_settings
+from djangorestframework_camel_case.util import camelize
+
+
+class RawJSON:
+    """
+    Pre-serialised JSON text which is spliced into the rendered response as is.
+    """
+
+    def __init__(self, value: str):
+        self.value = value
+
+
+class FastJSONRenderer(BaseRenderer):
+    """
+    Renders JSON with orjson without rewriting any keys.
+    Response builders already emit camelCase keys (see pigeonhole/common/constants.py) and user-authored JSON
+    such as form_field_data and form_response_data is passed through as stored.
+    Error responses are built by DRF from snake_case serializer field names, so only those are camelized.
+    """
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    ## falls back to DRF's encoder for types orjson does not support natively, e.g. Decimal and lazy strings
+    encoder_default = JSONEncoder().default
+
+    def default(self, obj):
+        if isinstance(obj, RawJSON):
+            return orjson.Fragment(obj.value)
+
+        return self.encoder_default(obj)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        response = (renderer_context or {}).get("response")
+
+        if response is not None and response.exception:
+            data = camelize(data, **api_settings.JSON_UNDERSCOREIZE)
+
+        ## side-loaded maps are keyed by ids
+        return orjson.dumps(
+            data, default=self.default, option=orjson.OPT_NON_STR_KEYS
+        )
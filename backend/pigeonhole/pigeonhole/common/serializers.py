@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from .parsers import parse_cursor_to_keyset
 from .validators import all_objects
 
 
@@ -37,3 +38,25 @@ class ObjectListField(serializers.ListField):
         kwargs["validators"] = kwargs.get("validators", []) + [all_objects]
 
         super().__init__(**kwargs)
+
+
+class SparseFieldsField(serializers.CharField):
+    ## comma separated response keys, e.g. fields=name,formResponseData
+    def to_internal_value(self, data):
+        fields = super().to_internal_value(data)
+
+        return frozenset(field.strip() for field in fields.split(",") if field.strip())
+
+
+class SparseFieldsSerializer(serializers.Serializer):
+    fields = SparseFieldsField(required=False, default=None)
+
+
+class CursorField(serializers.CharField):
+    def to_internal_value(self, data):
+        cursor = super().to_internal_value(data)
+
+        try:
+            return parse_cursor_to_keyset(cursor)
+        except (TypeError, ValueError):
+            raise serializers.ValidationError("Invalid cursor.")
@@ -0,0 +1,61 @@
+import csv
+import json
+import zlib
+from typing import Iterable, Iterator, Sequence
+
+
+class Echo:
+    """An object that implements just the write method of the file-like interface."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def stream_csv(columns: Sequence[str], rows: Iterable[dict]) -> Iterator[str]:
+    writer = csv.DictWriter(Echo(), fieldnames=columns, extrasaction="ignore")
+
+    yield writer.writeheader()
+
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_json_lines(rows: Iterable[dict]) -> Iterator[str]:
+    for row in rows:
+        yield f"{json.dumps(row, ensure_ascii=False)}\n"
+
+
+def stream_in_chunks(strings: Iterable[str], chunk_size: int) -> Iterator[bytes]:
+    ## the first string (e.g. csv header) is sent immediately, the rest are buffered up to chunk_size bytes
+    buffer = []
+    buffer_size = 0
+    is_first = True
+
+    for string in strings:
+        data = string.encode()
+
+        if is_first:
+            is_first = False
+            yield data
+            continue
+
+        buffer.append(data)
+        buffer_size += len(data)
+
+        if buffer_size >= chunk_size:
+            yield b"".join(buffer)
+            buffer = []
+            buffer_size = 0
+
+    if buffer:
+        yield b"".join(buffer)
+
+
+def stream_gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+
+    for chunk in chunks:
+        ## sync flush so that every chunk is sent without waiting for the compressor to fill up
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    yield compressor.flush()
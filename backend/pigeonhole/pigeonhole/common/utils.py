@@ -1,2 +1,36 @@
+import hashlib
+from typing import Callable, Optional
+
+from django.views.decorators.http import condition
+
+
 def default_list():
     return []
+
+
+def get_etag(*values) -> str:
+    ## weak etag as responses are only guaranteed to be semantically equivalent
+    digest = hashlib.md5(repr(values).encode(), usedforsecurity=False).hexdigest()
+    return f'W/"{digest}"'
+
+
+def conditional_get(
+    etag_func: Optional[Callable] = None, last_modified_func: Optional[Callable] = None
+):
+    """
+    Applies django.views.decorators.http.condition to view methods.
+    etag_func and last_modified_func are called for every GET, so that the ETag and Last-Modified
+    of the first response can be sent back by the client and answered with 304 without serialising.
+    """
+
+    def _method_wrapper(view_method):
+        def _arguments_wrapper(instance, request, *args, **kwargs):
+            @condition(etag_func=etag_func, last_modified_func=last_modified_func)
+            def view(request, *args, **kwargs):
+                return view_method(instance, request, *args, **kwargs)
+
+            return view(request, *args, **kwargs)
+
+        return _arguments_wrapper
+
+    return _method_wrapper
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from courses.logic import (
+    get_course_submission_field_comment_count_mismatches,
+    rebuild_course_submission_field_comment_counts,
+)
+
+
+class Command(BaseCommand):
+    help = "Checks or rebuilds the per-field comment counts of course submissions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report counts which do not match the comments, without rebuilding",
+        )
+
+    def handle(self, *args, **options):
+        if not options["check"]:
+            num_counts = rebuild_course_submission_field_comment_counts()
+            self.stdout.write(f"Rebuilt {num_counts} field comment counts")
+            return
+
+        mismatches = get_course_submission_field_comment_count_mismatches()
+
+        for submission_id, field_index, expected, stored in mismatches:
+            self.stdout.write(
+                f"Submission {submission_id} field {field_index}: expected (total, deleted) {expected}, stored {stored}"
+            )
+
+        if mismatches:
+            raise CommandError(f"{len(mismatches)} field comment counts do not match")
+
+        self.stdout.write("All field comment counts match")
@@ -14,6 +14,7 @@ import os
 from pathlib import Path
 from datetime import timedelta
 
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -157,13 +158,11 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTTokenUserAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
-    "DEFAULT_RENDERER_CLASSES": (
-        "djangorestframework_camel_case.render.CamelCaseJSONRenderer",
-        "djangorestframework_camel_case.render.CamelCaseBrowsableAPIRenderer",
-    ),
-    "DEFAULT_PARSER_CLASSES": (
-        "djangorestframework_camel_case.parser.CamelCaseJSONParser",
-    ),
+    ## response builders emit camelCase keys directly so no key conversion is done when rendering,
+    ## browsers are also answered with JSON as responses may carry pre-serialised RawJSON values
+    "DEFAULT_RENDERER_CLASSES": ("pigeonhole.common.renderers.FastJSONRenderer",),
+    ## user-authored JSON fields are left untouched when parsing, see pigeonhole.common.parsers.OPAQUE_FIELDS
+    "DEFAULT_PARSER_CLASSES": ("pigeonhole.common.parsers.CamelCaseJSONParser",),
     "JSON_UNDERSCOREIZE": {
         "no_underscore_before_number": True,
     },
@@ -175,6 +174,12 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
 }
 
+## claims added to issued tokens so that account access can be checked without loading the user,
+## tokens whose version is behind the user's version are rejected
+
+ACCOUNT_TYPE_CLAIM = "account_type"
+USER_VERSION_CLAIM = "user_version"
+
 # Database
 # https://docs.djangoproject.com/en/4.0/ref/settings/#databases
 
@@ -189,6 +194,31 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+## in-process cache by default, set CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+## and CACHE_LOCATION=redis://<host>:<port> to share the cache between worker processes
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "pigeonhole"),
+    }
+}
+
+## cached responses, course membership indexes and users are invalidated by bumping versions in the cache,
+## which other worker processes never see if each of them has its own cache, see pigeonhole.common.cache.check_shared_cache
+IN_PROCESS_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+## seconds between adding each process' cache hit/miss counts to the shared counters
+
+CACHE_STATS_FLUSH_INTERVAL = 10
+
 ## Password hashers
 ## https://docs.djangoproject.com/en/4.0/topics/auth/passwords/
 
@@ -222,6 +252,64 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Pagination
+## page sizes used by opt-in cursor paginated list endpoints
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Bulk imports
+## number of rows upserted per query batch when streaming imports
+
+IMPORT_CHUNK_SIZE = 500
+
+# Streaming exports
+## number of rows fetched per database round trip and bytes buffered per streamed chunk
+
+EXPORT_QUERY_CHUNK_SIZE = 500
+EXPORT_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Response caching
+## seconds a cached course response is kept, entries are invalidated earlier by bumping the course version
+
+COURSE_RESPONSE_CACHE_TIMEOUT = 60 * 60
+## seconds a user's course membership index is kept, entries are invalidated earlier by bumping the user's index version
+
+COURSE_MEMBERSHIP_INDEX_TIMEOUT = 60 * 60
+
+# User caching
+## users are cached in a bounded in-process LRU in front of the shared cache, entries are invalidated by bumping the
+## user version whenever the user, their profile image or authentication methods change
+
+USER_CACHE_MAX_SIZE = 1024
+USER_CACHE_TIMEOUT = 60 * 60
+## seconds an in-process entry is used before the shared user version is checked again, so updates made through
+## other processes are seen after at most this long
+USER_CACHE_LOCAL_TIMEOUT = 5
+
+# Outbound HTTP
+## requests to external services share a connection pool per process, timeouts are (connect, read) in seconds
+## and only idempotent requests which failed to connect or got a gateway error are retried
+
+OUTBOUND_HTTP_TIMEOUT = (3.05, 10)
+OUTBOUND_HTTP_MAX_RETRIES = 2
+OUTBOUND_HTTP_RETRY_BACKOFF_FACTOR = 0.2
+OUTBOUND_HTTP_POOL_MAXSIZE = 10
+OUTBOUND_HTTP_MAX_WORKERS = 8
+
+# Google sign in
+## ID tokens are verified locally against Google's public keys, GOOGLE_CLIENT_IDS is a space separated list of
+## the OAuth client ids which tokens may be issued to. the key set is cached for as long as Google's Cache-Control
+## allows, or the default timeout if it is missing, and is refetched at most once per refresh interval on unknown key ids
+
+GOOGLE_CLIENT_IDS = os.getenv("GOOGLE_CLIENT_IDS", "").split()
+
+GOOGLE_ID_TOKEN_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_JWKS_DEFAULT_CACHE_TIMEOUT = 60 * 60
+GOOGLE_JWKS_MIN_REFRESH_INTERVAL = 60
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.0/topics/i18n/
 
@@ -4,5 +4,17 @@ from pigeonhole.common.admin import BaseAdmin
 
 from .models import User
 
+
+class UserAdmin(BaseAdmin):
+    readonly_fields = (*BaseAdmin.readonly_fields, "version")
+
+    def save_model(self, request, obj: User, form, change):
+        ## tokens carry the account type, so they are invalidated when it changes
+        if change and "account_type" in form.changed_data:
+            obj.version += 1
+
+        super().save_model(request, obj, form, change)
+
+
 # Register your models here.
-admin.site.register(User, BaseAdmin)
\ No newline at end of file
+admin.site.register(User, UserAdmin)
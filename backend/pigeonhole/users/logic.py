@@ -1,6 +1,9 @@
-from typing import Sequence, Iterable, Optional
+import pickle
+import time
+from typing import Sequence, Iterable, Iterator, Optional, Union
 
-from django.db.models import QuerySet
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, QuerySet
 from django.db import transaction
 
 from pigeonhole.common.exceptions import InternalServerError, BadRequest
@@ -13,8 +16,28 @@ from pigeonhole.common.constants import (
     GOOGLE_AUTH,
     FACEBOOK_AUTH,
     IS_ACTIVATED,
+    ID,
+    LOCAL,
+    SHARED,
+    EVICTIONS,
+)
+from pigeonhole.common.cache import (
+    get_version,
+    increment_stat,
+    record_cache_access,
+    get_stat,
+    get_cache_stats,
+)
+from pigeonhole.settings import (
+    USER_CACHE_MAX_SIZE,
+    USER_CACHE_TIMEOUT,
+    USER_CACHE_LOCAL_TIMEOUT,
+)
+from pigeonhole.common.parsers import (
+    base_row_to_json,
+    get_base_projection,
+    parse_datetime_to_ms_timestamp,
 )
-from pigeonhole.common.parsers import parse_datetime_to_ms_timestamp
 from authentication.models import (
     PasswordAuthentication,
     GoogleAuthentication,
@@ -22,7 +45,14 @@ from authentication.models import (
 )
 from content_delivery_service.models import Image
 from pigeonhole.common.parsers import to_base_json
-from .models import User, PatchUserAction
+from .models import (
+    User,
+    PatchUserAction,
+    USER_CACHE_NAMESPACE,
+    get_user_version_key,
+    local_user_cache,
+    local_user_cache_lock,
+)
 
 
 def user_to_json(user: User) -> dict:
@@ -41,14 +71,72 @@ def user_to_json(user: User) -> dict:
     return data
 
 
+def user_to_json_or_id(
+    user: User, included_users: Optional[dict[int, dict]] = None
+) -> Union[dict, int]:
+    ## side-load the user into included_users and reference it by id if a map is given
+    if included_users is None:
+        return user_to_json(user)
+
+    if user.id not in included_users:
+        included_users[user.id] = user_to_json(user)
+
+    return user.id
+
+
+def get_user_projection(prefix: str = "") -> tuple:
+    return (
+        *get_base_projection(prefix),
+        f"{prefix}name",
+        f"{prefix}email",
+        f"{prefix}profile_image__image_url",
+        f"{prefix}account_type",
+        f"{prefix}is_activated",
+    )
+
+
+def user_row_to_json(values: Iterator) -> Optional[dict]:
+    data = base_row_to_json(values)
+
+    data |= {
+        NAME: next(values),
+        EMAIL: next(values),
+        PROFILE_IMAGE: next(values),
+        ACCOUNT_TYPE: next(values),
+        IS_ACTIVATED: next(values),
+    }
+
+    ## all columns are null if the user is reached through a null relation
+    return data if data[ID] is not None else None
+
+
+def user_row_to_json_or_id(
+    values: Iterator, included_users: Optional[dict[int, dict]] = None
+) -> Union[dict, int, None]:
+    data = user_row_to_json(values)
+
+    if data is None or included_users is None:
+        return data
+
+    included_users.setdefault(data[ID], data)
+
+    return data[ID]
+
+
+def has_password_auth(user: User) -> bool:
+    ## cached users are annotated instead of carrying their password hash, see get_cached_user
+    if hasattr(user, "has_password_auth"):
+        return user.has_password_auth
+
+    return hasattr(user, PasswordAuthentication.get_related_name())
+
+
 def requester_to_json(requester: User) -> dict:
     data = user_to_json(user=requester)
 
     data |= {
         ACCOUNT_TYPE: requester.account_type,
-        HAS_PASSWORD_AUTH: hasattr(
-            requester, PasswordAuthentication.get_related_name()
-        ),
+        HAS_PASSWORD_AUTH: has_password_auth(requester),
         GOOGLE_AUTH: {
             EMAIL: requester.googleauthentication.email,
             PROFILE_IMAGE: requester.googleauthentication.profile_image,
@@ -68,3 +156,116 @@ def requester_to_json(requester: User) -> dict:
 
 def get_users(*args, **kwargs) -> QuerySet[User]:
     return User.objects.filter(*args, **kwargs)
+
+
+def get_user_version(user_id: int) -> Optional[int]:
+    key = get_user_version_key(user_id)
+    version = cache.get(key)
+
+    if version is None:
+        version = get_users(id=user_id).values_list("version", flat=True).first()
+
+        ## deleted users are not cached so that their tokens are rejected
+        if version is not None:
+            cache.add(key, version, timeout=None)
+
+    return version
+
+
+## User cache
+## entries are pickled so that callers never share or mutate the same instance. the password hash is left out so
+## that it is never written to the shared cache, callers only need to know whether a password is set
+
+USER_CACHE_STATS_NAME = "user_cache"
+LOCAL_USER_CACHE_STATS_NAME = f"{USER_CACHE_STATS_NAME}:{LOCAL}"
+SHARED_USER_CACHE_STATS_NAME = f"{USER_CACHE_STATS_NAME}:{SHARED}"
+
+
+def get_local_cached_user(user_id: int) -> Optional[tuple[float, int, bytes]]:
+    with local_user_cache_lock:
+        entry = local_user_cache.get(user_id)
+
+        if entry is not None:
+            local_user_cache.move_to_end(user_id)
+
+        return entry
+
+
+def set_local_cached_user(user_id: int, version: int, pickled_user: bytes):
+    num_evictions = 0
+    expires_at = time.monotonic() + USER_CACHE_LOCAL_TIMEOUT
+
+    with local_user_cache_lock:
+        local_user_cache[user_id] = (expires_at, version, pickled_user)
+        local_user_cache.move_to_end(user_id)
+
+        while len(local_user_cache) > USER_CACHE_MAX_SIZE:
+            local_user_cache.popitem(last=False)
+            num_evictions += 1
+
+    if num_evictions:
+        increment_stat(
+            name=LOCAL_USER_CACHE_STATS_NAME, stat=EVICTIONS, delta=num_evictions
+        )
+
+
+def get_cached_user(user_id: int) -> User:
+    """
+    Gets a user with their profile image and alternative authentication methods.
+    Looks up the in-process cache, then the shared cache and then the database.
+    Raises User.DoesNotExist if there is no such user.
+    """
+
+    entry = get_local_cached_user(user_id)
+
+    ## unexpired local entries are used without a shared cache round trip
+    if entry is not None and time.monotonic() < entry[0]:
+        record_cache_access(name=LOCAL_USER_CACHE_STATS_NAME, is_hit=True)
+        return pickle.loads(entry[2])
+
+    ## the version is read before the user so that a concurrent update is never cached under its new version
+    version = get_version(namespace=USER_CACHE_NAMESPACE, id=user_id)
+
+    ## expired local entries are renewed if the user has not changed since
+    is_local_hit = entry is not None and entry[1] == version
+    record_cache_access(name=LOCAL_USER_CACHE_STATS_NAME, is_hit=is_local_hit)
+
+    if is_local_hit:
+        pickled_user = entry[2]
+
+    else:
+        key = f"{USER_CACHE_NAMESPACE}:{user_id}:{version}"
+        pickled_user = cache.get(key)
+        record_cache_access(
+            name=SHARED_USER_CACHE_STATS_NAME, is_hit=pickled_user is not None
+        )
+
+        if pickled_user is None:
+            user = (
+                get_users(id=user_id)
+                .select_related(
+                    "profile_image",
+                    "googleauthentication",
+                    "facebookauthentication",
+                )
+                .annotate(
+                    has_password_auth=Exists(
+                        PasswordAuthentication.objects.filter(user_id=OuterRef("id"))
+                    )
+                )
+                .get()
+            )
+            pickled_user = pickle.dumps(user)
+            cache.set(key, pickled_user, timeout=USER_CACHE_TIMEOUT)
+
+    set_local_cached_user(user_id=user_id, version=version, pickled_user=pickled_user)
+
+    return pickle.loads(pickled_user)
+
+
+def get_user_cache_stats() -> dict:
+    return {
+        LOCAL: get_cache_stats(LOCAL_USER_CACHE_STATS_NAME)
+        | {EVICTIONS: get_stat(name=LOCAL_USER_CACHE_STATS_NAME, stat=EVICTIONS)},
+        SHARED: get_cache_stats(SHARED_USER_CACHE_STATS_NAME),
+    }
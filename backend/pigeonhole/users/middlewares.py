@@ -1,9 +1,12 @@
 import logging
 
+from django.utils.functional import SimpleLazyObject
+
 from rest_framework.exceptions import AuthenticationFailed, PermissionDenied
 
+from pigeonhole.settings import ACCOUNT_TYPE_CLAIM, USER_VERSION_CLAIM
 from .models import User, AccountType
-from .logic import get_users
+from .logic import get_cached_user, get_user_version
 
 logger = logging.getLogger("main")
 
@@ -12,17 +15,22 @@ def check_account_access(*allowed_account_types: AccountType):
     def _method_wrapper(view_method):
         def _arguments_wrapper(instance, request, *args, **kwargs):
             requester_id = request.user.id
+            account_type = request.auth.get(ACCOUNT_TYPE_CLAIM)
+            token_version = request.auth.get(USER_VERSION_CLAIM)
+
+            if account_type is None or token_version is None:
+                ## tokens issued before the claims were added
+                requester = get_requester(requester_id)
+                account_type = requester.account_type
 
-            try:
-                requester = (
-                    get_users(id=requester_id).select_related("profile_image").get()
-                )
+            else:
+                ## the version is cached, so the user is only loaded if the view reads it
+                if token_version != get_user_version(requester_id):
+                    raise AuthenticationFailed(detail="Invalid user.")
 
-            except User.DoesNotExist as e:
-                logger.warning(e)
-                raise AuthenticationFailed(detail="Invalid user.")
+                requester = SimpleLazyObject(lambda: get_requester(requester_id))
 
-            if requester.account_type not in allowed_account_types:
+            if account_type not in allowed_account_types:
                 raise PermissionDenied()
 
             return view_method(instance, request, requester=requester, *args, **kwargs)
@@ -30,3 +38,12 @@ def check_account_access(*allowed_account_types: AccountType):
         return _arguments_wrapper
 
     return _method_wrapper
+
+
+def get_requester(requester_id: int) -> User:
+    try:
+        return get_cached_user(requester_id)
+
+    except User.DoesNotExist as e:
+        logger.warning(e)
+        raise AuthenticationFailed(detail="Invalid user.")
@@ -0,0 +1,18 @@
+# Generated by Django 4.0.5 on 2026-10-18 15:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_is_activated'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
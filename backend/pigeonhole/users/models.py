@@ -1,6 +1,11 @@
-from django.db import models
-from django.db.models.signals import post_delete
+import threading
+from collections import OrderedDict
 
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import post_save, post_delete
+
+from pigeonhole.common.cache import bump_version
 from pigeonhole.common.models import TimestampedModel
 from content_delivery_service.models import Image
 
@@ -34,6 +39,9 @@ class User(TimestampedModel):
         Image, null=True, blank=True, on_delete=models.SET_NULL
     )
     is_activated = models.BooleanField(default=False)
+    ## embedded in tokens and bumped whenever the claims they carry are no longer valid,
+    ## i.e. when the account type is changed through UserAdmin
+    version = models.PositiveIntegerField(default=0)
 
     def __str__(self) -> str:
         status_string = "" if self.is_activated else " (not activated)"
@@ -54,3 +62,80 @@ post_delete.connect(
     sender=User,
     dispatch_uid="users.user.user_cleanup",
 )
+
+
+def get_user_version_key(user_id: int) -> str:
+    return f"user:{user_id}:version"
+
+
+def user_version_update(sender, instance: User, **kwargs):
+    ## set rather than deleted after commit so that a concurrent request cannot cache the old version
+    user_id, version = instance.id, instance.version
+    transaction.on_commit(
+        lambda: cache.set(get_user_version_key(user_id), version, timeout=None)
+    )
+
+
+def user_version_invalidation(sender, instance: User, **kwargs):
+    user_id = instance.id
+    transaction.on_commit(lambda: cache.delete(get_user_version_key(user_id)))
+
+
+## set up listeners to keep the cached version of issued tokens up to date, see users.logic.get_user_version
+post_save.connect(
+    user_version_update,
+    sender=User,
+    dispatch_uid="users.user.user_version_update",
+)
+post_delete.connect(
+    user_version_invalidation,
+    sender=User,
+    dispatch_uid="users.user.user_version_invalidation",
+)
+
+
+USER_CACHE_NAMESPACE = "user_identity"
+
+## in-process entries of users.logic.get_cached_user, kept here so that this process drops them as soon as it
+## changes a user instead of waiting for them to expire
+local_user_cache: OrderedDict[int, tuple[float, int, bytes]] = OrderedDict()
+local_user_cache_lock = threading.Lock()
+
+
+def discard_local_cached_user(user_id: int):
+    with local_user_cache_lock:
+        local_user_cache.pop(user_id, None)
+
+
+def bump_user_cache_version(user_id: int):
+    ## only bump after commit so that a concurrent request cannot cache the old state under the new version
+    def bump():
+        bump_version(namespace=USER_CACHE_NAMESPACE, id=user_id)
+        discard_local_cached_user(user_id)
+
+    transaction.on_commit(bump)
+
+
+def user_cache_invalidation(sender, instance: User, **kwargs):
+    bump_user_cache_version(instance.id)
+
+
+def profile_image_cache_invalidation(sender, instance: Image, **kwargs):
+    for user_id in User.objects.filter(profile_image_id=instance.id).values_list(
+        "id", flat=True
+    ):
+        bump_user_cache_version(user_id)
+
+
+## set up listeners to invalidate cached users, see users.logic.get_cached_user
+for signal, signal_name in ((post_save, "post_save"), (post_delete, "post_delete")):
+    signal.connect(
+        user_cache_invalidation,
+        sender=User,
+        dispatch_uid=f"users.user.user_cache_invalidation.{signal_name}",
+    )
+    signal.connect(
+        profile_image_cache_invalidation,
+        sender=Image,
+        dispatch_uid=f"users.image.profile_image_cache_invalidation.{signal_name}",
+    )
@@ -1,3 +1,68 @@
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
 
+from authentication.models import PasswordAuthentication
+from pigeonhole.common.cache import get_version
+from pigeonhole.common.constants import HAS_PASSWORD_AUTH
+from .logic import get_cached_user, requester_to_json
+from .models import User, USER_CACHE_NAMESPACE, local_user_cache
+
+
 # Create your tests here.
+class UserCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_user_cache.clear()
+
+        self.user = User.objects.create(email="user@example.com", name="User")
+        PasswordAuthentication.objects.create(user=self.user, auth_id="hashed-password")
+
+    def test_local_hit_does_not_touch_shared_cache(self):
+        get_cached_user(self.user.id)
+
+        ## hit/miss counts are only flushed to the shared cache periodically
+        with mock.patch.object(cache, "get") as shared_get, mock.patch.object(
+            cache, "incr"
+        ) as shared_incr, self.assertNumQueries(0):
+            user = get_cached_user(self.user.id)
+
+        self.assertEqual(user, self.user)
+        shared_get.assert_not_called()
+        shared_incr.assert_not_called()
+
+    def test_expired_local_entry_is_renewed_without_reloading(self):
+        ## the local entry expires immediately
+        with mock.patch("users.logic.USER_CACHE_LOCAL_TIMEOUT", 0):
+            get_cached_user(self.user.id)
+
+        with mock.patch.object(
+            cache, "get", wraps=cache.get
+        ) as shared_get, self.assertNumQueries(0):
+            self.assertEqual(get_cached_user(self.user.id), self.user)
+
+        ## only the version is read
+        shared_get.assert_called_once()
+
+    def test_update_is_seen_immediately_by_the_same_process(self):
+        get_cached_user(self.user.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.name = "Updated"
+            self.user.save()
+
+        self.assertEqual(get_cached_user(self.user.id).name, "Updated")
+
+    def test_password_hash_is_not_cached(self):
+        user = get_cached_user(self.user.id)
+
+        self.assertTrue(requester_to_json(user)[HAS_PASSWORD_AUTH])
+
+        version = get_version(namespace=USER_CACHE_NAMESPACE, id=self.user.id)
+        pickled_user = cache.get(f"{USER_CACHE_NAMESPACE}:{self.user.id}:{version}")
+
+        self.assertNotIn(b"hashed-password", pickled_user)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(requester_to_json(user)[HAS_PASSWORD_AUTH])